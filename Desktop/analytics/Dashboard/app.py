@@ -2,25 +2,33 @@ import dash
 from dash import dcc, html 
 from src.python.FrontEnd import layout, register_callbacks
 from src.python import FrontEnd 
-from src.python.Backend import T1OverviewBackEnd, T2RetentionBreakdown, T3UserDemographics, T4FunctionUsage, T5UserFeedback
+from src.python.Backend import DataHandling, T1OverviewBackEnd, T2RetentionBreakdown, T3UserDemographics, T4FunctionUsage, T5UserFeedback
+import importlib.util
+import multiprocessing
 import webbrowser
 external_stylesheets = [
     "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
 ]
 
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+# Gzip callback responses and the layout (flask-compress, installed with `pip install "dash[compress]"`)
+app = dash.Dash(__name__, external_stylesheets=external_stylesheets,
+                compress=importlib.util.find_spec("flask_compress") is not None)
+# WSGI entry point (see serve.py)
+server = app.server
 
-app.layout = FrontEnd.layout
-
-# Register tab-specific callbacks
+# Register tab-specific callbacks (the User Feedback tab has none; its figures come with the layout, see FrontEnd)
 T1OverviewBackEnd.OverviewCallbacks(app)
 T2RetentionBreakdown.CategoryBreakDownCallBacks(app)
 T3UserDemographics.register_demographics_callbacks(app)
 T4FunctionUsage.usageAnalysisCallbacks(app)
-T5UserFeedback.register_feedback_callbacks(app)
 register_callbacks(app)
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    # Start reading the reports while the server boots; callbacks wait for it on first use
+    DataHandling.start_background_load()
+    # Pick up refreshed reports without restarting the server
+    DataHandling.start_data_watcher()
     webbrowser.open("http://127.0.0.1:8050")
     app.run(debug=True)
 
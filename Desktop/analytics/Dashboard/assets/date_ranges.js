@@ -0,0 +1,41 @@
+/* Client-side date picker logic (registered in T1OverviewBackEnd.OverviewCallbacks) */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dates: {
+        /*
+         * Runs in the browser for every auto-update-daterange picker.
+         * Picking a start date moves the end date to two weeks later (capped by max_date_allowed).
+         * The resulting (start, end) pair is written to the picker's date-range-store in a single
+         * update, so the server callbacks run once per pick instead of once per changed date.
+         */
+        sync_date_range: function (startDate, endDate, maxAllowed, currentRange) {
+            const noUpdate = window.dash_clientside.no_update;
+            const ctx = window.dash_clientside.callback_context;
+            const triggered = (ctx && ctx.triggered) ? ctx.triggered.map(t => t.prop_id) : [];
+            const startChanged = triggered.some(propId => propId.endsWith('.start_date'));
+            // Both dates set at once (the server filling in the default range) are kept as they are
+            const endChanged = triggered.some(propId => propId.endsWith('.end_date'));
+
+            let newEnd = endDate;
+            if (startChanged && !endChanged && startDate) {
+                const end = new Date(startDate.slice(0, 10) + 'T00:00:00Z');
+                end.setUTCDate(end.getUTCDate() + 14);
+                newEnd = end.toISOString().slice(0, 10);
+                if (maxAllowed && newEnd > maxAllowed.slice(0, 10)) {
+                    newEnd = maxAllowed.slice(0, 10);
+                }
+            }
+
+            const range = {
+                start: startDate ? startDate.slice(0, 10) : null,
+                end: newEnd ? newEnd.slice(0, 10) : null
+            };
+            const unchanged = currentRange && currentRange.start === range.start && currentRange.end === range.end;
+
+            return [
+                (startChanged && newEnd !== endDate) ? newEnd : noUpdate,
+                unchanged ? noUpdate : range
+            ];
+        }
+    }
+});
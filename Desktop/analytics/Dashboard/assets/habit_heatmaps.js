@@ -0,0 +1,64 @@
+/* Client-side habit heatmaps of the Retention tab (registered in T2RetentionBreakdown.CategoryBreakDownCallBacks) */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    heatmaps: {
+        /*
+         * Runs in the browser whenever the heatmap slice store (one per date range) or a filter changes.
+         * The store holds, per period, the users active per habit and day and the unique users of every
+         * subscription x platform combination, so switching filters needs no server round trip.
+         * Mirrors T2RetentionBreakdown: percentages rounded to 2 dp, one dynamic zmax for both periods.
+         */
+        render_habit_heatmaps: function (slices, subscription, platform) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!slices) {
+                return [noUpdate, noUpdate];
+            }
+            if (slices.message) {
+                return [slices.message, slices.message];
+            }
+
+            // Filter values are matched like FilterIndex.bitmap does (case-insensitive, missing = 'all')
+            const normalize = value => (value === null || value === undefined) ? 'all' : String(value).toLowerCase();
+            const s = slices.subscriptions.indexOf(normalize(subscription));
+            const p = slices.platforms.indexOf(normalize(platform));
+            const combination = (s < 0 || p < 0) ? -1 : s * slices.platforms.length + p;
+
+            // np.round: round half to even
+            const roundHalfEven = x => {
+                const r = Math.round(x);
+                return (Math.abs(x % 1) === 0.5 && r % 2 !== 0) ? r - 1 : r;
+            };
+            const days = slices.days;
+            let overallMax = 0;
+            const periods = slices.periods.map(period => {
+                const users = combination < 0 ? 0 : period.users[combination];
+                const counts = combination < 0 ? [] : period.counts[combination];
+                const z = [];
+                for (let h = 0; h * days < counts.length; h++) {
+                    const row = [];
+                    for (let d = 0; d < days; d++) {
+                        const value = users > 0 ? roundHalfEven(counts[h * days + d] / users * 100 * 100) / 100 : 0;
+                        overallMax = Math.max(overallMax, value);
+                        row.push(value);
+                    }
+                    z.push(row);
+                }
+                return {text: period.text, users: users, z: z};
+            });
+
+            // T2RetentionBreakdown.dynamic_zmax_for
+            const zmax = overallMax === 0 ? 10 : overallMax <= 10 ? 10 : overallMax <= 25 ? 25 : overallMax <= 50 ? 50 : 100;
+
+            return periods.map(period => {
+                const fig = JSON.parse(JSON.stringify(period.users > 0 ? slices.figures.heatmap : slices.figures.empty));
+                fig.layout.coloraxis.cmax = zmax;
+                // Both templates start with the period annotation
+                fig.layout.annotations[0].text = period.text;
+                if (period.users > 0) {
+                    fig.data[0].z = period.z;
+                }
+                return fig;
+            });
+        }
+    }
+});
@@ -0,0 +1,112 @@
+# Production entry point for the dashboard:
+#
+#     python serve.py --workers 4 --bind 0.0.0.0:8050
+#
+# A loader process reads the reports once and publishes them as a memory-mapped store in data/.shared
+# (see SharedStore); every web worker attaches to that store read-only, so adding a worker costs little
+# memory. The loader keeps watching the reports and publishes a new version when they change.
+# Workers are run by gunicorn when it is installed; without it the dashboard is served by one threaded process.
+
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from src.python.Backend import SharedStore
+
+HAS_GUNICORN = importlib.util.find_spec("gunicorn") is not None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the dashboard with several workers sharing one dataset.")
+    parser.add_argument("--bind", default="127.0.0.1:8050", help="host:port to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of web worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="threads per worker")
+    parser.add_argument("--timeout", type=int, default=120, help="seconds before an unresponsive worker is restarted")
+    parser.add_argument("--store-dir", default=SharedStore.STORE_DIR, help="directory of the shared dataset")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="seconds between checks for new data")
+    parser.add_argument("--load-timeout", type=float, default=600.0, help="seconds to wait for the first dataset")
+    return parser.parse_args()
+
+def start_loader(store_dir, poll_interval):
+    """Start the loader in a fresh interpreter (spawn), so it shares no threads or locks with the server."""
+    loader = multiprocessing.get_context("spawn").Process(
+        name="Dataset Loader", target=SharedStore.run_loader, args=(store_dir, poll_interval)
+    )
+    loader.start()
+    return loader
+
+def wait_for_store(store_dir, loader, previous_version, timeout):
+    """Wait until the loader published a version newer than previous_version. Returns False on failure."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pointer = SharedStore.read_pointer(store_dir)
+        if pointer is not None and (previous_version is None or pointer["version"] > previous_version):
+            return True
+        if not loader.is_alive():
+            print("ERROR: The dataset loader exited before publishing the data.")
+            return False
+        time.sleep(0.5)
+    print(f"ERROR: The dataset loader did not publish the data within {timeout:.0f} seconds.")
+    return False
+
+def run_gunicorn(server, args):
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(arbiter, worker):
+        SharedStore.attach(args.store_dir, args.poll_interval)
+
+    class DashboardApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    DashboardApplication(server, {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "timeout": args.timeout,
+        # Import the app once in the master; the workers share its code pages and attach to the store after forking
+        "preload_app": True,
+        "post_fork": post_fork,
+    }).run()
+
+def run_single_process(app, args):
+    print("WARN: gunicorn is not installed; serving the dashboard from a single threaded process.")
+    SharedStore.attach(args.store_dir, args.poll_interval)
+    host, _, port = args.bind.rpartition(":")
+    app.run(host=host or "127.0.0.1", port=int(port), debug=False, threaded=True)
+
+def main():
+    args = parse_args()
+    # Stop the loader too when the server is terminated (gunicorn installs its own handlers)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    previous = SharedStore.read_pointer(args.store_dir)
+    loader = start_loader(args.store_dir, args.poll_interval)
+    try:
+        if not wait_for_store(args.store_dir, loader, previous and previous["version"], args.load_timeout):
+            return 1
+        from app import app
+        if HAS_GUNICORN:
+            run_gunicorn(app.server, args)
+        else:
+            run_single_process(app, args)
+    finally:
+        loader.terminate()
+        loader.join()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 import sys
 import os
+import functools
+import multiprocessing
+import threading
+import weakref
+
+from src.python.Backend import ExcelIngest, SnapshotCache, KpiCube, RetentionCube, FilterIndex, LabelMatrix, EfficacySketch
 
 def resource_path(relative_path):
     """ Get the absolute path to a resource bundled with PyInstaller """
@@ -20,25 +26,265 @@ current_date = date(2025, 3, 15)
 # import data from xlsx file
 excel_file = resource_path("data/onboarding_tracking_report.xlsx")
 
-# Load the workbook
-xls = pd.ExcelFile(excel_file)
+# Perception/impact data (see Tab 5 below)
+excel_file_path = resource_path("data/productivity_impact_report.xlsx")
+
+def load_onboarding_data(excel_file, max_workers=None):
+    """Read every platform sheet of the onboarding report into a single DataFrame."""
+    # Each sheet is parsed in its own worker process and tagged with its platform
+    df_list = ExcelIngest.read_platform_sheets(excel_file, max_workers=max_workers)
+
+    # Concatenate into a single DataFrame
+    df = pd.concat(df_list, ignore_index=True, copy=False)
+
+    # Add aggregate habit columns and pack the per-day habit columns into bit masks
+    df = pack_habit_days(df)
+    df = normalize_onboarding_frame(df)
+    if occupation_column in df.columns:
+        df[occupation_category_column] = categorize_occupations(df[occupation_column])
+
+    # Keep users in first-login order so date ranges are contiguous row ranges (see date_range_slice)
+    return df.sort_values(login_date_col, kind="stable", na_position="last", ignore_index=True)
+
+# Columns holding per-day activity counts, e.g. "Used breaks on day 3"
+day_column_prefixes = [
+    "Did morning habits on day",
+    "Did evening habits on day",
+    "Used breaks on day",
+    "Used focus mode on day"
+]
+num_habit_days = 28
+
+# Rows of the packed habit days that count towards stickiness: the "Did ... on day N" habits
+stickiness_habit_rows = [i for i, prefix in enumerate(day_column_prefixes) if prefix.startswith("Did ")]
+
+# Per-habit totals over the 28 days, and the packed days (bit d-1 set = active on day d), in prefix order
+habit_total_columns = ["did_morning_habit", "did_evening_habit", "did_break_habit", "did_focus_session"]
+habit_day_columns = ["morning_habit_days", "evening_habit_days", "break_habit_days", "focus_session_days"]
+
+login_date_col = "First desktop login date"
+date_columns = [login_date_col, "Last updated date"]
+category_columns = ["Subscription Status", "platform"]
+
+def normalize_onboarding_frame(df):
+    """
+    Give the onboarding frame its canonical types, once, so the callbacks only need cheap comparisons:
+    dates as datetime64 (day precision), subscription/platform as lower-cased categoricals,
+    and every yes/no flag as bool. (The day columns are packed separately, see pack_habit_days.)
+    """
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.normalize()
+
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype("string").str.lower().astype("category")
+
+    # Flag columns that came through as object (e.g. because of blank cells) become bool too
+    for col in df.columns:
+        if df[col].dtype == object:
+            values = df[col].dropna()
+            if len(values) and values.map(lambda v: isinstance(v, bool)).all():
+                df[col] = df[col].fillna(False).astype(bool)
+    return df
+
+###//////////////////////////////////////////
+### Packed habit days
+###//////////////////////////////////////////
+
+def pack_habit_days(df):
+    """
+    Replace the 4 x 28 "<habit> on day N" count columns with the did_* totals and one uint32 mask per habit.
+    Bit N-1 of a mask is set when the user did that habit at least once on day N.
+    """
+    day_cols = [f"{prefix} {day}" for prefix in day_column_prefixes for day in range(1, num_habit_days + 1)]
+    counts = (
+        df.reindex(columns=day_cols, fill_value=0).fillna(0).to_numpy(dtype=np.int64)
+        .reshape(len(df), len(day_column_prefixes), num_habit_days)
+    )
+    day_bits = np.left_shift(np.uint32(1), np.arange(num_habit_days, dtype=np.uint32))
+    masks = np.bitwise_or.reduce(np.where(counts > 0, day_bits, np.uint32(0)), axis=2)
+
+    df = df.drop(columns=[col for col in day_cols if col in df.columns])
+    totals = counts.sum(axis=2)
+    packed = {col: totals[:, i] for i, col in enumerate(habit_total_columns)}
+    packed.update({col: masks[:, i] for i, col in enumerate(habit_day_columns)})
+    return pd.concat([df, pd.DataFrame(packed, index=df.index)], axis=1)
+
+def habit_day_masks(df):
+    """The packed habit days of df's users as a (users x 4) uint32 array, in day_column_prefixes order."""
+    return df[habit_day_columns].to_numpy(dtype=np.uint32)
+
+def popcount(masks):
+    """Number of set bits (active days) in each mask."""
+    masks = np.asarray(masks, dtype=np.uint32)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    # NumPy < 2.0: count the bits byte by byte
+    bits = np.unpackbits(masks[..., None].view(np.uint8), axis=-1)
+    return bits.sum(axis=-1, dtype=np.int64)
+
+def habit_day_horizon(days):
+    """Clamp a requested day horizon to the days held in the masks (1..num_habit_days)."""
+    if days is None:
+        return num_habit_days
+    days = int(days)
+    if not 1 <= days <= num_habit_days:
+        print(f"WARN: {days}-day habit horizon requested, the packed habit days only cover 1..{num_habit_days}")
+        days = min(max(days, 1), num_habit_days)
+    return days
+
+def habit_day_bits(masks, days=num_habit_days):
+    """Unpack the first `days` bits of each mask: a bool (users x 4 x days) block, [u, h, d] = bit d of habit h."""
+    day_bits = np.left_shift(np.uint32(1), np.arange(habit_day_horizon(days), dtype=np.uint32))
+    return (masks[:, :, None] & day_bits) != 0
+
+def habit_day_counts(masks, days=num_habit_days):
+    """Users active per habit and day: a (4 x days) array, where [h, d] counts bit d of habit h."""
+    return habit_day_bits(masks, days).sum(axis=0)
+
+def any_habit_activity(masks):
+    """Whether each user did any of the packed habits on any day."""
+    return (masks != 0).any(axis=1)
+
+###//////////////////////////////////////////
+### Usage flags (Function Usage tab)
+###//////////////////////////////////////////
+
+geek_col = 'Switched to geek mode'
+feature_map = {
+    "Pomodoro Mode": "Started pomodoro", "Focus Mode": "Started focus mode",
+    "Time Tracker": "Enabled Time Tracker", "Late No More": "Enabled Late No More",
+    "App Blocking": "Blocked an app", "URL Blocking": "Blocked a url", "Mobile Blocking": "Blocked on mobile"
+}
+habit_map = {
+    "Break Habit": "Started a break activity",
+    "Morning Routine": "Started morning routine",
+    "Evening Routine": "Started evening routine"
+}
+usage_flag_columns = [geek_col] + list(feature_map.values()) + list(habit_map.values())
+usage_flag_position = {col: i for i, col in enumerate(usage_flag_columns)}
+
+def usage_flag_block(df):
+    """The usage flags of df's users as a bool (users x usage_flag_columns) block (all False for a missing column)."""
+    present = [col for col in usage_flag_columns if col in df.columns]
+    block = np.zeros((len(df), len(usage_flag_columns)), dtype=bool)
+    if present:
+        block[:, [usage_flag_position[col] for col in present]] = df[present].to_numpy(dtype=bool)
+    return block
+
+
+###//////////////////////////////////////////
+### Occupation categories
+###//////////////////////////////////////////
+
+occupation_column = "Occupation"
+hopes_column = "Hopes for using Focus Bear"
+occupation_category_column = "Occupation category"
+
+# Raw occupation string -> category; kept across reloads, so a new report only parses the values not seen before
+_occupation_category_memo = {}
 
-# Read each sheet into a DataFrame, adding a column for the sheet name
-df_list = []
-for sheet_name in xls.sheet_names:
-    temp_df = pd.read_excel(excel_file, sheet_name=sheet_name)
-    temp_df["platform"] = sheet_name
-    df_list.append(temp_df)
+def occupation_category(occupation):
+    """Extract just the main category from complex occupation data"""
+    if not isinstance(occupation, str):
+       return "Unknown"
 
-# Concatenate into a single DataFrame
-df = pd.concat(df_list, ignore_index=True)
+    # Check if it's in JSON-like format: {"Category":{"Subcategory":"Detail"}}
+    if occupation.startswith('{') and '}' in occupation:
+        try:
+            # Extract just the main category (the first key)
+            category = occupation.split(':', 1)[0].replace('{', '').replace('"', '').strip().lower()
+            return category
+        except:
+            return occupation
+    else:
+        # If it's not in the complex format, return as is
+        if len(occupation) > 30:
+            return "other"
+        category = occupation.split(':', 1)[0].replace('"', '').strip().lower()
+        return category
 
-# Add aggregate habit columns for analysis
-df["did_morning_habit"] = df[[f"Did morning habits on day {i}" for i in range(1, 29)]].sum(axis=1)
-df["did_evening_habit"] = df[[f"Did evening habits on day {i}" for i in range(1, 29)]].sum(axis=1)
-df["did_break_habit"] = df[[f"Used breaks on day {i}" for i in range(1, 29)]].sum(axis=1)
-df["did_focus_session"] = df[[f"Used focus mode on day {i}" for i in range(1, 29)]].sum(axis=1)
+def categorize_occupations(occupations):
+    """
+    Occupation category of every user as a categorical column.
+    Each distinct raw value is parsed once (and remembered in _occupation_category_memo); rows only get codes.
+    """
+    raw_codes, raw_values = pd.factorize(occupations, use_na_sentinel=True)
+    for value in raw_values:
+        if value not in _occupation_category_memo:
+            _occupation_category_memo[value] = occupation_category(value)
 
+    value_categories = [_occupation_category_memo[value] for value in raw_values]
+    categories = sorted(set(value_categories) | {"Unknown"})
+    category_codes = {category: code for code, category in enumerate(categories)}
+
+    # Map raw value codes to category codes; missing values (-1) become "Unknown"
+    code_map = np.array([category_codes[category] for category in value_categories] + [category_codes["Unknown"]], dtype=np.int32)
+    codes = code_map[raw_codes]
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def load_onboarding_frame():
+    """Load the onboarding data, re-parsing the xlsx file only when it changed since the last snapshot."""
+    frames = SnapshotCache.cached_frames(
+        "onboarding", [excel_file], lambda: {"df": load_onboarding_data(excel_file)}, ["df"]
+    )
+    return frames["df"]
+
+
+
+###//////////////////////////////////////////
+### Date range slicing
+###//////////////////////////////////////////
+
+def date_range_bounds(df, start_date, end_date, date_column=login_date_col):
+    """
+    Row positions [lo, hi) of the users whose date falls within start_date..end_date (inclusive).
+    df must be sorted by date_column, as the onboarding frame is; missing dates sort last and never match.
+    """
+    start_dt = pd.to_datetime(start_date).normalize()
+    end_dt = pd.to_datetime(end_date).normalize()
+    dates = df[date_column].to_numpy()
+    lo = dates.searchsorted(start_dt.to_datetime64(), side="left")
+    hi = dates.searchsorted(end_dt.to_datetime64(), side="right")
+    return lo, max(lo, hi)
+
+def date_range_slice(df, start_date, end_date, date_column=login_date_col):
+    """Users whose first login falls within start_date..end_date, as a positional slice (no copy)."""
+    lo, hi = date_range_bounds(df, start_date, end_date, date_column)
+    return df.iloc[lo:hi]
+
+def previous_period_dates(start_date, end_date):
+    """The period of the same length ending the day before start_date, as Timestamps."""
+    start_dt = pd.to_datetime(start_date).normalize()
+    end_dt = pd.to_datetime(end_date).normalize()
+    prev_end_dt = start_dt - pd.Timedelta(days=1)
+    prev_start_dt = prev_end_dt - (end_dt - start_dt)
+    return prev_start_dt, prev_end_dt
+
+def unpack_date_range(date_range):
+    """(start, end) from the data of a date-range store (see FrontEnd), (None, None) if nothing is picked."""
+    date_range = date_range or {}
+    return date_range.get('start'), date_range.get('end')
+
+def previous_period_slice(df, start_date, end_date, date_column=login_date_col):
+    """Users of the previous cohort (see previous_period_dates), as a positional slice (no copy)."""
+    prev_start_dt, prev_end_dt = previous_period_dates(start_date, end_date)
+    return date_range_slice(df, prev_start_dt, prev_end_dt, date_column)
+
+def select_users(df, start_date=None, end_date=None, subscription='all', platform='all'):
+    """
+    Users of df within start_date..end_date (if given) matching the subscription/platform filters ('all' = any).
+    Uses the dataset's FilterIndex when df is the current onboarding frame, else indexes df on the fly.
+    """
+    if not (start_date and end_date) and subscription in (None, 'all') and platform in (None, 'all'):
+        return df
+    dataset = _current_dataset
+    if dataset.is_loaded("df") and df is dataset.df:
+        index = dataset.filter_index
+    else:
+        index = FilterIndex.FilterIndex(df)
+    return index.select(start_date, end_date, subscription=subscription, platform=platform)
 
 
 ###//////////////////////////////////////////
@@ -47,8 +293,12 @@ df["did_focus_session"] = df[[f"Used focus mode on day {i}" for i in range(1, 29
 
 # Load CSAT survey data
 feedback_csv_file = resource_path("data/monthly_feedback_ratings.csv")
-df_feedback_ratings = pd.read_csv(feedback_csv_file)
-df_feedback_ratings['Month'] = pd.to_datetime(df_feedback_ratings['Month'], format='%Y-%m').dt.strftime('%b %Y') # Format for display
+
+def load_feedback_ratings():
+    """Load the monthly CSAT survey ratings."""
+    df_feedback_ratings = pd.read_csv(feedback_csv_file)
+    df_feedback_ratings['Month'] = pd.to_datetime(df_feedback_ratings['Month'], format='%Y-%m').dt.strftime('%b %Y') # Format for display
+    return df_feedback_ratings
 
 # Load user perception log data
 signup_date_col = 'User Signup Date'
@@ -57,59 +307,12 @@ impact_category_col = 'Impact Category'   # Column specifying 'perception_of_pro
 quantity_logged_col = 'Quantity Logged' # The score/value
 user_id_col = 'User DB ID'            # Column for unique user identification
 
-# Load the Excel file for perception/impact data
-excel_file_path = resource_path("data/productivity_impact_report.xlsx")
-df_impact_raw = pd.read_excel(excel_file_path)
-
-# Function to process data for a specific impact category
-def process_impact_category_data(df_raw, category_name, max_weeks_filter=16): # Added max_weeks_filter
-    if df_raw.empty:
-        print(f"WARNING: Raw impact data is empty. Cannot process for {category_name}.")
-        return pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count'])
-
-    # Create a copy to avoid modifying the original df_raw within this function for different categories
-    df_processing = df_raw.copy()
-
-    # Ensure essential columns exist
-    required_columns = [signup_date_col, completion_date_col, impact_category_col, quantity_logged_col, user_id_col]
-    for col in required_columns:
-        if col not in df_processing.columns:
-            print(f"ERROR: Essential column '{col}' not found in the Excel sheet for processing {category_name}!")
-            return pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count'])
-
-    # Ensure date columns are datetime
-    df_processing[signup_date_col] = pd.to_datetime(df_processing[signup_date_col], errors='coerce')
-    df_processing[completion_date_col] = pd.to_datetime(df_processing[completion_date_col], errors='coerce')
-    
-    # Ensure quantity_logged is numeric
-    df_processing[quantity_logged_col] = pd.to_numeric(df_processing[quantity_logged_col], errors='coerce')
-
-
-    # Filter for the specific impact category
-    df_category = df_processing[df_processing[impact_category_col] == category_name].copy() # Use .copy() to avoid SettingWithCopyWarning
-        
-    # Drop rows where essential dates, score, or user_id are missing (NaN/NaT)
-    # This will happen if to_datetime or to_numeric coerced values to NaT/NaN due to bad data
-    cols_to_check_for_na = [signup_date_col, completion_date_col, quantity_logged_col, user_id_col]
-    df_category.dropna(subset=cols_to_check_for_na, inplace=True)
-        
-    # Calculate weeks since signup
-    df_category['Weeks Since Signup'] = ((df_category[completion_date_col] - df_category[signup_date_col]).dt.days // 7) + 1
-    
-    # Filter out non-positive weeks and apply max_weeks_filter
-    df_category = df_category[df_category['Weeks Since Signup'] > 0]
-    if max_weeks_filter:
-         df_category = df_category[df_category['Weeks Since Signup'] <= max_weeks_filter]
-
-    # Aggregate: Median score and count of unique users
-    df_processed = df_category.groupby('Weeks Since Signup').agg(
-        Median_Score=(quantity_logged_col, 'median'),
-        User_Count=(user_id_col, 'nunique') 
-    ).reset_index()
-    
-    df_processed.rename(columns={'Median_Score': 'Median Score', 'User_Count': 'User Count'}, inplace=True)
-    if not df_processed.empty:
-       return df_processed
+def load_impact_frame():
+    """Load the perception/impact log, re-parsing the xlsx file only when it changed since the last snapshot."""
+    frames = SnapshotCache.cached_frames(
+        "impact", [excel_file_path], lambda: {"df_impact_raw": pd.read_excel(excel_file_path)}, ["df_impact_raw"]
+    )
+    return frames["df_impact_raw"]
 
 # Define the categories to process
 categories_to_process = {
@@ -119,30 +322,312 @@ categories_to_process = {
     "sleep": "hours_of_sleep"
 }
 
-# Process for each required category and store in a dictionary or individual variables
-processed_dataframes = {}
-for df_name_key, category_value in categories_to_process.items():
-    # Your current code has max_weeks_filter=16, so we'll use that.
-    # If different categories need different max_weeks, you can adjust this.
-    processed_dataframes[f'df_efficacy_{df_name_key}'] = process_impact_category_data(df_impact_raw, category_value, max_weeks_filter=16)
+efficacy_max_weeks = 16
+
+empty_efficacy_df = pd.DataFrame(columns=EfficacySketch.output_columns)
+
+def aggregate_impact_log(df_raw, category_names, max_weeks_filter=efficacy_max_weeks):
+    """
+    Aggregate the impact log for the given categories in a single chunked pass (see EfficacySketch).
+    Returns the EfficacyAggregator, or None when the log is empty or lacks an essential column.
+    """
+    if df_raw.empty:
+        print(f"WARNING: Raw impact data is empty. Cannot process for {', '.join(category_names)}.")
+        return None
+
+    # Ensure essential columns exist
+    required_columns = [signup_date_col, completion_date_col, impact_category_col, quantity_logged_col, user_id_col]
+    for col in required_columns:
+        if col not in df_raw.columns:
+            print(f"ERROR: Essential column '{col}' not found in the Excel sheet for processing {', '.join(category_names)}!")
+            return None
+
+    return EfficacySketch.aggregate(
+        EfficacySketch.iter_chunks(df_raw[required_columns]), category_names, max_weeks=max_weeks_filter,
+        signup_col=signup_date_col, completion_col=completion_date_col, category_col=impact_category_col,
+        score_col=quantity_logged_col, user_col=user_id_col,
+    )
+
+# Function to process data for a specific impact category
+def process_impact_category_data(df_raw, category_name, max_weeks_filter=efficacy_max_weeks):
+    """Weekly median score and user count of one impact category."""
+    aggregator = aggregate_impact_log(df_raw, [category_name], max_weeks_filter)
+    return aggregator.frame(category_name) if aggregator is not None else empty_efficacy_df.copy()
+
+def process_efficacy_data(df_impact_raw):
+    """Process every category in categories_to_process in one pass over the log, keyed as 'df_efficacy_<name>'."""
+    aggregator = aggregate_impact_log(df_impact_raw, list(categories_to_process.values()))
+    processed_dataframes = {}
+    for df_name_key, category_value in categories_to_process.items():
+        frame = aggregator.frame(category_value) if aggregator is not None else empty_efficacy_df.copy()
+        processed_dataframes[f'df_efficacy_{df_name_key}'] = frame
+    return processed_dataframes
+
+
+###//////////////////////////////////////////
+### Lazily loaded dataset
+###//////////////////////////////////////////
+
+def lazy_property(loader):
+    """
+    Property that runs loader the first time it is read and memoizes the result on the instance.
+    Loading is guarded by the instance lock, so concurrent callbacks wait for a single load.
+    """
+    attr_name = loader.__name__
+
+    @functools.wraps(loader)
+    def getter(self):
+        try:
+            return self._loaded[attr_name]
+        except KeyError:
+            pass
+        with self._lock:
+            if attr_name not in self._loaded:
+                self._loaded[attr_name] = loader(self)
+            return self._loaded[attr_name]
+
+    return property(getter)
+
+
+class Dataset:
+    """
+    The dashboard's data. Nothing is read from disk until a frame is first accessed,
+    so importing this module (and the tab modules that use it) is cheap.
+    """
+
+    def __init__(self, version=1, source_stamp=None, store=None):
+        self.version = version
+        self.source_stamp = source_stamp
+        # A SharedStore version to read the frames from instead of the data files (see serve.py)
+        self.store = store
+        self._lock = threading.RLock()
+        self._loaded = {}
+
+    def is_loaded(self, name):
+        """Whether the named property has been loaded already."""
+        return name in self._loaded
+
+    def _stored(self, name, loader):
+        """The named value (a frame or derived structure) from the shared store when the dataset is attached to one, else loader()."""
+        if self.store is not None and name in self.store:
+            return self.store.value(name)
+        return loader()
+
+    @lazy_property
+    def df(self):
+        return self._stored("df", load_onboarding_frame)
+
+    @lazy_property
+    def df_impact_raw(self):
+        return self._stored("df_impact_raw", load_impact_frame)
+
+    @lazy_property
+    def df_feedback_ratings(self):
+        return self._stored("df_feedback_ratings", load_feedback_ratings)
+
+    @lazy_property
+    def efficacy_frames(self):
+        return self._stored("efficacy_frames", lambda: process_efficacy_data(self.df_impact_raw))
 
-# For easier access in T5UserFeedback.py, you can assign them to individual variables:
-df_efficacy_perception = processed_dataframes.get('df_efficacy_perception', pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count']))
-df_efficacy_mood = processed_dataframes.get('df_efficacy_mood', pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count']))
-df_efficacy_energy = processed_dataframes.get('df_efficacy_energy', pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count']))
-df_efficacy_sleep = processed_dataframes.get('df_efficacy_sleep', pd.DataFrame(columns=['Weeks Since Signup', 'Median Score', 'User Count']))
+    # For easier access in T5UserFeedback.py
+    @property
+    def df_efficacy_perception(self):
+        return self.efficacy_frames.get('df_efficacy_perception', empty_efficacy_df)
+
+    @property
+    def df_efficacy_mood(self):
+        return self.efficacy_frames.get('df_efficacy_mood', empty_efficacy_df)
+
+    @property
+    def df_efficacy_energy(self):
+        return self.efficacy_frames.get('df_efficacy_energy', empty_efficacy_df)
+
+    @property
+    def df_efficacy_sleep(self):
+        return self.efficacy_frames.get('df_efficacy_sleep', empty_efficacy_df)
+
+    # minmax dates
+    @lazy_property
+    def min_date(self):
+        """The minimum first login date as 'YYYY-MM-DD'."""
+        min_date = self.df["First desktop login date"].min()
+        if not isinstance(min_date, str):
+            min_date = min_date.strftime('%Y-%m-%d')
+        return min_date
+
+    @lazy_property
+    def max_date(self):
+        """The maximum first login date as 'YYYY-MM-DD'."""
+        max_date = self.df["First desktop login date"].max()
+        if not isinstance(max_date, str):
+            max_date = max_date.strftime('%Y-%m-%d')
+        return max_date
+
+    @lazy_property
+    def kpi_cube(self):
+        """Cumulative per-day Overview KPIs per platform x subscription (see KpiCube)."""
+        return self._stored("kpi_cube", lambda: KpiCube.build_cube(self.df))
+
+    @lazy_property
+    def filter_index(self):
+        """Per-value bitmaps of the tab filter columns (see FilterIndex)."""
+        return FilterIndex.FilterIndex(self.df, bitmaps=self._stored("filter_index", lambda: None))
+
+    @lazy_property
+    def hopes_matrix(self):
+        """The users' hopes as a sparse user x hope matrix, one row per df row (see LabelMatrix)."""
+        def build():
+            if hopes_column not in self.df.columns:
+                return LabelMatrix.build_matrix(pd.Series([None] * len(self.df), dtype=object))
+            return LabelMatrix.build_matrix(self.df[hopes_column])
+        return self._stored("hopes_matrix", build)
+
+    @lazy_property
+    def usage_flags(self):
+        """The usage flags of every df row (see usage_flag_block)."""
+        return self._stored("usage_flags", lambda: usage_flag_block(self.df))
+
+    @lazy_property
+    def retention_cube(self):
+        """Weekly signup-cohort activity per platform x subscription (see RetentionCube)."""
+        return self._stored("retention_cube", lambda: RetentionCube.build_cube(self.df))
+
+    def frames(self):
+        """Every DataFrame loaded so far."""
+        for value in list(self._loaded.values()):
+            if isinstance(value, dict):
+                yield from (frame for frame in value.values() if isinstance(frame, pd.DataFrame))
+            elif isinstance(value, pd.DataFrame):
+                yield value
+
+    def load_all(self):
+        """Load every frame, starting with the ones the first page view needs."""
+        for name in ("df", "min_date", "max_date", "kpi_cube", "filter_index", "hopes_matrix", "usage_flags", "retention_cube", "df_feedback_ratings", "efficacy_frames"):
+            getattr(self, name)
+
+
+###//////////////////////////////////////////
+### Versioned dataset registry
+###//////////////////////////////////////////
+
+# Files the dataset is built from; a change to any of them triggers a reload
+data_source_files = [excel_file, excel_file_path, feedback_csv_file]
+
+def data_source_stamp():
+    """(path, modified time, size) of every data file, used to notice when the reports are replaced."""
+    stamp = []
+    for path in data_source_files:
+        try:
+            stat = os.stat(path)
+            stamp.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+_registry_lock = threading.Lock()
+_current_dataset = Dataset(version=1, source_stamp=data_source_stamp())
+# Frames of the version that was last swapped out; they stay alive while in-flight callbacks hold them
+_retired_frames = []
+
+def get_dataset():
+    """
+    Return the current dataset version. Callbacks should call this once and read every frame
+    from the returned object, so a reload in the middle of a callback can't mix two versions.
+    """
+    return _current_dataset
+
+def retired_version_alive():
+    """Whether any frame of the previously swapped-out version is still referenced."""
+    return any(ref() is not None for ref in _retired_frames)
+
+def reload_dataset(source_stamp=None, store=None):
+    """
+    Build a new dataset version from the data files (or from a SharedStore version, which brings
+    its own version number) and swap it in once it is fully loaded.
+    The current version keeps serving callbacks during the rebuild.
+
+    Returns:
+        The new Dataset, or None if the rebuild failed (the current version is kept)
+    """
+    global _current_dataset, _retired_frames
+    if store is not None:
+        new_dataset = Dataset(version=store.version, source_stamp=store.source_stamp, store=store)
+    else:
+        new_dataset = Dataset(version=_current_dataset.version + 1, source_stamp=source_stamp or data_source_stamp())
+    try:
+        new_dataset.load_all()
+    except Exception as e:
+        print(f"ERROR: Reloading the data files failed ({e}). Keeping dataset version {_current_dataset.version}.")
+        return None
+
+    with _registry_lock:
+        old_dataset = _current_dataset
+        _current_dataset = new_dataset
+        _retired_frames = [weakref.ref(frame) for frame in old_dataset.frames()]
+    print(f"INFO: Loaded dataset version {new_dataset.version}.")
+    return new_dataset
+
+def watch_data_files(interval=5.0, stop_event=None, on_reload=None):
+    """
+    Poll the data files and reload the dataset when they change. A change is only picked up once
+    the files have stopped changing for one interval, so a report that is still being copied
+    isn't read half-written. No rebuild starts while the retired version is still in use,
+    which keeps at most two versions in memory. on_reload(dataset) is called after every reload.
+    """
+    stop_event = stop_event or threading.Event()
+    pending_stamp = None
+    while not stop_event.wait(interval):
+        stamp = data_source_stamp()
+        if stamp == get_dataset().source_stamp:
+            pending_stamp = None
+            continue
+        if stamp != pending_stamp:
+            # Changed since the last poll; wait for the copy to settle
+            pending_stamp = stamp
+            continue
+        if retired_version_alive():
+            continue
+        new_dataset = reload_dataset(stamp)
+        if new_dataset is not None and on_reload is not None:
+            on_reload(new_dataset)
+        pending_stamp = None
+
+def start_data_watcher(interval=5.0):
+    """Start watching the data files in a daemon thread."""
+    if multiprocessing.parent_process() is not None:
+        return None
+    watcher = threading.Thread(name="Data File Watcher", target=watch_data_files, args=(interval,), daemon=True)
+    watcher.start()
+    return watcher
+
+_background_loader = None
+
+def start_background_load():
+    """
+    Start loading the dataset in a daemon thread so the server can start right away.
+    Only the first call starts a load; later calls return the same thread.
+    """
+    global _background_loader
+    # Worker processes of the sheet parser import the app again; they must not load data themselves
+    if multiprocessing.parent_process() is not None:
+        return None
+    with _registry_lock:
+        if _background_loader is None:
+            _background_loader = threading.Thread(name="Dataset Loader", target=get_dataset().load_all, daemon=True)
+            _background_loader.start()
+    return _background_loader
 
-# minmax dates
 def get_min_date():
     """Get the minimum date from the DataFrame."""
-    min_date = df["First desktop login date"].min()
-    if not isinstance(min_date, str):
-        min_date = min_date.strftime('%Y-%m-%d')
-    return min_date
+    return get_dataset().min_date
 
 def get_max_date():
     """Get the maximum date from the DataFrame."""
-    max_date = df["First desktop login date"].max()
-    if not isinstance(max_date, str):
-        max_date = max_date.strftime('%Y-%m-%d')
-    return max_date
\ No newline at end of file
+    return get_dataset().max_date
+
+def __getattr__(name):
+    # Keep `DataHandling.df` and friends working; they now resolve through the lazy dataset
+    if name in ("df", "df_impact_raw", "df_feedback_ratings", "df_efficacy_perception",
+                "df_efficacy_mood", "df_efficacy_energy", "df_efficacy_sleep"):
+        return getattr(get_dataset(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,205 @@
+# This file aggregates the perception/impact log into the weekly efficacy series of the User Feedback tab.
+# The log is read once, in chunks of rows; every (impact category, week since signup) cell keeps a mergeable
+# quantile sketch of the logged scores and a distinct counter of the users who logged them, so memory stays
+# bounded by the number of cells (not by the length of the log) and partial aggregates can be merged.
+
+import numpy as np
+import pandas as pd
+
+chunk_rows = 50_000
+
+# Scores are kept at this many bins per unit: exact for scores logged with up to two decimals
+bins_per_unit = 100
+
+# Distinct counter: exact up to sparse_limit users, then a HyperLogLog with 2**hll_precision registers (~1.6% error)
+hll_precision = 12
+sparse_limit = 512
+
+output_columns = ['Weeks Since Signup', 'Median Score', 'User Count']
+
+
+###//////////////////////////////////////////
+### Sketches
+###//////////////////////////////////////////
+
+class QuantileSketch:
+    """Histogram of scores over fixed-width bins; two sketches merge by adding their bin counts."""
+
+    def __init__(self):
+        self.bins = np.array([], dtype=np.int64)
+        self.counts = np.array([], dtype=np.int64)
+
+    def _combine(self, bins, counts):
+        bins, inverse = np.unique(np.concatenate([self.bins, bins]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]), minlength=len(bins)).astype(np.int64)
+        self.bins = bins
+
+    def add(self, values):
+        bins, counts = np.unique(np.rint(np.asarray(values, dtype=np.float64) * bins_per_unit).astype(np.int64), return_counts=True)
+        self._combine(bins, counts)
+
+    def merge(self, other):
+        self._combine(other.bins, other.counts)
+
+    @property
+    def size(self):
+        return int(self.counts.sum())
+
+    def _value_at(self, rank, cumulative):
+        """The rank-th smallest score (0-based)."""
+        return self.bins[np.searchsorted(cumulative, rank, side='right')] / bins_per_unit
+
+    def quantile(self, q):
+        """The q-quantile of the scores, interpolating linearly between neighbouring ranks (as numpy does)."""
+        if not self.size:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        position = q * (self.size - 1)
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        low_value, high_value = self._value_at(lower, cumulative), self._value_at(upper, cumulative)
+        return low_value + (high_value - low_value) * (position - lower)
+
+    def median(self):
+        """The median of the scores (the mean of the two middle scores for an even count, as pandas does)."""
+        if not self.size:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        middle = (self.size - 1) // 2
+        if self.size % 2:
+            return self._value_at(middle, cumulative)
+        return (self._value_at(middle, cumulative) + self._value_at(middle + 1, cumulative)) / 2
+
+
+class DistinctCounter:
+    """
+    Count of distinct (hashed) user ids. Exact while it holds few users; past sparse_limit it switches to a
+    HyperLogLog (a fixed array of registers), which merges by taking the register-wise maximum.
+    """
+
+    def __init__(self):
+        self.hashes = np.array([], dtype=np.uint64)
+        self.registers = None
+
+    def add(self, ids):
+        self._add_hashes(pd.util.hash_array(np.asarray(ids).astype(str).astype(object)))
+
+    def _add_hashes(self, hashes):
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > sparse_limit:
+                self.registers = np.zeros(1 << hll_precision, dtype=np.uint8)
+                hashes, self.hashes = self.hashes, np.array([], dtype=np.uint64)
+            else:
+                return
+        value_bits = 64 - hll_precision
+        register = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << value_bits) - 1)
+        # Position of the leftmost 1 bit of the remaining bits (value_bits + 1 when they are all zero)
+        rank = (value_bits + 1 - np.frexp(rest.astype(np.float64))[1]).astype(np.uint8)
+        np.maximum.at(self.registers, register, rank)
+
+    def merge(self, other):
+        if other.registers is not None:
+            if self.registers is None:
+                self.registers = other.registers.copy()
+                hashes, self.hashes = self.hashes, np.array([], dtype=np.uint64)
+                self._add_hashes(hashes)
+            else:
+                np.maximum(self.registers, other.registers, out=self.registers)
+        else:
+            self._add_hashes(other.hashes)
+
+    def count(self):
+        if self.registers is None:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            estimate = m * np.log(m / empty) # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+###//////////////////////////////////////////
+### Aggregating the log
+###//////////////////////////////////////////
+
+def iter_chunks(df, rows=None):
+    """Row chunks of a frame (views, no copies)."""
+    rows = rows or chunk_rows
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+
+class EfficacyAggregator:
+    """Sketches per (impact category, week since signup), filled one chunk of the impact log at a time."""
+
+    def __init__(self, categories, max_weeks=16, signup_col='User Signup Date', completion_col='Completion Date',
+                 category_col='Impact Category', score_col='Quantity Logged', user_col='User DB ID'):
+        self.categories = list(categories)
+        self.max_weeks = max_weeks
+        self.signup_col, self.completion_col = signup_col, completion_col
+        self.category_col, self.score_col, self.user_col = category_col, score_col, user_col
+        self.cells = {} # (category position, week) -> (QuantileSketch, DistinctCounter)
+
+    @property
+    def required_columns(self):
+        return [self.signup_col, self.completion_col, self.category_col, self.score_col, self.user_col]
+
+    def _cell(self, key):
+        if key not in self.cells:
+            self.cells[key] = (QuantileSketch(), DistinctCounter())
+        return self.cells[key]
+
+    def add_chunk(self, chunk):
+        """Add the rows of one chunk of the log."""
+        category_codes = pd.Categorical(chunk[self.category_col], categories=self.categories).codes.astype(np.int64)
+        signup = pd.to_datetime(chunk[self.signup_col], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        completion = pd.to_datetime(chunk[self.completion_col], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        scores = pd.to_numeric(chunk[self.score_col], errors='coerce').to_numpy(dtype=np.float64)
+        users = chunk[self.user_col].to_numpy()
+
+        valid = (category_codes >= 0) & ~np.isnat(signup) & ~np.isnat(completion) & ~np.isnan(scores) & pd.notna(users)
+        days = np.floor_divide((completion[valid] - signup[valid]).astype(np.int64), 86_400 * 10**9)
+        weeks = np.floor_divide(days, 7) + 1
+        keep = weeks > 0
+        if self.max_weeks:
+            keep &= weeks <= self.max_weeks
+
+        codes, weeks = category_codes[valid][keep], weeks[keep]
+        scores, users = scores[valid][keep], users[valid][keep]
+
+        # One sketch update per cell present in the chunk
+        keys = weeks * len(self.categories) + codes
+        order = np.argsort(keys, kind='stable')
+        cell_keys, starts = np.unique(keys[order], return_index=True)
+        for key, rows in zip(cell_keys, np.split(order, starts[1:])):
+            sketch, counter = self._cell((int(key % len(self.categories)), int(key // len(self.categories))))
+            sketch.add(scores[rows])
+            counter.add(users[rows])
+
+    def merge(self, other):
+        """Fold the cells of another aggregator (e.g. of another part of the log) into this one."""
+        for key, (sketch, counter) in other.cells.items():
+            own_sketch, own_counter = self._cell(key)
+            own_sketch.merge(sketch)
+            own_counter.merge(counter)
+
+    def frame(self, category):
+        """Weekly series of one category: 'Weeks Since Signup', 'Median Score', 'User Count'."""
+        position = self.categories.index(category)
+        weeks = sorted(week for code, week in self.cells if code == position)
+        return pd.DataFrame({
+            'Weeks Since Signup': np.array(weeks, dtype=np.int64),
+            'Median Score': np.array([self.cells[(position, week)][0].median() for week in weeks], dtype=np.float64),
+            'User Count': np.array([self.cells[(position, week)][1].count() for week in weeks], dtype=np.int64),
+        }, columns=output_columns)
+
+
+def aggregate(chunks, categories, max_weeks=16, **columns):
+    """Run the aggregator over an iterable of log chunks (e.g. iter_chunks(df), or read_csv(..., chunksize=...))."""
+    aggregator = EfficacyAggregator(categories, max_weeks=max_weeks, **columns)
+    for chunk in chunks:
+        aggregator.add_chunk(chunk)
+    return aggregator
@@ -0,0 +1,52 @@
+# This file parses the platform sheets of the onboarding workbook.
+# It has no import-time side effects so that worker processes can import it safely.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+
+def read_platform_sheet(excel_file, sheet_name):
+    """Read a single platform sheet and tag its rows with the platform name. Runs in a worker process."""
+    sheet_df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    sheet_df["platform"] = sheet_name
+    return sheet_df
+
+
+def read_platform_sheets(excel_file, max_workers=None):
+    """
+    Read every sheet of the workbook, tagging each one with a 'platform' column.
+
+    Args:
+        excel_file: Path to the onboarding workbook (one sheet per platform)
+        max_workers: Upper bound on worker processes (defaults to the number of cores)
+
+    Returns:
+        List of DataFrames, one per sheet, in workbook order
+    """
+    # Load the workbook once to find the platform sheets
+    with pd.ExcelFile(excel_file) as xls:
+        sheet_names = xls.sheet_names
+
+        # Parse the sheets in parallel, one worker per sheet (up to the number of cores)
+        if len(sheet_names) > 1:
+            workers = min(len(sheet_names), max_workers or os.cpu_count() or 1)
+            try:
+                # Spawned, not forked: the sheets are read from background threads while the server's threads
+                # run, and a forked child would inherit locks held by those threads. Spawned workers only run
+                # read_platform_sheet, so the pool is also safe to start from the loader process (see serve.py)
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    return list(pool.map(read_platform_sheet, repeat(excel_file), sheet_names))
+            except Exception as e:
+                print(f"WARN: Parallel sheet parsing failed ({e}). Reading sheets one by one.")
+
+        # Fallback: read each sheet from the already opened workbook
+        df_list = []
+        for sheet_name in sheet_names:
+            temp_df = xls.parse(sheet_name)
+            temp_df["platform"] = sheet_name
+            df_list.append(temp_df)
+        return df_list
@@ -0,0 +1,107 @@
+# This file indexes the onboarding frame by the tab filters (subscription status, platform).
+# One bitmap (packed bits, one per user row) is built per distinct value when the data loads; a filtered
+# date range is then the bitwise AND of the selected bitmaps over the date-sorted rows in range,
+# so the callbacks never compare strings. A new filter dimension is one more entry in filter_columns.
+
+import numpy as np
+import pandas as pd
+
+from src.python.Backend import DataHandling
+
+login_date_col = "First desktop login date"
+
+# Filter name -> column it selects on
+filter_columns = {
+    "subscription": "Subscription Status",
+    "platform": "platform",
+}
+
+# Filter values that select several column values (None = missing)
+value_aliases = {
+    "platform": {"unknown": (None, "", "unknown")},
+}
+
+
+class FilterIndex:
+    """Bitmaps of the rows holding each distinct value of the filter columns of one (date-sorted) frame."""
+
+    def __init__(self, df, columns=None, bitmaps=None):
+        self.df = df
+        self.num_rows = len(df)
+        self.columns = dict(filter_columns if columns is None else columns)
+        # Bitmaps of an earlier index of the same frame (e.g. from a SharedStore) are used as they are
+        self.bitmaps = bitmaps
+        if bitmaps is None:
+            self.bitmaps = {}
+            for name, column in self.columns.items():
+                self.bitmaps[name] = self._value_bitmaps(df[column]) if column in df.columns else {}
+        self._empty = np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+
+    def _value_bitmaps(self, values):
+        """{value: packed bitmap} for every distinct value of a column (missing values under None)."""
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("string").str.lower().astype("category")
+        codes = values.cat.codes.to_numpy()
+        bitmaps = {None: np.packbits(codes == -1)}
+        for code, value in enumerate(values.cat.categories):
+            bitmaps[str(value).lower()] = np.packbits(codes == code)
+        return bitmaps
+
+    def bitmap(self, name, value):
+        """Packed bitmap of the rows matching one filter value, None when the filter selects every row ('all')."""
+        if value is None or value == 'all':
+            return None
+        value = str(value).lower()
+        matches = value_aliases.get(name, {}).get(value, (value,))
+        maps = [self.bitmaps[name][match] for match in matches if match in self.bitmaps[name]]
+        if not maps:
+            return self._empty
+        return np.bitwise_or.reduce(maps) if len(maps) > 1 else maps[0]
+
+    def row_mask(self, name, value, lo=0, hi=None):
+        """Bool mask of the rows [lo, hi) matching one filter value (all True for 'all')."""
+        hi = self.num_rows if hi is None else hi
+        bitmap = self.bitmap(name, value)
+        if bitmap is None:
+            return np.ones(max(hi - lo, 0), dtype=bool)
+        return np.unpackbits(bitmap, count=self.num_rows)[lo:hi].astype(bool)
+
+    def filter_values(self, name):
+        """The values a filter can select: 'all', every distinct value of its column and its aliases."""
+        values = [value for value in self.bitmaps.get(name, {}) if value is not None]
+        aliases = [alias for alias in value_aliases.get(name, {}) if alias not in values]
+        return ['all'] + values + aliases
+
+    def date_bounds(self, start_date=None, end_date=None):
+        """Row positions [lo, hi) of the date range (every row when no range is given)."""
+        if not start_date or not end_date:
+            return 0, self.num_rows
+        return DataHandling.date_range_bounds(self.df, start_date, end_date, login_date_col)
+
+    def positions(self, start_date=None, end_date=None, **filters):
+        """
+        Row positions of the users in the date range that match every filter (name=value, see filter_columns).
+
+        Returns:
+            (positions, is_range): an int64 array, and whether it is the whole contiguous date range (no filter applied)
+        """
+        lo, hi = self.date_bounds(start_date, end_date)
+        maps = [self.bitmap(name, value) for name, value in filters.items()]
+        maps = [m for m in maps if m is not None]
+        if not maps or hi <= lo:
+            return np.arange(lo, max(lo, hi)), True
+
+        # AND only the bytes covering [lo, hi), then drop the bits outside the range
+        first_byte, last_byte = lo // 8, (hi + 7) // 8
+        selected = maps[0][first_byte:last_byte]
+        for m in maps[1:]:
+            selected = selected & m[first_byte:last_byte]
+        bits = np.unpackbits(selected)[lo - first_byte * 8:hi - first_byte * 8]
+        return np.flatnonzero(bits) + lo, False
+
+    def select(self, start_date=None, end_date=None, **filters):
+        """The matching rows of the indexed frame (a slice when no filter applies, else a new frame)."""
+        positions, is_range = self.positions(start_date, end_date, **filters)
+        if is_range:
+            return self.df.iloc[positions[0]:positions[-1] + 1] if len(positions) else self.df.iloc[0:0]
+        return self.df.take(positions)
@@ -0,0 +1,130 @@
+# This file builds a per-day fact table of the Overview KPIs, as cumulative sums per platform x subscription slice.
+# The Overview KPIs are counts (or ratios of counts) over the first login date, so the totals for any
+# date range are a subtraction of two prefix sums, no matter how many days the range covers.
+
+import numpy as np
+import pandas as pd
+
+from src.python.Backend import DataHandling
+
+login_date_col = "First desktop login date"
+
+
+###//////////////////////////////////////////
+### Measures (one value per user, summed per day)
+###//////////////////////////////////////////
+
+def _flag(column):
+    """Measure: 1 for users with the bool flag column set."""
+    def measure(df):
+        return df[column].to_numpy(dtype=bool) if column in df else np.zeros(len(df), dtype=bool)
+    return measure
+
+def _users(df):
+    return np.ones(len(df), dtype=bool)
+
+def _personal_subs(df):
+    return (df["Subscription Status"] == "personal").to_numpy(dtype=bool)
+
+def _uninstalled(df):
+    return df["Uninstalled app"].to_numpy() != 0 if "Uninstalled app" in df else np.zeros(len(df), dtype=bool)
+
+def _sticky_days(df):
+    """Days a user did their morning/evening habits (counted separately), as used by the stickiness KPI."""
+    masks = DataHandling.habit_day_masks(df)
+    return DataHandling.popcount(masks[:, DataHandling.stickiness_habit_rows]).sum(axis=1)
+
+def _sticky_users(df):
+    return _sticky_days(df) > 0
+
+measures = {
+    "users": _users,
+    "personal_subs": _personal_subs,
+    "uninstalled": _uninstalled,
+    "activated": _flag("Did activate"),
+    "quit_within_7_days": _flag("Quit within 7 days"),
+    "started_morning_routine": _flag("Started morning routine"),
+    "started_evening_routine": _flag("Started evening routine"),
+    "completed_break_activity": _flag("Completed a break activity"),
+    "started_focus_mode": _flag("Started focus mode"),
+    "sticky_users": _sticky_users,
+    "sticky_days": _sticky_days,
+}
+
+
+###//////////////////////////////////////////
+### Building and querying the cube
+###//////////////////////////////////////////
+
+def _slice_codes(df, column):
+    """Category codes of a slice column, shifted by one so that 0 holds users with a missing value."""
+    values = df[column]
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    return values.cat.codes.to_numpy().astype(np.int64) + 1, list(values.cat.categories)
+
+def build_cube(df):
+    """
+    Build the cumulative per-day KPI cube for the onboarding frame.
+
+    Returns:
+        dict with 'first_day' (datetime64[D]), 'slices' ({column: [None, *categories]}),
+        'measures' (names, in cube order) and 'cumulative', an int64 array of shape
+        (platforms + 1, subscriptions + 1, days + 1, measures) whose [:, :, d] holds the totals before day d
+    """
+    dates = df[login_date_col].to_numpy().astype("datetime64[D]")
+    has_date = ~np.isnat(dates)
+    df = df[has_date] if not has_date.all() else df
+    dates = dates[has_date]
+
+    if len(dates):
+        first_day, last_day = dates.min(), dates.max()
+    else:
+        first_day = last_day = np.datetime64("today", "D")
+    num_days = int((last_day - first_day).astype(int)) + 1
+    day_index = (dates - first_day).astype(np.int64)
+
+    platform_codes, platforms = _slice_codes(df, "platform")
+    subscription_codes, subscriptions = _slice_codes(df, "Subscription Status")
+    shape = (len(platforms) + 1, len(subscriptions) + 1, num_days)
+    cell_index = np.ravel_multi_index((platform_codes, subscription_codes, day_index), shape)
+
+    cumulative = np.zeros(shape[:2] + (num_days + 1, len(measures)), dtype=np.int64)
+    for i, measure in enumerate(measures.values()):
+        daily = np.bincount(cell_index, weights=measure(df), minlength=int(np.prod(shape)))
+        cumulative[:, :, 1:, i] = np.rint(daily).astype(np.int64).reshape(shape).cumsum(axis=2)
+
+    return {
+        "first_day": first_day,
+        "slices": {"platform": [None] + platforms, "Subscription Status": [None] + subscriptions},
+        "measures": list(measures),
+        "cumulative": cumulative,
+    }
+
+def _slice_positions(cube, column, value):
+    """Positions along a slice axis for a filter value ('all' or None selects every slice)."""
+    labels = cube["slices"][column]
+    if value is None or value == 'all':
+        return slice(None)
+    return [i for i, label in enumerate(labels) if label == value]
+
+def range_totals(cube, start_date, end_date, platform='all', subscription='all'):
+    """
+    Totals of every measure for users whose first login is within start_date..end_date (inclusive).
+
+    Returns:
+        dict of {measure: int}
+    """
+    first_day = cube["first_day"]
+    cumulative = cube["cumulative"]
+    num_days = cumulative.shape[2] - 1
+    start_day = pd.Timestamp(start_date).to_datetime64().astype("datetime64[D]")
+    end_day = pd.Timestamp(end_date).to_datetime64().astype("datetime64[D]")
+    lo = int(np.clip((start_day - first_day).astype(int), 0, num_days))
+    hi = int(np.clip((end_day - first_day).astype(int) + 1, 0, num_days))
+    hi = max(lo, hi)
+
+    selected = cumulative[_slice_positions(cube, "platform", platform)]
+    selected = selected[:, _slice_positions(cube, "Subscription Status", subscription)]
+    totals = (selected[:, :, hi] - selected[:, :, lo]).sum(axis=(0, 1))
+    return dict(zip(cube["measures"], totals.tolist()))
@@ -0,0 +1,72 @@
+# This file indexes multi-select survey answers (e.g. "Hopes for using Focus Bear") as a sparse user x label matrix.
+# Each distinct answer is parsed once into its labels; the matrix is kept in CSR form (one row per user) with plain
+# NumPy arrays, so label counts for any set of users are one sparse matrix-vector product, O(selected labels).
+
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def split_labels(answer):
+    """Labels of one answer: the items of a JSON list ('["a", "b"]'), else the answer itself (missing = none)."""
+    if not isinstance(answer, str):
+        return []
+    stripped = answer.strip()
+    if stripped.startswith('[') and stripped.endswith(']'):
+        try:
+            items = json.loads(stripped)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            return list(dict.fromkeys(str(item) for item in items if str(item).strip()))
+    return [answer]
+
+def build_matrix(answers, split=split_labels):
+    """
+    Build the user x label matrix of a column of answers.
+
+    Returns:
+        dict with 'labels' (label names, in order of first appearance) and the CSR arrays 'indptr' (users + 1)
+        and 'indices' (label ids of every user, row by row)
+    """
+    answer_codes, distinct_answers = pd.factorize(answers, use_na_sentinel=True)
+
+    # Parse every distinct answer once
+    label_ids = {}
+    answer_labels = []
+    for answer in distinct_answers:
+        answer_labels.append([label_ids.setdefault(label, len(label_ids)) for label in split(answer)])
+    answer_lengths = np.array([len(ids) for ids in answer_labels] + [0], dtype=np.int64) # last entry: missing answers
+    answer_indptr = np.concatenate([[0], np.cumsum(answer_lengths)])
+    answer_indices = np.array([i for ids in answer_labels for i in ids], dtype=np.int64)
+
+    # Expand to one row per user: each row copies its answer's run of label ids
+    row_lengths = answer_lengths[answer_codes]
+    indptr = np.concatenate([[0], np.cumsum(row_lengths)])
+    starts = answer_indptr[answer_codes]
+    within_row = np.arange(indptr[-1]) - np.repeat(indptr[:-1], row_lengths)
+    indices = answer_indices[np.repeat(starts, row_lengths) + within_row]
+
+    return {"labels": list(label_ids), "indptr": indptr, "indices": indices}
+
+def label_counts(matrix, rows=None):
+    """
+    Number of selected users per label: the product of the transposed matrix with the 0/1 user vector.
+    rows are the selected row positions (None = every user).
+    """
+    indptr, indices = matrix["indptr"], matrix["indices"]
+    num_labels = len(matrix["labels"])
+    if rows is None:
+        return np.bincount(indices, minlength=num_labels)
+
+    selected = np.zeros(len(indptr) - 1, dtype=np.int64)
+    selected[rows] = 1
+    return np.bincount(indices, weights=np.repeat(selected, np.diff(indptr)), minlength=num_labels).astype(np.int64)
+
+def top_labels(matrix, rows=None, top_n=10):
+    """The top_n labels by selected users, as a DataFrame of (Label, Count) (ties keep first-appearance order)."""
+    counts = label_counts(matrix, rows)
+    order = np.argsort(-counts, kind="stable")[:top_n]
+    order = order[counts[order] > 0]
+    return pd.DataFrame({"Label": [matrix["labels"][i] for i in order], "Count": counts[order]})
@@ -0,0 +1,184 @@
+# This file memoizes backend computations across callbacks.
+# Users flip between the same few date ranges and filters, so results are kept per
+# (function, normalized inputs, dataset version) in a size-capped LRU cache.
+# A new dataset version (see DataHandling.reload_dataset) empties the cache.
+
+import functools
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from plotly.basedatatypes import BaseFigure
+
+# Defaults per memoized function
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Every cache created by memoize(), for cache_stats()
+_caches = []
+
+
+def normalize_arg(value):
+    """Cache key form of an argument: date strings/objects become 'YYYY-MM-DD', empty values become None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value[:10] if _date_pattern.match(value) else value
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, list):
+        return tuple(normalize_arg(v) for v in value)
+    return value
+
+
+def _figure_parts(figure):
+    """The trace and layout dicts a plotly figure keeps its properties in (to_plotly_json() would copy them)."""
+    return [figure._data, figure._layout]
+
+# Type -> function(value) returning (own bytes, contained values to size as well)
+size_estimators = {
+    np.ndarray: lambda array: (array.nbytes, []),
+    pd.DataFrame: lambda frame: (int(frame.memory_usage(index=True, deep=True).sum()), []),
+    pd.Series: lambda series: (int(series.memory_usage(index=True, deep=True)), []),
+    BaseFigure: lambda figure: (sys.getsizeof(figure), _figure_parts(figure)),
+    dict: lambda d: (sys.getsizeof(d), [*d.keys(), *d.values()]),
+    list: lambda items: (sys.getsizeof(items), items),
+    tuple: lambda items: (sys.getsizeof(items), items),
+    set: lambda items: (sys.getsizeof(items), items),
+    frozenset: lambda items: (sys.getsizeof(items), items),
+}
+
+
+def estimate_size(value):
+    """
+    Approximate memory footprint of a result, from its structure: array and frame buffers, figure and container
+    contents, and sys.getsizeof for anything else. An object reached more than once is counted once.
+    """
+    total = 0
+    seen = set()
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        estimator = size_estimators.get(type(item))
+        if estimator is None and not isinstance(item, (str, bytes, int, float)):
+            # Subclasses, e.g. go.Figure of BaseFigure
+            estimator = next((estimator for kind, estimator in size_estimators.items() if isinstance(item, kind)), None)
+        if estimator is None:
+            total += sys.getsizeof(item)
+            continue
+        size, contents = estimator(item)
+        total += size
+        pending.extend(contents)
+    return total
+
+
+class ResultCache:
+    """LRU cache of one function's results, capped by entry count and by (estimated) bytes."""
+
+    def __init__(self, name, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        """
+        Move the cache to a newer dataset version, dropping the older results.
+        Returns False for callers still on an older version; they bypass the cache.
+        """
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.version = version
+        return True
+
+    def get(self, version, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key) if self._check_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, version, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if not self._check_version(version) or size > self.max_bytes:
+                return
+            if key in self._entries:
+                self.size_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size_bytes += size
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        return {
+            "name": self.name, "version": self.version, "entries": len(self._entries),
+            "bytes": self.size_bytes, "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+
+def memoize(max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Cache the results of a backend computation whose first argument is the dataset it reads from.
+    The key is the function, its other arguments (normalized with normalize_arg) and the dataset version.
+    Cached results are shared between callers, so they must not be modified after they are returned.
+    """
+    def decorator(func):
+        cache = ResultCache(func.__qualname__, max_entries, max_bytes)
+        _caches.append(cache)
+
+        @functools.wraps(func)
+        def wrapper(dataset, *args, **kwargs):
+            version = dataset.version
+            key = (
+                tuple(normalize_arg(arg) for arg in args),
+                tuple(sorted((name, normalize_arg(arg)) for name, arg in kwargs.items())),
+            )
+            hit, value = cache.get(version, key)
+            if hit:
+                return value
+            value = func(dataset, *args, **kwargs)
+            cache.put(version, key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """Hit/miss counters and sizes of every memoized function."""
+    return [cache.stats() for cache in _caches]
+
+
+def clear_all():
+    for cache in _caches:
+        cache.clear()
@@ -0,0 +1,126 @@
+# This file builds the weekly signup-cohort retention cube behind the cohort triangle on the Retention Breakdown tab.
+# For every platform x subscription slice and signup week it holds, per day since signup, how many users were
+# active (did any habit) and how many users had reached that day by their row's last update.
+# Filters only pick slices of the cube, so switching them never re-filters the onboarding frame.
+
+import numpy as np
+import pandas as pd
+
+from src.python.Backend import DataHandling, FilterIndex
+
+login_date_col = "First desktop login date"
+report_date_col = "Last updated date"
+
+# Slice column -> filter name (for the filter value aliases, e.g. the 'unknown' platform)
+filter_names = {column: name for name, column in FilterIndex.filter_columns.items()}
+
+
+###//////////////////////////////////////////
+### Building the cube
+###//////////////////////////////////////////
+
+def _slice_codes(df, column):
+    """Category codes of a slice column, shifted by one so that 0 holds users with a missing value."""
+    values = df[column]
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    return values.cat.codes.to_numpy().astype(np.int64) + 1, list(values.cat.categories)
+
+def build_cube(df, days=None):
+    """
+    Build the weekly cohort retention cube for the onboarding frame.
+
+    Returns:
+        dict with 'first_week' (datetime64[D], a Monday), 'as_of' (the report date), 'days' (default: every packed day),
+        'slices' ({column: [None, *categories]}), and int64 arrays of shape (platforms + 1, subscriptions + 1, weeks, ...):
+        'users' (no extra axis), 'active' and 'observed' (one value per day since signup, observed up to each
+        user's own 'Last updated date', or the report date when it is missing)
+    """
+    days = DataHandling.habit_day_horizon(days)
+    dates = df[login_date_col].to_numpy().astype("datetime64[D]")
+    has_date = ~np.isnat(dates)
+    df = df[has_date] if not has_date.all() else df
+    dates = dates[has_date]
+
+    # Report date: the last day the report has data for (a cohort's later days are not observed yet)
+    as_of = df[report_date_col].max() if report_date_col in df else pd.NaT
+    if pd.isna(as_of):
+        as_of = dates.max() if len(dates) else np.datetime64("today", "D")
+    as_of = np.datetime64(as_of, "D")
+
+    # Each user is observed up to their own row's last update: most rows stop updating before the report
+    # date, and their later days hold no data rather than inactivity. Rows without an update date use the report date.
+    if report_date_col in df:
+        user_as_of = df[report_date_col].to_numpy().astype("datetime64[D]")
+        user_as_of = np.where(np.isnat(user_as_of), as_of, user_as_of)
+    else:
+        user_as_of = np.full(len(dates), as_of)
+
+    # Weeks start on Monday (1970-01-01 was a Thursday)
+    week_starts = dates - ((dates.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    first_week = week_starts.min() if len(dates) else as_of
+    num_weeks = int((week_starts.max() - first_week).astype(int)) // 7 + 1 if len(dates) else 0
+    week_index = (week_starts - first_week).astype(np.int64) // 7
+
+    platform_codes, platforms = _slice_codes(df, "platform")
+    subscription_codes, subscriptions = _slice_codes(df, "Subscription Status")
+    shape = (len(platforms) + 1, len(subscriptions) + 1, num_weeks)
+    cell_index = np.ravel_multi_index((platform_codes, subscription_codes, week_index), shape)
+
+    # Day d since signup (0-based) counts as observed once the user's last update has reached it
+    observed_days = np.clip((user_as_of - dates).astype(np.int64) + 1, 0, days)
+    observed = np.arange(days) < observed_days[:, None]
+    any_habit = np.bitwise_or.reduce(DataHandling.habit_day_masks(df), axis=1)
+    active = DataHandling.habit_day_bits(any_habit[:, None], days)[:, 0, :] & observed
+
+    num_cells = int(np.prod(shape))
+    users = np.bincount(cell_index, minlength=num_cells)
+    active_counts = np.zeros((num_cells, days), dtype=np.int64)
+    observed_counts = np.zeros((num_cells, days), dtype=np.int64)
+    np.add.at(active_counts, cell_index, active)
+    np.add.at(observed_counts, cell_index, observed)
+
+    return {
+        "first_week": first_week,
+        "as_of": as_of,
+        "days": days,
+        "slices": {"platform": [None] + platforms, "Subscription Status": [None] + subscriptions},
+        "users": users.reshape(shape),
+        "active": active_counts.reshape(shape + (days,)),
+        "observed": observed_counts.reshape(shape + (days,)),
+    }
+
+
+###//////////////////////////////////////////
+### Querying the cube
+###//////////////////////////////////////////
+
+def _slice_positions(cube, column, value):
+    """Positions along a slice axis for a filter value ('all' or None selects every slice)."""
+    labels = cube["slices"][column]
+    if value is None or value == 'all':
+        return slice(None)
+    matches = FilterIndex.value_aliases.get(filter_names[column], {}).get(value, (value,))
+    return [i for i, label in enumerate(labels) if label in matches]
+
+def cohort_rates(cube, platform='all', subscription='all'):
+    """
+    Retention triangle for the selected slices: percentage of each signup week's users active on each day since signup.
+
+    Returns:
+        (week_starts, rates, cohort_sizes) for the weeks with at least one user, where rates is a
+        (weeks x days) float ndarray rounded to 2 dp, NaN for days no user of the cohort has reached yet
+    """
+    def select(values):
+        values = values[_slice_positions(cube, "platform", platform)]
+        return values[:, _slice_positions(cube, "Subscription Status", subscription)].sum(axis=(0, 1))
+
+    users = select(cube["users"])
+    active = select(cube["active"])
+    observed = select(cube["observed"])
+
+    weeks = np.flatnonzero(users)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.where(observed > 0, active / np.where(observed > 0, observed, 1) * 100, np.nan)
+    week_starts = cube["first_week"] + (weeks * 7).astype("timedelta64[D]")
+    return week_starts, np.round(rates[weeks], 2), users[weeks]
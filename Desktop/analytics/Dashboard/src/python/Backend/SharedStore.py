@@ -0,0 +1,264 @@
+# This file shares one loaded dataset between the web worker processes started by serve.py.
+# A loader process writes the dataset's frames column by column as .npy files into a versioned directory,
+# then points data/.shared/current.json at it. Workers memory-map those files read-only, so every worker
+# reads the same pages of the OS page cache instead of holding its own copy of the frames.
+# Numeric, bool and datetime columns are mapped as they are; categorical and text columns are stored as
+# integer codes (mapped) plus their distinct values (loaded by each worker). The derived structures the
+# callbacks query (KPI and retention cubes, filter bitmaps, hopes matrix, usage flags) are shared the same way:
+# their arrays are mapped, only their small skeleton (labels, dates, shapes) is loaded by each worker.
+
+import json
+import os
+import pickle
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.python.Backend import DataHandling
+
+# The store lives next to the data files, outside of the PyInstaller bundle
+STORE_DIR = os.path.join(os.path.abspath("."), "data", ".shared")
+POINTER_FILE = "current.json"
+
+# Dataset values written to the store: frames, or dicts of frames (names of Dataset properties)
+stored_values = ("df", "df_impact_raw", "df_feedback_ratings", "efficacy_frames")
+
+# Derived structures written to the store (nested dicts/lists of arrays), and how to take them from a Dataset
+stored_structures = {
+    "kpi_cube": lambda dataset: dataset.kpi_cube,
+    "retention_cube": lambda dataset: dataset.retention_cube,
+    "filter_index": lambda dataset: dataset.filter_index.bitmaps,
+    "hopes_matrix": lambda dataset: dataset.hopes_matrix,
+    "usage_flags": lambda dataset: dataset.usage_flags,
+}
+
+# Older versions kept on disk besides the current one, for workers that are still switching over
+keep_versions = 1
+
+
+###//////////////////////////////////////////
+### Writing (loader process)
+###//////////////////////////////////////////
+
+def _version_dir(directory, version):
+    return os.path.join(directory, f"v{version}")
+
+def _write_frame(frame, directory, prefix):
+    """Write the columns of a frame (with a default RangeIndex) as .npy files. Returns the frame's manifest entry."""
+    meta = {"columns": [], "kinds": [], "rows": len(frame)}
+    for i, col in enumerate(frame.columns):
+        series = frame[col]
+        column_path = os.path.join(directory, f"{prefix}.c{i}.npy")
+        values_path = os.path.join(directory, f"{prefix}.k{i}.npy")
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kind = "category"
+            np.save(column_path, series.cat.codes.to_numpy())
+            np.save(values_path, series.cat.categories.to_numpy(dtype=object), allow_pickle=True)
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+            kind = "array"
+            np.save(column_path, series.to_numpy())
+        else:
+            kind = "object"
+            codes, uniques = pd.factorize(series.to_numpy(dtype=object), use_na_sentinel=True)
+            np.save(column_path, codes.astype(np.int32))
+            np.save(values_path, np.asarray(uniques, dtype=object), allow_pickle=True)
+        meta["columns"].append(col)
+        meta["kinds"].append(kind)
+    return meta
+
+class _ArrayFile:
+    """Placeholder for an array of a stored structure; the array itself is saved as its own .npy file."""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+
+def _write_structure(value, directory, prefix):
+    """Write the arrays of a structure as .npy files and its skeleton (with placeholders) as a pickle. Returns the manifest entry."""
+    arrays = []
+
+    def strip(item):
+        if isinstance(item, np.ndarray) and item.dtype != object:
+            file_name = f"{prefix}.a{len(arrays)}.npy"
+            np.save(os.path.join(directory, file_name), item)
+            arrays.append(file_name)
+            return _ArrayFile(file_name)
+        if isinstance(item, dict):
+            return {key: strip(entry) for key, entry in item.items()}
+        if isinstance(item, (list, tuple)):
+            return type(item)(strip(entry) for entry in item)
+        return item
+
+    skeleton = strip(value)
+    with open(os.path.join(directory, f"{prefix}.pkl"), "wb") as f:
+        pickle.dump(skeleton, f)
+    return {"structure": f"{prefix}.pkl", "arrays": len(arrays)}
+
+def read_pointer(directory=None):
+    """The current store version ({'version', 'path'}), or None before the loader published one."""
+    try:
+        with open(os.path.join(directory or STORE_DIR, POINTER_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def publish(dataset, directory=None):
+    """
+    Write the stored values of a dataset as a new store version and make it the current one.
+    The version directory is complete before the pointer file is (atomically) replaced, so workers
+    never see a half-written store.
+    """
+    directory = directory or STORE_DIR
+    version_dir = _version_dir(directory, dataset.version)
+    tmp_dir = version_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    manifest = {"version": dataset.version, "source_stamp": dataset.source_stamp, "values": {}}
+    for name in stored_values:
+        value = getattr(dataset, name)
+        if isinstance(value, dict):
+            manifest["values"][name] = {"frames": {
+                key: _write_frame(frame, tmp_dir, f"{name}.{key}") for key, frame in value.items()
+            }}
+        else:
+            manifest["values"][name] = {"frame": _write_frame(value, tmp_dir, name)}
+    for name, get_value in stored_structures.items():
+        manifest["values"][name] = _write_structure(get_value(dataset), tmp_dir, name)
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.replace(tmp_dir, version_dir)
+    pointer_path = os.path.join(directory, POINTER_FILE)
+    with open(pointer_path + ".tmp", "w") as f:
+        json.dump({"version": dataset.version, "path": os.path.basename(version_dir)}, f)
+    os.replace(pointer_path + ".tmp", pointer_path)
+    print(f"INFO: Published dataset version {dataset.version} to {version_dir}.")
+    _remove_old_versions(directory, dataset.version)
+    return version_dir
+
+def _remove_old_versions(directory, current_version):
+    """Delete the store versions older than the last keep_versions (files that can't be removed yet are retried next time)."""
+    for entry in os.listdir(directory):
+        if not entry.startswith("v"):
+            continue
+        try:
+            version = int(entry[1:].split(".")[0])
+        except ValueError:
+            continue
+        if version < current_version - keep_versions:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+def run_loader(directory=None, interval=5.0, stop_event=None):
+    """
+    Body of the loader process: publish the dataset, then publish a new version whenever the data files change
+    (see DataHandling.watch_data_files), until stop_event is set.
+    """
+    directory = directory or STORE_DIR
+    os.makedirs(directory, exist_ok=True)
+    # Continue the version numbers of an earlier run, so workers never mistake a stale version for the new one
+    pointer = read_pointer(directory)
+    if pointer is not None:
+        DataHandling.get_dataset().version = pointer["version"] + 1
+    # No local reference to the dataset: the watcher only reloads once the retired version is released
+    publish(DataHandling.get_dataset(), directory)
+    DataHandling.watch_data_files(interval, stop_event, on_reload=lambda dataset: publish(dataset, directory))
+
+
+###//////////////////////////////////////////
+### Reading (web workers)
+###//////////////////////////////////////////
+
+class SharedStore:
+    """One published store version, opened read-only. Frames are memory-mapped when first read."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest["version"]
+        self.source_stamp = tuple(tuple(entry) for entry in self.manifest["source_stamp"])
+
+    def __contains__(self, name):
+        return name in self.manifest["values"]
+
+    def _read_frame(self, prefix, meta):
+        columns = {}
+        for i, (col, kind) in enumerate(zip(meta["columns"], meta["kinds"])):
+            values = np.load(os.path.join(self.path, f"{prefix}.c{i}.npy"), mmap_mode="r")
+            if kind == "category":
+                categories = np.load(os.path.join(self.path, f"{prefix}.k{i}.npy"), allow_pickle=True)
+                values = pd.Categorical.from_codes(values, categories=categories)
+            elif kind == "object":
+                # Text is materialized per worker: Python strings can't live in a shared mapping
+                uniques = np.load(os.path.join(self.path, f"{prefix}.k{i}.npy"), allow_pickle=True)
+                lookup = np.append(uniques, np.nan).astype(object) # code -1 (missing) picks the last entry
+                values = lookup.take(values)
+            columns[col] = values
+        # copy=False keeps one block per column, so the mapped arrays are used without copying
+        return pd.DataFrame(columns, columns=meta["columns"], index=pd.RangeIndex(meta["rows"]), copy=False)
+
+    def _read_structure(self, file_name):
+        with open(os.path.join(self.path, file_name), "rb") as f:
+            skeleton = pickle.load(f)
+
+        def restore(item):
+            if isinstance(item, _ArrayFile):
+                return np.load(os.path.join(self.path, item.file_name), mmap_mode="r")
+            if isinstance(item, dict):
+                return {key: restore(entry) for key, entry in item.items()}
+            if isinstance(item, (list, tuple)):
+                return type(item)(restore(entry) for entry in item)
+            return item
+
+        return restore(skeleton)
+
+    def value(self, name):
+        """
+        The stored value of a Dataset property: a DataFrame, a dict of DataFrames, or a derived structure
+        (see stored_structures) whose arrays are memory-mapped read-only.
+        """
+        entry = self.manifest["values"][name]
+        if "structure" in entry:
+            return self._read_structure(entry["structure"])
+        if "frames" in entry:
+            return {key: self._read_frame(f"{name}.{key}", meta) for key, meta in entry["frames"].items()}
+        return self._read_frame(name, entry["frame"])
+
+def open_current(directory=None):
+    """The current store version, or None if the loader hasn't published one yet."""
+    directory = directory or STORE_DIR
+    pointer = read_pointer(directory)
+    if pointer is None:
+        return None
+    return SharedStore(os.path.join(directory, pointer["path"]))
+
+def follow_store(directory=None, interval=5.0, stop_event=None):
+    """Poll the pointer file and switch the worker to every newly published version."""
+    directory = directory or STORE_DIR
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(interval):
+        pointer = read_pointer(directory)
+        if pointer is None or pointer["version"] == DataHandling.get_dataset().version:
+            continue
+        try:
+            DataHandling.reload_dataset(store=SharedStore(os.path.join(directory, pointer["path"])))
+        except OSError as e:
+            # The version was replaced again while we were opening it; the next poll picks up the newest one
+            print(f"WARN: Could not open shared dataset version {pointer['version']} ({e}).")
+
+def attach(directory=None, interval=5.0):
+    """
+    Serve this worker's callbacks from the current store version and follow later versions in a daemon thread.
+    Returns the attached Dataset, or None when no version has been published yet.
+    """
+    store = open_current(directory)
+    if store is None:
+        print(f"ERROR: No shared dataset found in {directory or STORE_DIR}. Is the loader process running?")
+        return None
+    dataset = DataHandling.reload_dataset(store=store)
+    follower = threading.Thread(name="Shared Store Follower", target=follow_store, args=(directory, interval), daemon=True)
+    follower.start()
+    return dataset
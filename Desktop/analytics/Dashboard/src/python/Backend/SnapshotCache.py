@@ -0,0 +1,150 @@
+# This file keeps a local columnar copy of the frames DataHandling builds from the Excel reports.
+# Parsing the xlsx files with openpyxl is the slowest part of starting the dashboard, so the
+# parsed frames are written once and reloaded on later starts until a source file changes.
+
+import hashlib
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Snapshots live next to the data files, outside of the PyInstaller bundle
+SNAPSHOT_DIR = os.path.join(os.path.abspath("."), "data", ".snapshots")
+
+# Bump this whenever the shape or typing of the snapshotted frames changes
+SNAPSHOT_FORMAT_VERSION = 5
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def source_digest(paths):
+    """Hash the contents of the source files (plus the snapshot format version)."""
+    digest = hashlib.sha256(f"v{SNAPSHOT_FORMAT_VERSION}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _snapshot_path(name, key, frame_name, ext):
+    return os.path.join(SNAPSHOT_DIR, f"{name}-{key}-{frame_name}.{ext}")
+
+
+###//////////////////////////////////////////
+### Writers / readers
+###//////////////////////////////////////////
+
+def _write_npz(frame, path):
+    """Write a DataFrame column by column into an uncompressed .npz archive."""
+    arrays = {}
+    meta = {"columns": [], "kinds": []}
+    for i, col in enumerate(frame.columns):
+        series = frame[col]
+        meta["columns"].append(col)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            meta["kinds"].append("category")
+            arrays[f"c{i}"] = series.cat.codes.to_numpy()
+            arrays[f"k{i}"] = series.cat.categories.to_numpy(dtype=object)
+        else:
+            meta["kinds"].append("array")
+            arrays[f"c{i}"] = series.to_numpy()
+    arrays["__meta__"] = np.array(json.dumps(meta))
+    np.savez(path, **arrays)
+
+
+def _read_npz(path):
+    with np.load(path, allow_pickle=True) as data:
+        meta = json.loads(str(data["__meta__"]))
+        columns = {}
+        for i, (col, kind) in enumerate(zip(meta["columns"], meta["kinds"])):
+            if kind == "category":
+                columns[col] = pd.Categorical.from_codes(data[f"c{i}"], categories=data[f"k{i}"])
+            else:
+                columns[col] = data[f"c{i}"]
+    return pd.DataFrame(columns, columns=meta["columns"])
+
+
+def _write_frame(frame, name, key, frame_name):
+    """Write one frame, preferring Parquet and falling back to .npz. Returns the path written."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    if HAS_PYARROW:
+        path = _snapshot_path(name, key, frame_name, "parquet")
+        try:
+            frame.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+            return path
+        except Exception as e:
+            # Mixed-type object columns can't always be stored as Parquet
+            print(f"WARN: Parquet snapshot failed for {frame_name} ({e}). Using .npz instead.")
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+
+    path = _snapshot_path(name, key, frame_name, "npz")
+    with open(path + ".tmp", "wb") as f:
+        _write_npz(frame, f)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def _read_frame(name, key, frame_name):
+    """Read one frame from whichever snapshot file exists, or return None."""
+    parquet_path = _snapshot_path(name, key, frame_name, "parquet")
+    if HAS_PYARROW and os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+    npz_path = _snapshot_path(name, key, frame_name, "npz")
+    if os.path.exists(npz_path):
+        return _read_npz(npz_path)
+    return None
+
+
+def _remove_stale_snapshots(name, key):
+    """Delete snapshots of the same name that were built from older source files."""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    for file_name in os.listdir(SNAPSHOT_DIR):
+        if file_name.startswith(f"{name}-") and not file_name.startswith(f"{name}-{key}-"):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, file_name))
+            except OSError:
+                pass
+
+
+###//////////////////////////////////////////
+### Public entry point
+###//////////////////////////////////////////
+
+def cached_frames(name, source_paths, builder, frame_names):
+    """
+    Return the frames produced by builder(), using a snapshot when one exists for the
+    current contents of source_paths.
+
+    Args:
+        name: Prefix for the snapshot files
+        source_paths: Files the frames are built from; any change to them invalidates the snapshot
+        builder: Callable returning a dict of {frame_name: DataFrame}
+        frame_names: Names of the frames builder() returns
+
+    Returns:
+        dict of {frame_name: DataFrame}
+    """
+    key = source_digest(source_paths)
+
+    try:
+        frames = {frame_name: _read_frame(name, key, frame_name) for frame_name in frame_names}
+        if all(frame is not None for frame in frames.values()):
+            return frames
+    except Exception as e:
+        print(f"WARN: Could not read snapshot '{name}' ({e}). Rebuilding from source files.")
+
+    frames = builder()
+    try:
+        for frame_name in frame_names:
+            _write_frame(frames[frame_name], name, key, frame_name)
+        _remove_stale_snapshots(name, key)
+    except Exception as e:
+        print(f"WARN: Could not write snapshot '{name}' ({e}).")
+    return frames
@@ -1,451 +1,66 @@
 # Import necessary libraries
 import dash
-from dash import html, Input, Output, State, MATCH, no_update
+from dash import html, Input, Output, State, MATCH, ClientsideFunction, Patch, no_update
 import pandas as pd
+import numpy as np
 from datetime import date, timedelta
-import math
 
 # Import data from DataHandling and Colours from VisualVariables
-from src.python.Backend.DataHandling import df
+from src.python.Backend import DataHandling, KpiCube, ResultCache
 from src.python.Backend.VisualVariables import FOCUS_BEAR_YELLOW, FOCUS_BEAR_BLACK
 
 def OverviewCallbacks(app):
 
-    # === SINGLE CALLBACK for ALL Auto-Updating Date Pickers ===
-    @app.callback(
-        # Output uses MATCH to target the specific component that triggered
+    # === SINGLE CLIENT-SIDE CALLBACK for ALL Auto-Updating Date Pickers ===
+    # Runs in the browser (assets/date_ranges.js): a new start date moves the end date to two weeks later,
+    # capped by max_date_allowed, and the final (start, end) pair is written to the picker's store in one update.
+    app.clientside_callback(
+        ClientsideFunction(namespace='dates', function_name='sync_date_range'),
         Output({'type': 'auto-update-daterange', 'index': MATCH}, 'end_date'),
-        # Input uses MATCH to listen to any component matching the pattern
+        Output({'type': 'date-range-store', 'index': MATCH}, 'data'),
         Input({'type': 'auto-update-daterange', 'index': MATCH}, 'start_date'),
-        # State uses MATCH to get the state from the specific component that triggered
+        Input({'type': 'auto-update-daterange', 'index': MATCH}, 'end_date'),
         State({'type': 'auto-update-daterange', 'index': MATCH}, 'max_date_allowed'),
+        State({'type': 'date-range-store', 'index': MATCH}, 'data'),
         prevent_initial_call=True
     )
-    def update_matching_end_date(start_date_str, max_allowed_str):
-        """
-        Updates the end date of ANY date picker range with an ID matching
-        {'type': 'auto-update-daterange', 'index': ...}
-        to be 2 weeks after the selected start date, capped by max_date_allowed.
-        """
-        if not start_date_str:
-            return no_update
-
-        try:
-            start_date_obj = date.fromisoformat(start_date_str)
-            potential_end_date = start_date_obj + timedelta(weeks=2)
-
-            if max_allowed_str:
-                try:
-                    max_allowed_obj = date.fromisoformat(max_allowed_str)
-                    final_end_date = min(potential_end_date, max_allowed_obj)
-                except (ValueError, TypeError):
-                     print(f"Warning: Invalid max_date_allowed format: {max_allowed_str}")
-                     final_end_date = potential_end_date # Use potential if max is invalid
-            else:
-                # Handle case where max_date_allowed might not be set on some pickers
-                final_end_date = potential_end_date
-
-            return final_end_date.isoformat()
-
-        except (ValueError, TypeError) as e:
-            print(f"Error updating end date via MATCH callback: {e}")
-            return no_update
 
     ###/////////////////
-    ### Top Row of Boxes: New User Counts
-    ### New Signups, New Personal Subs, Active Teams, Uninstalled
+    ### All eleven Overview boxes, driven by OVERVIEW_KPIS (see below)
     ###/////////////////
 
-
-    @app.callback(
-        Output('New-Signups-output', 'children'),
-        Output('Signups-outputBox', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def calculate_new_signups(start_date, end_date):
-        # Calculate new signups based on the date range selected in the overview picker
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update # Return valid component + no_update for style
-
-        FirstLoginDatesInRange = filter_df_by_Date_range(start_date, end_date, df)
-        LastCo_hortDates = previousCohort(start_date, end_date, df)
-
-        number_of_dates = FirstLoginDatesInRange["First desktop login date"].count() if FirstLoginDatesInRange is not None else 0
-        number_of_dates_lastCohort = LastCo_hortDates["First desktop login date"].count() if LastCo_hortDates is not None else 0
-
-        return ([
-            html.H5("New Signups"),
-            html.H2(f"{number_of_dates}"),
-            html.Div(f"previous: {number_of_dates_lastCohort}",
-                    style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-        ], colourSelector(number_of_dates, number_of_dates_lastCohort))
-
-
-
     @app.callback(
-        Output('New-Personal-Subs', 'children'),
-        Output('New-Personal-Subs-box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
+        [output
+         for kpi in OVERVIEW_KPIS
+         for output in (Output(kpi['children_id'], 'children'), Output(kpi['style_id'], 'style'))]
+        + [Output({'type': 'rendered-shape-store', 'index': 'overview'}, 'data')],
+        Input({'type': 'date-range-store', 'index': 'overview'}, 'data'),
+        State({'type': 'rendered-shape-store', 'index': 'overview'}, 'data')
     )
-    def calculate_new_personal_subs(start_date, end_date):
-        # Calculate new personal subscriptions based on the date range selected in the overview picker
+    def update_overview_kpis(date_range, rendered_shape=None):
+        start_date, end_date = DataHandling.unpack_date_range(date_range)
+        # Compute every KPI for both cohorts at once, then fan the values out to every box
         if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        FirstLoginDatesInRange = filter_df_by_Date_range(start_date, end_date, df)
-        LastCo_hortDates = previousCohort(start_date, end_date, df)
-
-        new_personal_subs = pd.DataFrame()
-        if FirstLoginDatesInRange is not None:
-            new_personal_subs = FirstLoginDatesInRange[FirstLoginDatesInRange['Subscription Status'] == "personal"]
-
-        last_personal_subs = pd.DataFrame()
-        if LastCo_hortDates is not None:
-            last_personal_subs = LastCo_hortDates[LastCo_hortDates['Subscription Status'] == "personal"]
-
-        new_personal_subs_count = new_personal_subs['Subscription Status'].count()
-        last_personal_subs_count = last_personal_subs['Subscription Status'].count()
-
-        return ([
-            html.H5("New Personal Subs"),
-            html.H2(f"{new_personal_subs_count}"),
-            html.Div(f"previous: {last_personal_subs_count}",
-                    style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-        ], colourSelector(new_personal_subs_count, last_personal_subs_count))
-
-
-
-    @app.callback(Output('newteams', 'children'),
-        Output('newteams_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def newTeams(start_date, end_date):
-        # Individual teams that have a new member in the date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            newteam_count = 0
-            if filteredDF is not None and not filteredDF.empty and "Team ID" in filteredDF:
-                if filteredDF["Team ID"].unique().all() == [math.nan]:
-                    newteam_count = 0
-                else:
-                    newteam_count = len(filteredDF["Team ID"].unique())
-            
-            newteam_count_last = 0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Team ID" in LastCo_DF:
-                if LastCo_DF["Team ID"].unique().all() == [math.nan]:
-                    newteam_count_last = 0
-                else:
-                    newteam_count_last = len(LastCo_DF["Team ID"].unique())
-            
-            return([
-                html.H5("Active Teams"),
-                html.H2(f"{newteam_count}"),
-                html.Div(f"previous: {newteam_count_last}",
-                        style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(newteam_count, newteam_count_last)) 
-
-        except (ValueError, TypeError) as e:
-             print(f"Error in newteams callback: {e}")
-             return html.Div("Error"), dash.no_update
-
-
-
-    @app.callback(
-        Output('Uninstalled', 'children'),
-        Output('Uninstalled-box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def calculate_uninstalled(start_date, end_date):
-        # Calculate uninstalled apps based on the date range selected in the overview picker
-        if not start_date or not end_date:
-             return html.Div("Select dates"), dash.no_update
-
-        filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-        LastCo_hort = previousCohort(start_date, end_date, df)
-
-        uninstalled = (len(filteredDF[filteredDF["Uninstalled app"] != 0])) if filteredDF is not None and "Uninstalled app" in filteredDF else 0
-        uninstalled_last = (len(LastCo_hort[LastCo_hort["Uninstalled app"] != 0])) if LastCo_hort is not None and "Uninstalled app" in LastCo_hort else 0
-
-        return([
-            html.H5("Uninstalled"),
-            html.H2(f"{uninstalled}"),
-            html.Div(f"previous: {uninstalled_last}",
-                    style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            # Invert comparison for uninstalled? Lower is better.
-        ], colourSelector(uninstalled_last, uninstalled)) # Inverted for "lower is better"
-
-
-
-    ###////////////////////
-    ### Second Row of Boxes: User Habits (at least 1 completion)
-    ### Did morning habit, evening habit, break activity, focus session
-    ###////////////////////
-
-    @app.callback(
-        Output('did-morning-habit', 'children'),
-        Output('did-morning-habit_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def did_morning_habit(start_date, end_date):
-        # Calculates the percentage of users who completed at least 1 morning habit in date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            morningHabitPercent = 0.0
-            if filteredDF is not None and not filteredDF.empty and "Started morning routine" in filteredDF:
-                didMorningHabit_count = filteredDF[filteredDF["Started morning routine"] == True].shape[0]
-                morningHabitPercent = (didMorningHabit_count / len(filteredDF)) * 100
-
-            morningHabitPercent_last = 0.0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Started morning routine" in LastCo_DF:
-                didMorningHabit_last_count = LastCo_DF[LastCo_DF["Started morning routine"] == True].shape[0]
-                morningHabitPercent_last = (didMorningHabit_last_count / len(LastCo_DF)) * 100
-
-            return ([
-                html.H5("Did Morning Habit"),
-                html.H2(f"{round(morningHabitPercent, 2)}%"),
-                html.Div(f"previous: {round(morningHabitPercent_last, 2)}%",
-                        style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(morningHabitPercent, morningHabitPercent_last))
-
-        except (ValueError, TypeError) as e:
-             print(f"Error in did_morning_habit: {e}")
-             return html.Div("Error"), dash.no_update
-
-
-
-    @app.callback(
-        Output('did-evening-habit', 'children'),
-        Output('did-evening-habit_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def did_evening_habit(start_date, end_date):
-        # Calculates the percentage of users who completed at least 1 evening habit in date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-        try:
-
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            eveningHabitPercent = 0.0
-            if filteredDF is not None and not filteredDF.empty and "Started evening routine" in filteredDF:
-                 eveningHabitPercent = (filteredDF[filteredDF["Started evening routine"] == True].shape[0] / len(filteredDF)) * 100
-
-            eveningHabitPercent_last = 0.0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Started evening routine" in LastCo_DF:
-                 eveningHabitPercent_last = (LastCo_DF[LastCo_DF["Started evening routine"] == True].shape[0] / len(LastCo_DF)) * 100
-
-            return ([
-                html.H5("Did Evening Habit"),
-                html.H2(f"{round(eveningHabitPercent, 2)}%"),
-                html.Div(f"previous: {round(eveningHabitPercent_last, 2)}%", style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(eveningHabitPercent, eveningHabitPercent_last))
-        
-        except (ValueError, TypeError) as e: 
-            print(f"Error in did_evening_habit: {e}"); 
-            return html.Div("Error"), dash.no_update
-
-
-
-    @app.callback(
-        Output('did-break-habit', 'children'),
-        Output('did-break-habit_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def did_break_habit(start_date, end_date):
-        # Calculates the percentage of users who completed at least 1 break habit in date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-        
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            breakHabitPercent = 0.0
-            if filteredDF is not None and not filteredDF.empty and "Completed a break activity" in filteredDF:
-                 breakHabitPercent = (filteredDF[filteredDF["Completed a break activity"] == True].shape[0] / len(filteredDF)) * 100
-
-            breakHabitPercent_last = 0.0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Completed a break activity" in LastCo_DF:
-                 breakHabitPercent_last = (LastCo_DF[LastCo_DF["Completed a break activity"] == True].shape[0] / len(LastCo_DF)) * 100
-
-            return([
-                html.H5("Did Break Habit"),
-                html.H2(f"{round(breakHabitPercent, 2)}%"),
-                html.Div(f"previous: {round(breakHabitPercent_last, 2)}%", style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(breakHabitPercent, breakHabitPercent_last))
-        
-        except (ValueError, TypeError) as e: 
-            print(f"Error in did_break_habit: {e}"); 
-            return html.Div("Error"), dash.no_update
-
-
-
-    @app.callback(
-        Output('did-focus-session', 'children'),
-        Output('did-focus-session_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def did_focus_Session(start_date, end_date):
-        # Calculates the percentage of users who completed at least 1 focus session in date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            focusModePercent = 0.0
-            if filteredDF is not None and not filteredDF.empty and "Started focus mode" in filteredDF:
-                 focusModePercent = (filteredDF[filteredDF["Started focus mode"] == True].shape[0] / len(filteredDF)) * 100
-
-            focusModePercent_last = 0.0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Started focus mode" in LastCo_DF:
-                 focusModePercent_last = (LastCo_DF[LastCo_DF["Started focus mode"] == True].shape[0] / len(LastCo_DF)) * 100
-
-            return([
-                html.H5("Did Focus Session"),
-                html.H2(f"{round(focusModePercent, 2)}%"),
-                html.Div(f"previous: {round(focusModePercent_last, 2)}%", style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(focusModePercent, focusModePercent_last))
-        
-        except (ValueError, TypeError) as e: 
-            print(f"Error in did_focus_Session: {e}"); 
-            return html.Div("Error"), dash.no_update
-
-
-    ###///////////////////
-    ### Third Row of Boxes: Futher User Metrics 
-    ### Stickiness Rate, Quit within 7 days, Activation Rate
-    ###///////////////////
-
-    @app.callback(
-        Output('Stickiness-Rate', 'children'), 
-        Output('Stickiness_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def Stickiness(start_date, end_date):
-        # Calculates the stickiness rate based on user activity in the date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            currentStickiness = CalculateStickiness(filteredDF)
-            prevStickiness = CalculateStickiness(LastCo_DF)
-
-            return ([
-                html.H5("Stickiness"),
-                html.H2(f"{round(currentStickiness, 2)}%"), # Stickiness calc returns %
-                html.Div(f"previous: {round(prevStickiness, 2)}%", # Stickiness calc returns %
-                        style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-            ], colourSelector(currentStickiness, prevStickiness)) # Higher is better
-
-        except (ValueError, TypeError) as e:
-             print(f"Error in Stickiness callback: {e}")
-             return html.Div("Error"), dash.no_update
-
-
-
-    @app.callback(
-        Output('QuitWithin7days', 'children'),
-        Output('QuitWithin7days_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')] 
-    )
-    def Quit_in_7days(start_date, end_date):
-        # Calculates the percentage of users who quit within 7 days of signing up in the date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        try:
-            filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-            LastCo_DF = previousCohort(start_date, end_date, df)
-
-            quitPercent = 0.0
-            if filteredDF is not None and not filteredDF.empty and "Quit within 7 days" in filteredDF:
-                didQuitIn7Days_count = filteredDF[filteredDF["Quit within 7 days"] == True].shape[0]
-                quitPercent = (didQuitIn7Days_count / len(filteredDF)) * 100
-
-            quitPercent_last = 0.0
-            if LastCo_DF is not None and not LastCo_DF.empty and "Quit within 7 days" in LastCo_DF:
-                didQuitIn7Days_last_count = LastCo_DF[LastCo_DF["Quit within 7 days"] == True].shape[0]
-                quitPercent_last = (didQuitIn7Days_last_count / len(LastCo_DF)) * 100
-
-            return([
-                html.H5("Quit within 7 days"),
-                html.H2(f"{round(quitPercent, 2)}%"), # Added % sign
-                html.Div(f"previous: {round(quitPercent_last, 2)}%", # Added % sign
-                        style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-                # Invert comparison for quit? Lower is better.
-            ], colourSelector(quitPercent_last, quitPercent)) # Inverted for "lower is better"
-
-        except (ValueError, TypeError) as e:
-             print(f"Error in Quit_in_7days callback: {e}")
-             return html.Div("Error"), dash.no_update
-        
-
-
-    @app.callback(
-        Output('Activation-Rate', 'children'),
-        Output('Activation-Rate_box', 'style'),
-        [Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'overview'}, 'end_date')]
-    )
-    def calculate_ActivationRate(start_date, end_date):
-        # Calculates the activation rate in the date range
-        if not start_date or not end_date:
-            return html.Div("Select dates"), dash.no_update
-
-        filteredDF = filter_df_by_Date_range(start_date, end_date, df)
-        LastCo_hortDates = previousCohort(start_date, end_date, df)
-
-        activationRate = 0.0
-        if filteredDF is not None and not filteredDF.empty and "Did activate" in filteredDF:
-            activationRate = (len(filteredDF[filteredDF["Did activate"] == True]) / len(filteredDF)) * 100
-
-        activationRate_last = 0.0
-        if LastCo_hortDates is not None and not LastCo_hortDates.empty and "Did activate" in LastCo_hortDates:
-            activationRate_last = (len(LastCo_hortDates[LastCo_hortDates["Did activate"] == True]) / len(LastCo_hortDates)) * 100
-
-        return ([
-            html.H5("Activation Rate"),
-            html.H2(f"{activationRate:.2f}%"), # Added % sign
-            html.Div(f"previous: {activationRate_last:.2f}%", # Added % sign
-                    style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
-        ], colourSelector(activationRate, activationRate_last)) # Higher is better
+            return [html.Div("Select dates"), dash.no_update] * len(OVERVIEW_KPIS) + [None] # Return valid component + no_update for style
+
+        dataset = DataHandling.get_dataset()
+        all_values = compute_overview_kpis(dataset, start_date, end_date)
+        # Boxes that already show a value only get their numbers and colour patched
+        shown = rendered_shape or [False] * len(OVERVIEW_KPIS)
+        outputs = []
+        for kpi, values, has_value in zip(OVERVIEW_KPIS, all_values, shown):
+            if has_value and values is not None:
+                outputs.extend(kpi_box_patches(kpi, values))
+            else:
+                outputs.extend(render_kpi_box(kpi, values))
+        return outputs + [[values is not None for values in all_values]]
 
 
 # === Helper Functions (Unchanged from previous version with robustness checks) ===
 
 def filter_df_by_Date_range(start_date, end_date, df):
-    """Filters DataFrame based on 'First desktop login date' column."""
+    """Filters DataFrame based on 'First desktop login date' column (a sorted slice of df, not a copy)."""
     try:
-        df_copy = df.copy()
-        df_copy["First desktop login date"] = pd.to_datetime(df_copy["First desktop login date"], errors='coerce')
-        df_copy = df_copy.dropna(subset=["First desktop login date"])
-
         start_dt = pd.to_datetime(start_date, errors='coerce')
         end_dt = pd.to_datetime(end_date, errors='coerce')
 
@@ -453,11 +68,7 @@ def filter_df_by_Date_range(start_date, end_date, df):
             print(f"Warning: Invalid date format provided to filter_df_by_Date_range: {start_date}, {end_date}")
             return pd.DataFrame()
 
-        date_filterd_df = df_copy.loc[
-            (df_copy["First desktop login date"].dt.date >= start_dt.date()) &
-            (df_copy["First desktop login date"].dt.date <= end_dt.date())
-        ]
-        return date_filterd_df
+        return DataHandling.date_range_slice(df, start_dt, end_dt)
     except Exception as e:
         print(f"Error in filter_df_by_Date_range: {e}")
         return pd.DataFrame()
@@ -473,45 +84,189 @@ def previousCohort(start_date, end_date, df):
              print(f"Warning: Invalid date format provided to previousCohort: {start_date}, {end_date}")
              return pd.DataFrame()
 
-        duration = end_dt - start_dt
-        prev_end_dt = start_dt - timedelta(days=1)
-        prev_start_dt = prev_end_dt - duration
-
-        last_cohort_df = filter_df_by_Date_range(prev_start_dt.strftime('%Y-%m-%d'), prev_end_dt.strftime('%Y-%m-%d'), df)
-        return last_cohort_df
+        return DataHandling.previous_period_slice(df, start_dt, end_dt)
     except Exception as e:
         print(f"Error in previousCohort: {e}")
         return pd.DataFrame()
 
 
-def CalculateStickiness(df):
-    """Calculates stickiness based on 'Did X on day Y' columns."""
-    if df is None or df.empty: return 0.0
-    rel_cols = [col for col in df.columns if "Did " in col and "on day" in col]
-    if not rel_cols: return 0.0
-    df_rel = df[rel_cols].apply(pd.to_numeric, errors='coerce').fillna(0) > 0
-    total_active_users = 0
-    total_retention_metric = 0.0
-
-    try:
-        day_numbers = sorted([int(col.split(' ')[-1]) for col in rel_cols if col.split(' ')[-1].isdigit()])
-        num_days = day_numbers[-1] if day_numbers else 0
-    except:
-        num_days = 0 # Fallback if parsing fails
-
-    if num_days == 0: # If we couldn't determine days, cannot calculate % stickiness reliably
-         print("Warning: Could not determine number of days for stickiness calculation.")
-         return 0.0 # Or return sum of active days? Needs clarification.
-
-    for _, row in df_rel.iterrows():
-        days_active = row.sum()
-        if days_active > 0:
-            total_active_users += 1
-            user_retention = days_active / num_days # Use dynamically found num_days
-            total_retention_metric += user_retention
-    if total_active_users == 0: return 0.0
-    stickiness = (total_retention_metric / total_active_users) * 100
-    return stickiness
+def CalculateStickiness(df, by=None):
+    """
+    Calculates stickiness based on the morning/evening habit days ('Did X on day Y'):
+    the average share of the 28 days an active user did their habits, as a percentage.
+
+    Args:
+        df: The (date filtered) users
+        by: Optional column to break the result down by, e.g. 'platform' or 'Subscription Status'
+
+    Returns:
+        The stickiness as a float, or with `by` a Series of stickiness per group plus the overall value under 'all'
+    """
+    if df is None or df.empty or not set(DataHandling.habit_day_columns).issubset(df.columns):
+        return 0.0 if by is None else pd.Series({'all': 0.0})
+    num_days = DataHandling.num_habit_days
+
+    # Active days per user, counting morning and evening habits separately (as the 'Did X' columns did)
+    masks = DataHandling.habit_day_masks(df)
+    days_active = DataHandling.popcount(masks[:, DataHandling.stickiness_habit_rows]).sum(axis=1)
+    active = days_active > 0
+    retention = days_active[active] / num_days
+
+    overall = retention.mean() * 100 if len(retention) else 0.0
+    if by is None:
+        return overall
+
+    # Per group in the same pass: active users and summed retention per group code
+    codes, groups = pd.factorize(df[by], sort=True)
+    active_codes = codes[active]
+    in_group = active_codes >= 0
+    active_per_group = np.bincount(active_codes[in_group], minlength=len(groups))
+    retention_per_group = np.bincount(active_codes[in_group], weights=retention[in_group], minlength=len(groups))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_group = np.where(active_per_group > 0, retention_per_group / active_per_group * 100, 0.0)
+    breakdown = pd.Series(per_group, index=pd.Index(groups, dtype=object, name=by))
+    breakdown['all'] = overall
+    return breakdown
+
+
+###///////////////////
+### Overview KPI registry
+### Each box is declared once: its ids, title, a reduction over the filtered users and its display format.
+### Top row: new user counts. Second row: user habits (at least 1 completion). Third row: further user metrics.
+###///////////////////
+
+def count_unique(column):
+    """Reduction counting the distinct values of a column (0 if the report doesn't have it)."""
+    def reduce(view):
+        return len(view[column].unique()) if column in view and not view.empty else 0
+    return reduce
+
+def cube_count(measure):
+    """KPI value: the total of a cube measure."""
+    def value(totals):
+        return totals[measure]
+    return value
+
+def cube_percent(measure):
+    """KPI value: a cube measure as a percentage of the users in the period."""
+    def value(totals):
+        return (totals[measure] / totals["users"]) * 100 if totals["users"] else 0.0
+    return value
+
+def cube_stickiness(totals):
+    """KPI value: stickiness (see CalculateStickiness) from the summed morning/evening habit days."""
+    if not totals["sticky_users"]: return 0.0
+    return (totals["sticky_days"] / DataHandling.num_habit_days / totals["sticky_users"]) * 100
+
+def format_count(value):
+    return f"{value}"
+
+def format_percent(value):
+    return f"{round(value, 2)}%"
+
+def format_percent_2dp(value):
+    return f"{value:.2f}%"
+
+# 'value' reads a KPI from the per-day cube totals (see KpiCube); 'reduce' works on the filtered users instead,
+# for the few KPIs that can't be summed per day (distinct counts)
+OVERVIEW_KPIS = [
+    # Top row: New Signups, New Personal Subs, Active Teams, Uninstalled
+    {'children_id': 'New-Signups-output', 'style_id': 'Signups-outputBox', 'title': "New Signups",
+     'value': cube_count("users"), 'format': format_count},
+    {'children_id': 'New-Personal-Subs', 'style_id': 'New-Personal-Subs-box', 'title': "New Personal Subs",
+     'value': cube_count("personal_subs"), 'format': format_count},
+    {'children_id': 'newteams', 'style_id': 'newteams_box', 'title': "Active Teams",
+     'reduce': count_unique("Team ID"), 'format': format_count},
+    {'children_id': 'Uninstalled', 'style_id': 'Uninstalled-box', 'title': "Uninstalled",
+     'value': cube_count("uninstalled"), 'format': format_count, 'lower_is_better': True},
+
+    # Second row: Did morning habit, evening habit, break activity, focus session
+    {'children_id': 'did-morning-habit', 'style_id': 'did-morning-habit_box', 'title': "Did Morning Habit",
+     'value': cube_percent("started_morning_routine"), 'format': format_percent},
+    {'children_id': 'did-evening-habit', 'style_id': 'did-evening-habit_box', 'title': "Did Evening Habit",
+     'value': cube_percent("started_evening_routine"), 'format': format_percent},
+    {'children_id': 'did-break-habit', 'style_id': 'did-break-habit_box', 'title': "Did Break Habit",
+     'value': cube_percent("completed_break_activity"), 'format': format_percent},
+    {'children_id': 'did-focus-session', 'style_id': 'did-focus-session_box', 'title': "Did Focus Session",
+     'value': cube_percent("started_focus_mode"), 'format': format_percent},
+
+    # Third row: Stickiness Rate, Quit within 7 days, Activation Rate
+    {'children_id': 'Stickiness-Rate', 'style_id': 'Stickiness_box', 'title': "Stickiness",
+     'value': cube_stickiness, 'format': format_percent},
+    {'children_id': 'QuitWithin7days', 'style_id': 'QuitWithin7days_box', 'title': "Quit within 7 days",
+     'value': cube_percent("quit_within_7_days"), 'format': format_percent, 'lower_is_better': True},
+    {'children_id': 'Activation-Rate', 'style_id': 'Activation-Rate_box', 'title': "Activation Rate",
+     'value': cube_percent("activated"), 'format': format_percent_2dp},
+]
+
+@ResultCache.memoize()
+def compute_overview_kpis(dataset, start_date, end_date):
+    """
+    Compute every Overview KPI for the selected period and the previous cohort (memoized per dataset version).
+    Cube KPIs take two prefix-sum lookups per cohort whatever the length of the range;
+    the users are only sliced out of the frame if a KPI needs them.
+
+    Returns:
+        One (current, previous) tuple per entry of OVERVIEW_KPIS, or None where the calculation failed
+    """
+    start_dt = pd.to_datetime(start_date, errors='coerce')
+    end_dt = pd.to_datetime(end_date, errors='coerce')
+    if pd.isna(start_dt) or pd.isna(end_dt):
+        print(f"Warning: Invalid date format provided to compute_overview_kpis: {start_date}, {end_date}")
+        return [None] * len(OVERVIEW_KPIS)
+
+    prev_start_dt, prev_end_dt = DataHandling.previous_period_dates(start_dt, end_dt)
+    cube = dataset.kpi_cube
+    current_totals = KpiCube.range_totals(cube, start_dt, end_dt)
+    previous_totals = KpiCube.range_totals(cube, prev_start_dt, prev_end_dt)
+    views = None
+
+    values = []
+    for kpi in OVERVIEW_KPIS:
+        try:
+            if 'value' in kpi:
+                values.append((kpi['value'](current_totals), kpi['value'](previous_totals)))
+            else:
+                if views is None:
+                    views = (filter_df_by_Date_range(start_dt, end_dt, dataset.df),
+                             previousCohort(start_dt, end_dt, dataset.df))
+                values.append((kpi['reduce'](views[0]), kpi['reduce'](views[1])))
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"Error calculating {kpi['title']}: {e}")
+            values.append(None)
+    return values
+
+def render_kpi_box(kpi, values):
+    """The children and style of one Overview box."""
+    if values is None:
+        return html.Div("Error"), dash.no_update
+    current, previous = values
+    children = [
+        html.H5(kpi['title']),
+        html.H2(kpi['format'](current)),
+        html.Div(f"previous: {kpi['format'](previous)}",
+                style={"fontSize": "12px", "fontStyle": "italic", "opacity": "0.7"})
+    ]
+    return children, kpi_box_style(kpi, values)
+
+def kpi_box_patches(kpi, values):
+    """Patches of a box already rendered by render_kpi_box: the two numbers (H2, previous Div) and the colour."""
+    current, previous = values
+    children = Patch()
+    children[1]['props']['children'] = kpi['format'](current)
+    children[2]['props']['children'] = f"previous: {kpi['format'](previous)}"
+    style = Patch()
+    style['backgroundColor'] = kpi_box_style(kpi, values)['backgroundColor']
+    return children, style
+
+def kpi_box_style(kpi, values):
+    """Style of a box, coloured by how the current value compares with the previous one."""
+    current, previous = values
+    # For "lower is better" metrics the comparison is inverted
+    if kpi.get('lower_is_better'):
+        return colourSelector(previous, current)
+    return colourSelector(current, previous)
 
 
 def colourSelector(val_current, val_last):
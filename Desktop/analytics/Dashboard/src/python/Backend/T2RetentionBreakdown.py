@@ -1,16 +1,15 @@
 # --- START OF FILE T2HabbitsBackEnd.py ---
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, ClientsideFunction
 import pandas as pd
 from datetime import date, datetime, timedelta
 import plotly.graph_objects as go
-import numpy as np # Import numpy for finding max in list of lists
+import numpy as np # Heatmap matrices are ndarrays
 
 # Import data and variables from other files
 from src.python.Backend.VisualVariables import FOCUS_BEAR_YELLOW, FOCUS_BEAR_LIGHT, FOCUS_BEAR_BLACK, custom_colorscale
-from src.python.Backend import DataHandling # This will provide df and create_habits_heatmap
-from src.python.Backend.DataHandling import df # Directly import df if it's a global variable in DataHandling
+from src.python.Backend import DataHandling, ResultCache, RetentionCube # Provides the lazily loaded dataset (DataHandling.get_dataset().df)
 
 
 def get_previous_period_data(start_date_str, end_date_str, full_df, date_column="First desktop login date"):
@@ -21,46 +20,59 @@ def get_previous_period_data(start_date_str, end_date_str, full_df, date_column=
     if not start_date_str or not end_date_str:
         return pd.DataFrame(), None, None # Return empty DataFrame and None for dates
     try:
-        current_start_dt = pd.to_datetime(start_date_str)
-        current_end_dt = pd.to_datetime(end_date_str)
+        prev_start_dt, prev_end_dt = DataHandling.previous_period_dates(start_date_str, end_date_str)
 
-        duration = current_end_dt - current_start_dt
-
-        prev_end_dt = current_start_dt - timedelta(days=1)
-        prev_start_dt = prev_end_dt - duration # Subtract the same duration
-
-        df_copy = full_df.copy() # Work on a copy
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column], errors='coerce')
-        df_copy = df_copy.dropna(subset=[date_column]) # Remove rows where date conversion failed
-
-        previous_df = df_copy[
-            (df_copy[date_column].dt.date >= prev_start_dt.date()) &
-            (df_copy[date_column].dt.date <= prev_end_dt.date())
-        ]
+        # full_df is sorted by date, so the previous period is a contiguous slice
+        previous_df = DataHandling.date_range_slice(full_df, prev_start_dt, prev_end_dt, date_column)
         return previous_df, prev_start_dt.strftime('%Y-%m-%d'), prev_end_dt.strftime('%Y-%m-%d')
     except Exception as e:
         print(f"Error in get_previous_period_data: {e}")
         return pd.DataFrame(), None, None
 
-def create_habits_heatmap(df_input, user_id_column="Userid"):
+def habit_usage_matrices(period_dfs, days=DataHandling.num_habit_days, user_id_column="Userid"):
+    """
+    Heatmap engine: the percentage of unique users doing each habit on each day, for several periods at once.
+    The packed habit days of every period are unpacked into one (users x habits x days) block and summed per
+    period in a single reduction.
+    RETURNS: float ndarray of shape (periods, habits, days), rounded to 2 dp (all zeros for an empty period)
+    """
+    days = DataHandling.habit_day_horizon(days)
+    num_habits = len(DataHandling.day_column_prefixes)
+
+    masks, users = [], []
+    for period_df in period_dfs:
+        if period_df is None or period_df.empty or user_id_column not in period_df.columns:
+            masks.append(np.zeros((0, num_habits), dtype=np.uint32))
+            users.append(0)
+        else:
+            masks.append(DataHandling.habit_day_masks(period_df))
+            users.append(period_df[user_id_column].nunique())
+
+    # One row per user, one column per (habit, day); period_rows[p, u] marks the users of period p
+    active = DataHandling.habit_day_bits(np.concatenate(masks), days).reshape(-1, num_habits * days)
+    period_of_row = np.repeat(np.arange(len(masks)), [len(m) for m in masks])
+    period_rows = period_of_row == np.arange(len(masks))[:, None]
+    counts = (period_rows.astype(np.int64) @ active.astype(np.int64)).reshape(len(masks), num_habits, days)
+
+    users = np.asarray(users, dtype=np.float64)[:, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = np.where(users > 0, counts / np.where(users > 0, users, 1) * 100, 0.0)
+    return np.round(percent, 2)
+
+def create_habits_heatmap(df_input, user_id_column="Userid", z_data=None, days=DataHandling.num_habit_days):
     """
-    Creates a heatmap showing habit usage across days 1-28 for all habit prefixes.
+    Creates a heatmap showing habit usage across days 1..days for all habit prefixes.
     Y-axis: Habit prefixes
-    X-axis: Day numbers (1-28)
-    Z value: PERCENTAGE of unique users performing that habit on that day.
-    RETURNS: plotly.graph_objects.Figure, list_of_lists_with_percentage_data (z_data)
+    X-axis: Day numbers (1..days)
+    Z value: PERCENTAGE of unique users performing that habit on that day
+    (z_data, when given, is this period's matrix from habit_usage_matrices).
+    RETURNS: plotly.graph_objects.Figure, ndarray with percentage data (z_data)
     """
-    PREFIXES = [
-        "Did morning habits on day",
-        "Did evening habits on day",
-        "Used breaks on day",
-        "Used focus mode on day"
-    ]
-    
-    heatmap_z_data_percent = [] # This will be our raw z data
+    PREFIXES = DataHandling.day_column_prefixes # Row order of the packed habit days
+    days = DataHandling.habit_day_horizon(days)
 
     if df_input is None or df_input.empty:
-        empty_z_data = [[0 for _ in range(28)] for _ in PREFIXES] # Empty data structure
+        empty_z_data = np.zeros((len(PREFIXES), days)) # Empty data structure
         fig = go.Figure()
         fig.update_layout(
             title_text="Habit Usage Heatmap (% Users)",
@@ -71,7 +83,7 @@ def create_habits_heatmap(df_input, user_id_column="Userid"):
 
     if user_id_column not in df_input.columns:
         
-        empty_z_data = [[0 for _ in range(28)] for _ in PREFIXES]
+        empty_z_data = np.zeros((len(PREFIXES), days))
         fig = go.Figure()
         fig.update_layout(
             title_text="Habit Usage Heatmap (Error)",
@@ -79,29 +91,15 @@ def create_habits_heatmap(df_input, user_id_column="Userid"):
             xaxis_showticklabels=False, yaxis_showticklabels=False
         )
         return fig, empty_z_data
-        
-    total_unique_users = df_input[user_id_column].nunique()
-
-    if total_unique_users == 0:
-        for _ in PREFIXES: # Iterate to match the number of rows expected
-            heatmap_z_data_percent.append([0.0] * 28) # 28 days of zeros
-    else:
-        for prefix in PREFIXES:
-            row_data_percent = []
-            for day in range(1, 29):
-                col_name = f"{prefix} {day}"
-                if col_name in df_input.columns:
-                    count_habit_day = df_input[col_name].fillna(0).astype(bool).sum()
-                    percentage = (count_habit_day / total_unique_users) * 100
-                    row_data_percent.append(round(percentage, 2))
-                else:
-                    row_data_percent.append(0.0)
-            heatmap_z_data_percent.append(row_data_percent)
-    
-    # The figure is created using this heatmap_z_data_percent
+
+    if z_data is None:
+        z_data = habit_usage_matrices([df_input], days, user_id_column)[0]
+
+    # The figure is created using this z_data
+    # Numeric days and float32 percentages go out as compact typed arrays (hover shows 2 decimals anyway)
     fig = go.Figure(data=go.Heatmap(
-        z=heatmap_z_data_percent,
-        x=[str(i) for i in range(1, 29)],
+        z=z_data.astype(np.float32),
+        x=np.arange(1, days + 1),
         y=PREFIXES,
         colorscale=custom_colorscale, # Default, will be overridden by callback if dynamic zmax is used
         # zmin will be set by callback, zmax will be dynamic
@@ -118,155 +116,222 @@ def create_habits_heatmap(df_input, user_id_column="Userid"):
         height=600,
     )
     
-    return fig, heatmap_z_data_percent # Return both the figure and the raw z data
+    return fig, z_data # Return both the figure and the raw z data
 
-def CategoryBreakDownCallBacks(app):
+def calculate_days_and_format_period(start_date_str, end_date_str, period_label="Selected Period"):
+    """Formats the date period string for display."""
+    if start_date_str and end_date_str:
+        try:
+            start_dt = pd.to_datetime(start_date_str)
+            end_dt = pd.to_datetime(end_date_str)
+            num_days = (end_dt - start_dt).days + 1
+            return f"<b>{period_label}: {start_dt.strftime('%b %d, %Y')} - {end_dt.strftime('%b %d, %Y')} ({num_days} days)</b>"
+        except ValueError: # Handle case where date strings might not be valid yet
+             return f"<b>{period_label}: Invalid dates</b>"
+        except Exception: # Catch any other parsing error
+             return f"<b>{period_label}: Calculating...</b>"
+    return f"<b>{period_label}: No period selected</b>"
 
-    def calculate_days_and_format_period(start_date_str, end_date_str, period_label="Selected Period"):
-        """Formats the date period string for display."""
-        if start_date_str and end_date_str:
-            try:
-                start_dt = pd.to_datetime(start_date_str)
-                end_dt = pd.to_datetime(end_date_str)
-                num_days = (end_dt - start_dt).days + 1
-                return f"<b>{period_label}: {start_dt.strftime('%b %d, %Y')} - {end_dt.strftime('%b %d, %Y')} ({num_days} days)</b>"
-            except ValueError: # Handle case where date strings might not be valid yet
-                 return f"<b>{period_label}: Invalid dates</b>"
-            except Exception: # Catch any other parsing error
-                 return f"<b>{period_label}: Calculating...</b>"
-        return f"<b>{period_label}: No period selected</b>"
 
-    @app.callback(
-        [Output('habits-heatmap', 'figure'),
-         Output('habits-heatmap-previous', 'figure')],
-        [Input({'type': 'auto-update-daterange', 'index': 'habits'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'habits'}, 'end_date'),
-         Input('habits-subscription-filter', 'value'),
-         Input('habits-platform-filter', 'value')]
-    )
-    def update_heatmaps(start_date, end_date, subscription_filter, platform_filter):
-        if not start_date or not end_date:
-            empty_fig_layout = dict(
-                title_text="Please select a date range",
-                xaxis_showticklabels=False, yaxis_showticklabels=False,
-                paper_bgcolor=FOCUS_BEAR_LIGHT, plot_bgcolor='white',
-                font=dict(color=FOCUS_BEAR_BLACK)
-            )
-            return go.Figure(layout=empty_fig_layout), go.Figure(layout=empty_fig_layout)
-
-        # --- CURRENT PERIOD DATA ---
-        current_filtered_df = df.copy()
-        current_filtered_df["First desktop login date"] = pd.to_datetime(current_filtered_df["First desktop login date"], errors='coerce')
-        current_filtered_df.dropna(subset=["First desktop login date"], inplace=True)
-        try:
-            current_start_dt_obj = pd.to_datetime(start_date).date()
-            current_end_dt_obj = pd.to_datetime(end_date).date()
-        except ValueError:
-            error_fig_layout = dict(
-                title_text="Invalid date format selected",
-                xaxis_showticklabels=False, yaxis_showticklabels=False,
-                paper_bgcolor=FOCUS_BEAR_LIGHT, plot_bgcolor='white',
-                font=dict(color=FOCUS_BEAR_BLACK)
-            )
-            return go.Figure(layout=error_fig_layout), go.Figure(layout=error_fig_layout)
-
-        current_filtered_df = current_filtered_df[
-            (current_filtered_df["First desktop login date"].dt.date >= current_start_dt_obj) &
-            (current_filtered_df["First desktop login date"].dt.date <= current_end_dt_obj)
-        ]
-
-        if subscription_filter != 'all':
-            current_filtered_df = current_filtered_df[current_filtered_df["Subscription Status"] == subscription_filter]
-
-        if platform_filter != 'all':
-            if platform_filter == 'unknown':
-                current_filtered_df = current_filtered_df[current_filtered_df["platform"].isna() | (current_filtered_df["platform"] == "")]
-            else:
-                current_filtered_df = current_filtered_df[current_filtered_df["platform"].astype(str).str.lower() == platform_filter.lower()]
+def dynamic_zmax_for(overall_max_z):
+    """Top of the colour scale for a heatmap whose largest percentage is overall_max_z."""
+    if overall_max_z == 0: # No data or all values are zero
+        return 10 # Default small range if no data, or use 100 if you want full scale
+    elif overall_max_z <= 10: # If max actual value is 10% or less
+        return 10   # Set scale top to 10%
+    elif overall_max_z <= 25:
+        return 25
+    elif overall_max_z <= 50:
+        return 50
+    else: # For values > 50%, scale up to 100%
+        return 100
 
-    
-        fig_current, z_data_current = create_habits_heatmap(current_filtered_df, user_id_column="Userid")
-        current_period_text = calculate_days_and_format_period(start_date, end_date, "Current Period")
-
-        # --- PREVIOUS PERIOD DATA ---
-        previous_filtered_df, prev_start_str, prev_end_str = get_previous_period_data(start_date, end_date, df, date_column="First desktop login date")
-        if not previous_filtered_df.empty:
-            if subscription_filter != 'all':
-                previous_filtered_df = previous_filtered_df[previous_filtered_df["Subscription Status"] == subscription_filter]
-            if platform_filter != 'all':
-                if platform_filter == 'unknown':
-                    previous_filtered_df = previous_filtered_df[previous_filtered_df["platform"].isna() | (previous_filtered_df["platform"] == "")]
-                else:
-                    previous_filtered_df = previous_filtered_df[previous_filtered_df["platform"].astype(str).str.lower() == platform_filter.lower()]
-        
-        fig_previous, z_data_previous = create_habits_heatmap(previous_filtered_df)
-        previous_period_text = calculate_days_and_format_period(prev_start_str, prev_end_str, "Previous Period") if prev_start_str and prev_end_str else "<b>Previous Period: N/A</b>"
-
-        # --- DETERMINE DYNAMIC ZMAX ---
-        max_val_current = 0
-        if z_data_current and any(z_data_current):
-            flat_current = [item for sublist in z_data_current for item in sublist if isinstance(item, (int, float))] # Ensure items are numeric
-            if flat_current: max_val_current = np.max(flat_current)
-
-        max_val_previous = 0
-        if z_data_previous and any(z_data_previous):
-            flat_previous = [item for sublist in z_data_previous for item in sublist if isinstance(item, (int, float))] # Ensure items are numeric
-            if flat_previous: max_val_previous = np.max(flat_previous)
-        
-        overall_max_z = max(max_val_current, max_val_previous)
-
-        if overall_max_z == 0: # No data or all values are zero
-            dynamic_zmax = 10 # Default small range if no data, or use 100 if you want full scale
-        elif overall_max_z <= 10: # If max actual value is 10% or less
-            dynamic_zmax = 10   # Set scale top to 10%
-        elif overall_max_z <= 25:
-            dynamic_zmax = 25
-        elif overall_max_z <= 50:
-            dynamic_zmax = 50
-        else: # For values > 50%, scale up to 100%
-            dynamic_zmax = 100
-        
-        # --- UPDATE FIGURE LAYOUTS WITH DYNAMIC ZMAX ---
-        # Current Figure
-        existing_annotations_current = list(fig_current.layout.annotations) if fig_current.layout.annotations else []
-        fig_current.update_layout(
-            width= 1300,
-            height=500,
-            annotations=[dict(text=current_period_text, xref="paper", yref="paper", x=0.5, y=1.05, showarrow=False, font=dict(size=14, color=FOCUS_BEAR_BLACK), align='center')] + existing_annotations_current,
-            coloraxis=dict(
-                colorscale=fig_current.layout.coloraxis.colorscale if fig_current.layout.coloraxis and fig_current.layout.coloraxis.colorscale else custom_colorscale,
-                cmin=0,
-                cmax=dynamic_zmax
-            ),
-            paper_bgcolor=FOCUS_BEAR_LIGHT,
-            plot_bgcolor='white',
-            font=dict(color=FOCUS_BEAR_BLACK)
-        )
+def create_cohort_retention_heatmap(cube, subscription_filter='all', platform_filter='all'):
+    """
+    Creates the weekly signup-cohort retention triangle from the retention cube.
+    Y-axis: Signup week (cohort size in brackets)
+    X-axis: Day since signup
+    Z value: PERCENTAGE of the cohort's users doing any habit that day (blank where the cohort has not reached it yet)
+    RETURNS: plotly.graph_objects.Figure
+    """
+    week_starts, rates, cohort_sizes = RetentionCube.cohort_rates(cube, platform_filter, subscription_filter)
 
-        # Previous Figure
-        existing_annotations_previous = list(fig_previous.layout.annotations) if fig_previous.layout.annotations else []
-        fig_previous.update_layout(
-            width=1300,
-            height=500,
-            annotations=[dict(text=previous_period_text, xref="paper", yref="paper", x=0.5, y=1.05, showarrow=False, font=dict(size=14, color=FOCUS_BEAR_BLACK), align='center')] + existing_annotations_previous,
-            coloraxis=dict(
-                colorscale=fig_previous.layout.coloraxis.colorscale if fig_previous.layout.coloraxis and fig_previous.layout.coloraxis.colorscale else custom_colorscale,
-                cmin=0,
-                cmax=dynamic_zmax # Apply THE SAME dynamic zmax
-            ),
-            paper_bgcolor=FOCUS_BEAR_LIGHT,
-            plot_bgcolor='white',
+    if len(week_starts) == 0:
+        fig = go.Figure()
+        fig.update_layout(
+            title_text="Weekly Cohort Retention (% Users Active)",
+            annotations=[dict(text="No data available for selected filters", showarrow=False)],
+            xaxis_showticklabels=False, yaxis_showticklabels=False,
+            paper_bgcolor=FOCUS_BEAR_LIGHT, plot_bgcolor='white',
             font=dict(color=FOCUS_BEAR_BLACK)
         )
+        return fig
+
+    week_labels = [f"{pd.Timestamp(week).strftime('%b %d, %Y')} (n={size})" for week, size in zip(week_starts, cohort_sizes)]
+    max_rate = np.nanmax(rates) if not np.isnan(rates).all() else 0
 
-        return fig_current, fig_previous
+    fig = go.Figure(data=go.Heatmap(
+        z=rates.astype(np.float32),
+        x=np.arange(1, cube["days"] + 1),
+        y=week_labels,
+        colorscale=custom_colorscale,
+        zmin=0,
+        zmax=dynamic_zmax_for(max_rate),
+        hovertemplate="Signup week %{y}<br>Day %{x}<br>Active: %{z:.2f}%<extra></extra>",
+        colorbar=dict(title='% Users Active'),
+        showscale=True
+    ))
+
+    fig.update_layout(
+        title="Weekly Cohort Retention (% Users Active)",
+        xaxis=dict(title="Day Since Signup", tickmode='linear', dtick=1),
+        yaxis=dict(title="Signup Week", autorange='reversed'),
+        margin=dict(t=60, l=250, r=50, b=50),
+        height=max(500, 14 * len(week_labels)),
+        width=1300,
+        paper_bgcolor=FOCUS_BEAR_LIGHT,
+        plot_bgcolor='white',
+        font=dict(color=FOCUS_BEAR_BLACK)
+    )
+    return fig
+
+
+def habit_slice_counts(period_df, selections, days=DataHandling.num_habit_days, user_id_column="Userid"):
+    """
+    Heatmap counts of several selections of one period's rows in a single product: selections is a bool
+    (selections x rows) array. RETURNS: int ndarray (selections x habits x days) of the users active per habit
+    and day, and the unique users of each selection.
+    """
+    days = DataHandling.habit_day_horizon(days)
+    num_habits = len(DataHandling.day_column_prefixes)
+    if period_df.empty or user_id_column not in period_df.columns:
+        return np.zeros((len(selections), num_habits, days), dtype=np.int64), np.zeros(len(selections), dtype=np.int64)
+
+    active = DataHandling.habit_day_bits(DataHandling.habit_day_masks(period_df), days).reshape(-1, num_habits * days)
+    counts = (selections.astype(np.int64) @ active.astype(np.int64)).reshape(len(selections), num_habits, days)
+    user_codes = pd.factorize(period_df[user_id_column])[0]
+    users = np.array([len(np.unique(user_codes[selected & (user_codes >= 0)])) for selected in selections], dtype=np.int64)
+    return counts, users
+
+def style_period_heatmap(fig, period_text, zmax):
+    """Period annotation, shared colour scale and tab colours of one period's heatmap (in place)."""
+    existing_annotations = list(fig.layout.annotations) if fig.layout.annotations else []
+    # The period annotation comes first, so the browser can replace its text (see assets/habit_heatmaps.js).
+    # Assigned rather than passed to update_layout, which would merge it into an empty figure's "No data" note.
+    fig.layout.annotations = [dict(text=period_text, xref="paper", yref="paper", x=0.5, y=1.05, showarrow=False, font=dict(size=14, color=FOCUS_BEAR_BLACK), align='center')] + existing_annotations
+    fig.update_layout(
+        width=1300,
+        height=500,
+        coloraxis=dict(
+            colorscale=fig.layout.coloraxis.colorscale if fig.layout.coloraxis and fig.layout.coloraxis.colorscale else custom_colorscale,
+            cmin=0,
+            cmax=zmax # Both periods share THE SAME dynamic zmax
+        ),
+        paper_bgcolor=FOCUS_BEAR_LIGHT,
+        plot_bgcolor='white',
+        font=dict(color=FOCUS_BEAR_BLACK)
+    )
+    return fig
+
+def heatmap_message(title):
+    """Slice store data that makes the browser show a titled blank figure in both heatmaps."""
+    return {"message": go.Figure(layout=dict(
+        title_text=title,
+        xaxis_showticklabels=False, yaxis_showticklabels=False,
+        paper_bgcolor=FOCUS_BEAR_LIGHT, plot_bgcolor='white',
+        font=dict(color=FOCUS_BEAR_BLACK)
+    )).to_plotly_json()}
+
+@ResultCache.memoize()
+def heatmap_slices(dataset, start_date, end_date, days=DataHandling.num_habit_days):
+    """
+    Everything the browser needs to draw both heatmaps for any subscription x platform filter of a date range
+    (see assets/habit_heatmaps.js): per period, the habit/day counts and unique users of every filter
+    combination, plus the period texts and the two figure templates ('heatmap' and 'empty').
+    Memoized per dataset version; the result is shared and must not be modified.
+    """
+    try:
+        pd.to_datetime(start_date).normalize()
+        pd.to_datetime(end_date).normalize()
+    except ValueError:
+        return heatmap_message("Invalid date format selected")
+
+    days = DataHandling.habit_day_horizon(days)
+    df, filter_index = dataset.df, dataset.filter_index
+    subscriptions = filter_index.filter_values('subscription')
+    platforms = filter_index.filter_values('platform')
+    periods = [(start_date, end_date, calculate_days_and_format_period(start_date, end_date, "Current Period"))]
+    try:
+        prev_start_dt, prev_end_dt = DataHandling.previous_period_dates(start_date, end_date)
+        prev_start_str, prev_end_str = prev_start_dt.strftime('%Y-%m-%d'), prev_end_dt.strftime('%Y-%m-%d')
+        periods.append((prev_start_str, prev_end_str, calculate_days_and_format_period(prev_start_str, prev_end_str, "Previous Period")))
+    except Exception as e:
+        print(f"Error in heatmap_slices (previous period): {e}")
+        periods.append((None, None, "<b>Previous Period: N/A</b>"))
+
+    period_data = []
+    for period_start, period_end, period_text in periods:
+        lo, hi = filter_index.date_bounds(period_start, period_end) if period_start else (0, 0)
+        hi = max(lo, hi)
+        # Rows of every (subscription, platform) combination, subscription-major
+        subscription_rows = np.stack([filter_index.row_mask('subscription', value, lo, hi) for value in subscriptions])
+        platform_rows = np.stack([filter_index.row_mask('platform', value, lo, hi) for value in platforms])
+        selections = (subscription_rows[:, None, :] & platform_rows[None, :, :]).reshape(len(subscriptions) * len(platforms), hi - lo)
+        counts, users = habit_slice_counts(df.iloc[lo:hi], selections, days)
+        period_data.append({"text": period_text, "counts": counts.reshape(len(selections), -1).tolist(), "users": users.tolist()})
+
+    zeros = np.zeros((len(DataHandling.day_column_prefixes), days))
+    heatmap_fig, _ = create_habits_heatmap(df, z_data=zeros, days=days)
+    empty_fig, _ = create_habits_heatmap(None, days=days)
+    return {
+        "days": days,
+        "subscriptions": subscriptions,
+        "platforms": platforms,
+        "periods": period_data,
+        "figures": {
+            "heatmap": style_period_heatmap(heatmap_fig, "", dynamic_zmax_for(0)).to_plotly_json(),
+            "empty": style_period_heatmap(empty_fig, "", dynamic_zmax_for(0)).to_plotly_json(),
+        },
+    }
+
+def CategoryBreakDownCallBacks(app):
+
+    @app.callback(
+        Output({'type': 'heatmap-slices-store', 'index': 'habits'}, 'data'),
+        [Input({'type': 'date-range-store', 'index': 'habits'}, 'data')]
+    )
+    def publish_heatmap_slices(date_range):
+        # Sent once per date range; the filters are applied in the browser
+        start_date, end_date = DataHandling.unpack_date_range(date_range)
+        if not start_date or not end_date:
+            return heatmap_message("Please select a date range")
+        return heatmap_slices(DataHandling.get_dataset(), start_date, end_date)
+
+    # Switching the subscription/platform filters redraws the heatmaps without a server round trip
+    app.clientside_callback(
+        ClientsideFunction(namespace='heatmaps', function_name='render_habit_heatmaps'),
+        Output('habits-heatmap', 'figure'),
+        Output('habits-heatmap-previous', 'figure'),
+        Input({'type': 'heatmap-slices-store', 'index': 'habits'}, 'data'),
+        Input('habits-subscription-filter', 'value'),
+        Input('habits-platform-filter', 'value')
+    )
+
+    @app.callback(
+        Output('habits-cohort-retention', 'figure'),
+        [Input('habits-subscription-filter', 'value'),
+         Input('habits-platform-filter', 'value')]
+    )
+    def update_cohort_retention(subscription_filter, platform_filter):
+        # Rendered from the per-version retention cube; the filters only pick slices of it
+        return create_cohort_retention_heatmap(DataHandling.get_dataset().retention_cube, subscription_filter, platform_filter)
 
     @app.callback(
         Output('retention-cohort-end-date-output', 'children'),
-        [Input({'type': 'auto-update-daterange', 'index': 'habits'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'habits'}, 'end_date')]
+        [Input({'type': 'date-range-store', 'index': 'habits'}, 'data')]
     )
-    def update_retention_period_display(start_date_str, end_date_str):
+    def update_retention_period_display(date_range):
+        start_date_str, end_date_str = DataHandling.unpack_date_range(date_range)
         if not start_date_str or not end_date_str:
             return "Select a date range above to see the analysis period."
         try:
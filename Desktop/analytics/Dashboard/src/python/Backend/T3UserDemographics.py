@@ -1,4 +1,7 @@
-from .DataHandling import df
+from . import DataHandling, LabelMatrix, ViewStore
+import dash
+import numpy as np
+import pandas as pd
 import plotly.express as px
 from dash import Input, Output
 def filter_demographics_data(df, subscription_filter='all', platform_filter='all', start_date=None, end_date=None):
@@ -15,24 +18,8 @@ def filter_demographics_data(df, subscription_filter='all', platform_filter='all
     Returns:
         Filtered dataframe
     """
-    filtered_df = df.copy()
-    
-    # Apply subscription filter
-    if subscription_filter != 'all':
-        filtered_df = filtered_df[filtered_df['Subscription Status'].str.lower() == subscription_filter]
-    
-    # Apply platform filter
-    if platform_filter != 'all':
-        filtered_df = filtered_df[filtered_df['platform'].str.lower() == platform_filter.lower()]
-    
-    # Apply date range filter if provided
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['First desktop login date'] >= start_date) & 
-            (filtered_df['First desktop login date'] <= end_date)
-        ]
-    
-    return filtered_df
+    # Date range and filters in one pass over the precomputed filter bitmaps (see FilterIndex)
+    return DataHandling.select_users(df, start_date, end_date, subscription_filter, platform_filter)
 
 def get_subscription_distribution(df, platform_filter='all', start_date=None, end_date=None):
     """
@@ -49,8 +36,8 @@ def get_subscription_distribution(df, platform_filter='all', start_date=None, en
     """
     filtered_df = filter_demographics_data(df, 'all', platform_filter, start_date, end_date)
     
-    # Count subscription statuses
-    status_counts = filtered_df['Subscription Status'].value_counts().reset_index()
+    # Count subscription statuses (as plain values, so unused categories don't show up as empty slices)
+    status_counts = filtered_df['Subscription Status'].astype(object).value_counts().reset_index()
     status_counts.columns = ['Status', 'Count']
     
     return status_counts
@@ -117,10 +104,10 @@ def get_occupation_distribution(df, subscription_filter='all', platform_filter='
             return category
     
     # Apply the extraction function to get simplified occupations
-    filtered_df['Simplified_Occupation'] = filtered_df['Occupation'].apply(extract_occupation_category)
+    simplified_occupations = filtered_df['Occupation'].apply(extract_occupation_category)
     
     # Count simplified occupations
-    occupation_counts = filtered_df['Simplified_Occupation'].value_counts().reset_index()
+    occupation_counts = simplified_occupations.value_counts().reset_index()
     occupation_counts.columns = ['Occupation', 'Count']
     
     # Get top N occupations
@@ -145,44 +132,12 @@ def filter_demographics_data(df, subscription_filter='all', platform_filter='all
     Returns:
         Filtered dataframe
     """
-    filtered_df = df.copy()
-    
-    # Apply subscription filter
-    if subscription_filter != 'all':
-        filtered_df = filtered_df[filtered_df['Subscription Status'].str.lower() == subscription_filter]
-    
-    # Apply platform filter
-    if platform_filter != 'all':
-        filtered_df = filtered_df[filtered_df['platform'].str.lower() == platform_filter.lower()]
-    
-    # Apply date range filter if provided
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['First desktop login date'] >= start_date) & 
-            (filtered_df['First desktop login date'] <= end_date)
-        ]
-    
-    return filtered_df
+    # Date range and filters in one pass over the precomputed filter bitmaps (see FilterIndex)
+    return DataHandling.select_users(df, start_date, end_date, subscription_filter, platform_filter)
 
 def extract_occupation_category(occupation):
-    """Extract just the main category from complex occupation data"""
-    if not isinstance(occupation, str):
-       return "Unknown"
-    
-    # Check if it's in JSON-like format: {"Category":{"Subcategory":"Detail"}}
-    if occupation.startswith('{') and '}' in occupation:
-        try:
-            # Extract just the main category (the first key)
-            category = occupation.split(':', 1)[0].replace('{', '').replace('"', '').strip().lower()
-            return category
-        except:
-            return occupation
-    else:
-        # If it's not in the complex format, return as is
-        if len(occupation) > 30:
-            return "other"
-        category = occupation.split(':', 1)[0].replace('"', '').strip().lower()
-        return category
+    """Extract just the main category from complex occupation data (see DataHandling.occupation_category)"""
+    return DataHandling.occupation_category(occupation)
 
 def get_subscription_distribution(df, platform_filter='all', start_date=None, end_date=None):
     """
@@ -199,8 +154,8 @@ def get_subscription_distribution(df, platform_filter='all', start_date=None, en
     """
     filtered_df = filter_demographics_data(df, 'all', platform_filter, start_date, end_date)
     
-    # Count subscription statuses
-    status_counts = filtered_df['Subscription Status'].value_counts().reset_index()
+    # Count subscription statuses (as plain values, so unused categories don't show up as empty slices)
+    status_counts = filtered_df['Subscription Status'].astype(object).value_counts().reset_index()
     status_counts.columns = ['Status', 'Count']
     
     return status_counts
@@ -249,10 +204,10 @@ def get_occupation_distribution(df, subscription_filter='all', platform_filter='
     filtered_df = filter_demographics_data(df, subscription_filter, platform_filter, start_date, end_date)
     
     # Apply the extraction function to get simplified occupations
-    filtered_df['Simplified_Occupation'] = filtered_df['Occupation'].apply(extract_occupation_category)
+    simplified_occupations = filtered_df['Occupation'].apply(extract_occupation_category)
     
     # Count simplified occupations
-    occupation_counts = filtered_df['Simplified_Occupation'].value_counts().reset_index()
+    occupation_counts = simplified_occupations.value_counts().reset_index()
     occupation_counts.columns = ['Occupation', 'Count']
     
     # Get top N occupations
@@ -260,34 +215,47 @@ def get_occupation_distribution(df, subscription_filter='all', platform_filter='
     
     return top_occupations
 
+# ================= FILTERED VIEW =================
+
+@ViewStore.register_view('demographics')
+def demographics_view(dataset, start_date=None, end_date=None, subscription='all', platform='all'):
+    """Rows of the Demographics charts: with every filter ('selected'), and without the subscription filter (for the pie)."""
+    filter_index = dataset.filter_index
+    all_subscriptions, _ = filter_index.positions(start_date, end_date, platform=platform)
+    selected, _ = filter_index.positions(start_date, end_date, subscription=subscription, platform=platform)
+    return {'all_subscriptions': all_subscriptions, 'selected': selected}
+
 # ================= CALLBACKS =================
 
 def register_demographics_callbacks(app):
     """Register all callbacks for the Demographics tab"""
     
     @app.callback(
-        Output('subscription-pie-chart', 'figure'),
-        [Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'end_date'),
+        Output({'type': 'filtered-view-store', 'index': 'demographics'}, 'data'),
+        [Input({'type': 'date-range-store', 'index': 'demographics'}, 'data'),
+         Input('subscription-status-filter', 'value'),
          Input('platform-filter', 'value')]
     )
-    def update_subscription_pie_chart(start_date, end_date, platform_filter):
-        # Filter the data based on selected filters but NOT subscription status
-        filtered_df = df.copy()
-        
-        # Apply date range filter
-        if start_date and end_date:
-            filtered_df = filtered_df[
-                (filtered_df['First desktop login date'] >= start_date) & 
-                (filtered_df['First desktop login date'] <= end_date)
-            ]
-        
-        # Apply platform filter
-        if platform_filter != 'all':
-            filtered_df = filtered_df[filtered_df['platform'].str.lower() == platform_filter.lower()]
-                
-        # Count subscription statuses
-        status_counts = filtered_df['Subscription Status'].value_counts().reset_index()
+    def publish_demographics_view(date_range, subscription_filter, platform_filter):
+        # One filtering pass per input change, shared by the three charts below
+        start_date, end_date = DataHandling.unpack_date_range(date_range)
+        return ViewStore.publish('demographics', start_date=start_date, end_date=end_date,
+                                 subscription=subscription_filter, platform=platform_filter)
+
+    @app.callback(
+        Output('subscription-pie-chart', 'figure'),
+        [Input({'type': 'filtered-view-store', 'index': 'demographics'}, 'data')]
+    )
+    def update_subscription_pie_chart(view_data):
+        dataset, _, view = ViewStore.resolve(view_data)
+        if view is None:
+            return dash.no_update
+
+        # Users matching the selected filters but NOT subscription status (date slice AND platform bitmap)
+        statuses = dataset.df['Subscription Status'].take(view['all_subscriptions'])
+
+        # Count subscription statuses (as plain values, so unused categories don't show up as empty slices)
+        status_counts = statuses.astype(object).value_counts().reset_index()
         status_counts.columns = ['Status', 'Count']
         
         # Create pie chart with consistent color scheme
@@ -317,37 +285,17 @@ def register_demographics_callbacks(app):
 
     @app.callback(
         Output('hopes-bar-chart', 'figure'),
-        [Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'end_date'),
-         Input('subscription-status-filter', 'value'),
-         Input('platform-filter', 'value')]
+        [Input({'type': 'filtered-view-store', 'index': 'demographics'}, 'data')]
     )
-    def update_hopes_bar_chart(start_date, end_date, subscription_filter, platform_filter):
-        # Filter the data based on selected filters
-        filtered_df = df.copy()
-        
-        # Apply date range filter
-        if start_date and end_date:
-            filtered_df = filtered_df[
-                (filtered_df['First desktop login date'] >= start_date) & 
-                (filtered_df['First desktop login date'] <= end_date)
-            ]
-        
-        # Apply platform filter
-        if platform_filter != 'all':
-            filtered_df = filtered_df[filtered_df['platform'].str.lower() == platform_filter.lower()]
-        
-        # Apply subscription filter
-        if subscription_filter != 'all':
-            filtered_df = filtered_df[filtered_df['Subscription Status'].str.lower() == subscription_filter]
-        
-        # Analyze hopes data
-        hopes_data = filtered_df['Hopes for using Focus Bear'].value_counts().reset_index()
+    def update_hopes_bar_chart(view_data):
+        dataset, _, view = ViewStore.resolve(view_data)
+        if view is None:
+            return dash.no_update
+
+        # Count every selected hope of the filtered users (sparse user x hope matrix, parsed once at load) and take the top 10
+        hopes_data = LabelMatrix.top_labels(dataset.hopes_matrix, view['selected'], top_n=10)
         hopes_data.columns = ['Hope', 'Count']
         
-        # Sort by count and take top 10 if there are many categories
-        hopes_data = hopes_data.sort_values('Count', ascending=False).head(10)
-        
         # Create bar chart with consistent color scheme
         fig = px.bar(
             hopes_data,
@@ -370,38 +318,20 @@ def register_demographics_callbacks(app):
 
     @app.callback(
         Output('occupation-bar-chart', 'figure'),
-        [Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'start_date'),
-         Input({'type': 'auto-update-daterange', 'index': 'demographics'}, 'end_date'),
-         Input('subscription-status-filter', 'value'),
-         Input('platform-filter', 'value')]
+        [Input({'type': 'filtered-view-store', 'index': 'demographics'}, 'data')]
     )
-    def update_occupation_bar_chart(start_date, end_date, subscription_filter, platform_filter):
-        # Filter the data based on selected filters
-        filtered_df = df.copy()
-        
-        # Apply date range filter
-        if start_date and end_date:
-            filtered_df = filtered_df[
-                (filtered_df['First desktop login date'] >= start_date) & 
-                (filtered_df['First desktop login date'] <= end_date)
-            ]
-        
-        # Apply platform filter
-        if platform_filter != 'all':
-            filtered_df = filtered_df[filtered_df['platform'].str.lower() == platform_filter.lower()]
-        
-        # Apply subscription filter
-        if subscription_filter != 'all':
-            filtered_df = filtered_df[filtered_df['Subscription Status'].str.lower() == subscription_filter]
+    def update_occupation_bar_chart(view_data):
+        dataset, _, view = ViewStore.resolve(view_data)
+        if view is None:
+            return dash.no_update
         
 
-        # Apply the extraction function to get simplified occupations
-        filtered_df['Simplified_Occupation'] = filtered_df['Occupation'].apply(extract_occupation_category)
-        filtered_df = filtered_df[filtered_df['Simplified_Occupation'] != "Unknown"]
-        
-        # Analyze simplified occupation data
-        occupation_data = filtered_df['Simplified_Occupation'].value_counts().reset_index()
-        occupation_data.columns = ['Occupation', 'Count']
+        # Simplified occupations are parsed once per distinct value at load time (see DataHandling.categorize_occupations),
+        # so this is just a count per category code
+        simplified_occupations = dataset.df[DataHandling.occupation_category_column].array.take(view['selected'])
+        counts = np.bincount(simplified_occupations.codes, minlength=len(simplified_occupations.categories))
+        occupation_data = pd.DataFrame({'Occupation': simplified_occupations.categories, 'Count': counts})
+        occupation_data = occupation_data[(occupation_data['Count'] > 0) & (occupation_data['Occupation'] != "Unknown")]
         
         # Sort by count and take top 15
         occupation_data = occupation_data.sort_values('Count', ascending=False).head(15)
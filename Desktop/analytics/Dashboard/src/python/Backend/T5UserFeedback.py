@@ -2,18 +2,23 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from dash import Input, Output, dcc, html
+import json
+from dash import dcc, html
 
-# Import processed data from DataHandling
-from .DataHandling import (
-    df_feedback_ratings,
-    df_efficacy_perception,
-    df_efficacy_mood,
-    df_efficacy_energy,
-    df_efficacy_sleep
-)
+# Import processed data from DataHandling (loaded on first use)
+from . import DataHandling, ResultCache
 from .VisualVariables import FOCUS_BEAR_YELLOW, FOCUS_BEAR_BLACK
 
+def count_annotations(data_df, x_col, y_col, count_col):
+    """
+    "n=<count>" labels just below every point, built from whole columns at once.
+    Values are read from data_df.values (one common dtype, as a row of the frame would have).
+    """
+    values = data_df.values
+    xs, ys, counts = (values[:, data_df.columns.get_loc(col)] for col in (x_col, y_col, count_col))
+    label_style = dict(showarrow=False, font=dict(size=9, color="gray"), yshift=-15, xanchor='center', yanchor='top') # Shift text slightly below the marker
+    return [dict(x=x, y=y, text=f"n={count}", **label_style) for x, y, count in zip(xs, ys, counts)]
+
 def create_csat_survey_chart(data_df):
     """
     Creates the CSAT survey line chart with Feedback Count as text annotations.
@@ -25,21 +30,8 @@ def create_csat_survey_chart(data_df):
     if data_df.empty:
         return go.Figure(layout={"title": f"No CSAT Data Available (Total Responses: {total_feedback_count})"})
 
-    # Prepare for text annotations (feedback counts)
-    annotations = []
-    for i, row in data_df.iterrows():
-        annotations.append(
-            dict(
-                x=row['Month'],
-                y=row['Average Rating'],
-                text=f"n={row['Feedback Count']}", # Text to display (e.g., "n=58")
-                showarrow=False,
-                font=dict(size=9, color="gray"),
-                yshift=-15,  # Shift text slightly below the marker
-                xanchor='center',
-                yanchor='top'
-            )
-        )
+    # Prepare for text annotations (feedback counts, e.g. "n=58")
+    annotations = count_annotations(data_df, 'Month', 'Average Rating', 'Feedback Count')
 
     fig = go.Figure()
 
@@ -143,21 +135,8 @@ def create_efficacy_chart(data_df, category_title_segment, y_axis_label):
         )
         return fig
         
-    # Prepare for text annotations (user counts)
-    annotations = []
-    for i, row in data_df.iterrows():
-        annotations.append(
-            dict(
-                x=row['Weeks Since Signup'],
-                y=row['Median Score'],
-                text=f"n={row['User Count']}", # Text to display (e.g., "n=25")
-                showarrow=False,
-                font=dict(size=9, color="gray"),
-                yshift=-15,  # Shift text slightly below the marker
-                xanchor='center',
-                yanchor='top'
-            )
-        )
+    # Prepare for text annotations (user counts, e.g. "n=25")
+    annotations = count_annotations(data_df, 'Weeks Since Signup', 'Median Score', 'User Count')
     
     fig = go.Figure()
 
@@ -233,39 +212,38 @@ def create_efficacy_chart(data_df, category_title_segment, y_axis_label):
 
     return fig
 
-# --- (keep register_feedback_callbacks as is, calling this updated function) ---
-def register_feedback_callbacks(app):
-    @app.callback(
-        Output('csat-survey-chart', 'figure'),
-        Input('csat-survey-chart', 'id') 
-    )
-    def update_csat_chart(_):
-        return create_csat_survey_chart(df_feedback_ratings)
+###//////////////////////////////////////////
+### Figures: built once per dataset version and embedded in the layout (see FrontEnd.serve_layout)
+###//////////////////////////////////////////
 
-    @app.callback(
-        Output('efficacy-perception-chart', 'figure'),
-        Input('efficacy-perception-chart', 'id') 
-    )
-    def update_efficacy_perception_chart(_):
-        return create_efficacy_chart(df_efficacy_perception, "productivity", "Avg. Perception of Productivity")
+# Graph id -> builder of its figure from the dataset
+feedback_charts = {
+    'csat-survey-chart': lambda dataset: create_csat_survey_chart(dataset.df_feedback_ratings),
+    'efficacy-perception-chart': lambda dataset: create_efficacy_chart(dataset.df_efficacy_perception, "productivity", "Avg. Perception of Productivity"),
+    'efficacy-mood-chart': lambda dataset: create_efficacy_chart(dataset.df_efficacy_mood, "mood", "Avg. Mood Score"),
+    'efficacy-energy-chart': lambda dataset: create_efficacy_chart(dataset.df_efficacy_energy, "energy level upon awakening", "Avg. Energy Level"),
+    'efficacy-sleep-chart': lambda dataset: create_efficacy_chart(dataset.df_efficacy_sleep, "hours of sleep", "Avg. Hours of Sleep"),
+}
 
-    @app.callback(
-        Output('efficacy-mood-chart', 'figure'),
-        Input('efficacy-mood-chart', 'id')
-    )
-    def update_efficacy_mood_chart(_):
-        return create_efficacy_chart(df_efficacy_mood, "mood", "Avg. Mood Score")
+# Dataset frames the charts are built from
+feedback_sources = ("df_feedback_ratings", "efficacy_frames")
 
-    @app.callback(
-        Output('efficacy-energy-chart', 'figure'),
-        Input('efficacy-energy-chart', 'id')
-    )
-    def update_efficacy_energy_chart(_):
-        return create_efficacy_chart(df_efficacy_energy, "energy level upon awakening", "Avg. Energy Level")
+def feedback_figures_ready(dataset):
+    """Whether the charts can be built without waiting for the dataset to load."""
+    return all(dataset.is_loaded(name) for name in feedback_sources)
 
-    @app.callback(
-        Output('efficacy-sleep-chart', 'figure'),
-        Input('efficacy-sleep-chart', 'id')
-    )
-    def update_efficacy_sleep_chart(_):
-        return create_efficacy_chart(df_efficacy_sleep, "hours of sleep", "Avg. Hours of Sleep")
\ No newline at end of file
+@ResultCache.memoize(max_entries=2)
+def feedback_figures(dataset):
+    """
+    Every Feedback tab figure as plain JSON data ({graph id: figure}), so page loads only copy them into the layout.
+    The tab has no inputs, so nothing is computed per visit.
+    """
+    figures = {}
+    for graph_id, build in feedback_charts.items():
+        try:
+            fig = build(dataset)
+        except Exception as e:
+            print(f"ERROR: Building the {graph_id} figure failed: {e}")
+            fig = go.Figure(layout={"title": "Chart unavailable"})
+        figures[graph_id] = json.loads(fig.to_json())
+    return figures
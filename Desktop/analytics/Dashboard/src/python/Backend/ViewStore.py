@@ -0,0 +1,93 @@
+# This file holds the per-tab "filtered views": the row selections a tab's charts share.
+# A tab's view callback computes the selection once per (tab, inputs) and publishes a small token through a
+# dcc.Store ({'type': 'filtered-view-store', 'index': <tab>}); the chart callbacks listen to that store and
+# read the rows from here instead of each filtering the frame again.
+# The store data also carries the inputs, so a worker that doesn't hold the token (or a newer dataset version)
+# simply rebuilds the view.
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.python.Backend import DataHandling, ResultCache
+
+MAX_VIEWS = 64
+
+# Tab name -> function(dataset, **inputs) returning {selection name: row positions}
+view_builders = {}
+
+_views = OrderedDict()
+_lock = threading.Lock()
+
+
+def register_view(tab):
+    """Decorator registering the builder of a tab's filtered view."""
+    def decorator(builder):
+        view_builders[tab] = builder
+        return builder
+    return decorator
+
+def period_view(dataset, start_date=None, end_date=None, subscription='all', platform='all'):
+    """View of the tabs that compare two cohorts: the 'current' and 'previous' period rows matching the filters."""
+    if not start_date or not end_date:
+        # No range picked yet (e.g. before the date bounds are filled in): no cohort to compare
+        empty = np.array([], dtype=np.int64)
+        return {"current": empty, "previous": empty}
+    filter_index = dataset.filter_index
+    try:
+        current, _ = filter_index.positions(start_date, end_date, subscription=subscription, platform=platform)
+        prev_start_dt, prev_end_dt = DataHandling.previous_period_dates(start_date, end_date)
+        previous, _ = filter_index.positions(prev_start_dt, prev_end_dt, subscription=subscription, platform=platform)
+    except Exception as e:
+        print(f"Error in period_view: {e}")
+        current = previous = np.array([], dtype=np.int64)
+    return {"current": current, "previous": previous}
+
+def view_token(version, tab, inputs):
+    """Token of a view: a digest of the dataset version, tab and normalized inputs."""
+    key = [version, tab, sorted((name, ResultCache.normalize_arg(value)) for name, value in inputs.items())]
+    return hashlib.sha1(json.dumps(key, default=str).encode()).hexdigest()[:16]
+
+def get_view(dataset, tab, **inputs):
+    """The selections of a tab for the given inputs, built on first use and kept (LRU) for the other callbacks."""
+    token = view_token(dataset.version, tab, inputs)
+    with _lock:
+        view = _views.get(token)
+        if view is not None:
+            _views.move_to_end(token)
+            return view
+
+    view = view_builders[tab](dataset, **inputs)
+    with _lock:
+        _views[token] = view
+        while len(_views) > MAX_VIEWS:
+            _views.popitem(last=False)
+    return view
+
+def publish(tab, **inputs):
+    """Build (or reuse) a tab's view for the current dataset, and return the data for its dcc.Store."""
+    dataset = DataHandling.get_dataset()
+    get_view(dataset, tab, **inputs)
+    return {"token": view_token(dataset.version, tab, inputs), "tab": tab, "version": dataset.version, "inputs": inputs}
+
+def view_inputs(view_data):
+    """The inputs a view store was published for ({} before the first publish)."""
+    return (view_data or {}).get("inputs") or {}
+
+def resolve(view_data):
+    """
+    (dataset, inputs, view) for the data of a view store; the view is rebuilt if this process doesn't hold it.
+    Returns (dataset, {}, None) when no view has been published yet.
+    """
+    dataset = DataHandling.get_dataset()
+    if not view_data:
+        return dataset, {}, None
+    inputs = view_inputs(view_data)
+    return dataset, inputs, get_view(dataset, view_data["tab"], **inputs)
+
+def clear():
+    with _lock:
+        _views.clear()
@@ -1,6 +1,8 @@
 
 # This file contains variables that impact the visual representation of the dashboard.
 
+import plotly.io as pio
+
 # Focus Bear brand colors
 FOCUS_BEAR_YELLOW = '#FFC107'  # Bright yellow
 FOCUS_BEAR_BLACK = '#212121'   # Dark black
@@ -79,4 +81,27 @@ custom_colorscale = [
     [0.0, "white"],   # 0% (minimum) -> white
     [0.1, light_red], # 0.1% -> light red
     [1.0, "red"]  # 100% (maximum) -> magenta
-]
\ No newline at end of file
+]
+
+
+#####
+##### Plotly template
+#####
+
+# Every figure carries its whole template, and plotly's default one (~6.5 kB) is mostly settings for
+# trace types and subplots the dashboard never draws. The slim copy keeps what our 2D charts use,
+# so chart updates stay small. It becomes the default, so tabs don't have to pass it.
+template_trace_types = ("bar", "heatmap", "pie", "scatter")
+template_unused_layout = ("polar", "ternary", "scene", "geo", "mapbox", "map", "colorscale")
+
+def slim_template(base="plotly"):
+    """Copy of a plotly template without the trace types and layout sections the dashboard doesn't use."""
+    template = pio.templates[base].to_plotly_json()
+    data = {name: traces for name, traces in template["data"].items() if name in template_trace_types}
+    # Our heatmaps always set their colorscale
+    data["heatmap"] = [{key: value for key, value in trace.items() if key != "colorscale"} for trace in data.get("heatmap", [])]
+    layout = {key: value for key, value in template["layout"].items() if key not in template_unused_layout}
+    return {"data": data, "layout": layout}
+
+pio.templates["focus_bear"] = slim_template()
+pio.templates.default = "focus_bear"
@@ -1,108 +1,221 @@
 # Import necessary libraries
 import dash
 from dash import dcc, html
-from dash import Input, Output
+from dash import Input, Output, ALL, no_update
 import pandas as pd
 from datetime import date, datetime, timedelta
 import plotly.express as px
 
 # Import files from the Backend
-from src.python.Backend import DataHandling
+from src.python.Backend import DataHandling, T5UserFeedback
 from src.python.Backend.VisualVariables import FOCUS_BEAR_YELLOW, FOCUS_BEAR_LIGHT, FOCUS_BEAR_BLACK, FOCUS_BEAR_ACCENT
 from src.python.Backend.VisualVariables import Box, Box2, chart_container, app_css, tab_style, selected_tab_style
 
-fortnight_ago = DataHandling.get_max_date  #date(2025, 1, 30)
-current_date =  DataHandling.current_date #date(2025, 3, 15)
-min_date = DataHandling.get_min_date()
-max_date = DataHandling.get_max_date()
 
-max_date_date = date.fromisoformat(max_date)
-month_ago = max_date_date - timedelta(days=30)
-fortnight_ago =  max_date_date - timedelta(days=14)
-current_date = max_date
-df = DataHandling.df
+def date_range_data(start_date, end_date):
+    """Initial data of a date-range store: the picker's default dates as 'YYYY-MM-DD' strings."""
+    def iso(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+    return {'start': iso(start_date), 'end': iso(end_date)}
 
 
+# Length of each tab's default date range, ending on the last first-login date
+default_range_days = {'overview': 14, 'habits': 14, 'demographics': 30, 'usage': 14}
 
-# Layout with tabs and branding
-layout = html.Div([
+def default_date_range(index, max_date):
+    """Default (start, end) dates of a tab's date picker, or (None, None) before the dates are known."""
+    if not max_date:
+        return None, None
+    end_date = date.fromisoformat(max_date)
+    return end_date - timedelta(days=default_range_days[index]), end_date
 
-    # === Header with logo and title ===
-    html.Div([
 
-        # === Logo on the left ===
+def build_layout(min_date=None, max_date=None, feedback_figures=None):
+    """
+    Build the dashboard layout with the date pickers bounded by min_date/max_date ('YYYY-MM-DD').
+    Without dates the pickers are left empty (fill_date_bounds sets them once the data is loaded).
+    feedback_figures ({graph id: figure}) are the prebuilt User Feedback charts, embedded as they are
+    (without them, fill_feedback_figures adds them once the data is loaded).
+    """
+    feedback_figures = feedback_figures or {}
+
+    def feedback_graph(graph_id):
+        if graph_id in feedback_figures:
+            return dcc.Graph(id=graph_id, figure=feedback_figures[graph_id])
+        return dcc.Graph(id=graph_id)
+
+    ranges = {index: default_date_range(index, max_date) for index in default_range_days}
+
+    # Layout with tabs and branding
+    layout = html.Div([
+
+        # === Header with logo and title ===
         html.Div([
-            html.Img(
-                src='assets/logo.png', 
-                style={'height': '60px', 'marginRight': '20px'}
-            ),
-        ], style={'display': 'inline-block', 'verticalAlign': 'middle'}),
+
+            # === Logo on the left ===
+            html.Div([
+                html.Img(
+                    src='assets/logo.png', 
+                    style={'height': '60px', 'marginRight': '20px'}
+                ),
+            ], style={'display': 'inline-block', 'verticalAlign': 'middle'}),
         
-        # === Title ===
-        html.Div([
-            html.H1("Focus Bear Data Dashboard", style={
-                "color": FOCUS_BEAR_BLACK, 
-                "marginBottom": "0"
-            })
-        ], style={'display': 'inline-block', 'verticalAlign': 'middle'})   
-    ], style={
-        "display": "flex", 
-        "alignItems": "center", 
-        "padding": "10px 20px",
-        "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", 
-        "marginBottom": "20px",
-        "backgroundColor": "white"
-    }),
-
-    # === Tabs section ===
-    dcc.Tabs([
-
-
-        #####################################################
-        ################# Tab 1: Overview ###################
-        #####################################################
-          # === Date Range Picker ===
-            dcc.Tab(label='Overview', children=[
-            
-            # === Date Range Picker ===
+            # === Title ===
             html.Div([
-                html.H5("Select Date Range for Analytics", className="date-label"),
+                html.H1("Focus Bear Data Dashboard", style={
+                    "color": FOCUS_BEAR_BLACK, 
+                    "marginBottom": "0"
+                })
+            ], style={'display': 'inline-block', 'verticalAlign': 'middle'})   
+        ], style={
+            "display": "flex", 
+            "alignItems": "center", 
+            "padding": "10px 20px",
+            "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", 
+            "marginBottom": "20px",
+            "backgroundColor": "white"
+        }),
+
+        # === Tabs section ===
+        dcc.Tabs([
+
+
+            #####################################################
+            ################# Tab 1: Overview ###################
+            #####################################################
+              # === Date Range Picker ===
+                dcc.Tab(label='Overview', children=[
+            
+                # === Date Range Picker ===
                 html.Div([
-                    dcc.DatePickerRange(
-                        id={'type': 'auto-update-daterange', 'index': 'overview'},
-                        start_date=fortnight_ago,
-                        end_date=current_date,
-                        min_date_allowed=min_date,
-                        max_date_allowed=max_date,
-                        display_format='MM/DD/YYYY',
-                        className='custom-date-picker'
-                    )
-                ], className='date-picker-wrapper')
-            ], className='date-picker-card', style={"backgroundColor": "white", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "borderRadius": "8px", "padding": "15px", "marginBottom": "20px"}),
-
-            # === Row 1: Signups & Conversion Metrics ===
-            html.H3("New User Counts", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
+                    html.H5("Select Date Range for Analytics", className="date-label"),
+                    html.Div([
+                        dcc.DatePickerRange(
+                            id={'type': 'auto-update-daterange', 'index': 'overview'},
+                            start_date=ranges['overview'][0],
+                            end_date=ranges['overview'][1],
+                            min_date_allowed=min_date,
+                            max_date_allowed=max_date,
+                            display_format='MM/DD/YYYY',
+                            className='custom-date-picker'
+                        ),
+                        # Holds the picked (start, end) pair; the tab's callbacks listen to this instead of the picker
+                        dcc.Store(id={'type': 'date-range-store', 'index': 'overview'}, data=date_range_data(*ranges['overview'])),
+                        # Which KPI boxes the browser shows values in; those are updated with patches
+                        dcc.Store(id={'type': 'rendered-shape-store', 'index': 'overview'})
+                    ], className='date-picker-wrapper')
+                ], className='date-picker-card', style={"backgroundColor": "white", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "borderRadius": "8px", "padding": "15px", "marginBottom": "20px"}),
 
-            html.Div([
+                # === Row 1: Signups & Conversion Metrics ===
+                html.H3("New User Counts", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
 
                 html.Div([
-                    html.I(className="fas fa-user-plus", style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                    html.H3(id='New-Signups-output', style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-                ], id='Signups-outputBox', style=Box2),
 
+                    html.Div([
+                        html.I(className="fas fa-user-plus", style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                        html.H3(id='New-Signups-output', style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                    ], id='Signups-outputBox', style=Box2),
+
+                    html.Div([
+                        html.I(className="fas fa-user-check", 
+                            style={"color": FOCUS_BEAR_BLACK, "fontSize": "36px", "marginBottom": "10px"}),
+                        html.H3(id='New-Personal-Subs', 
+                            style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                    ], id='New-Personal-Subs-box', style=Box2),
+
+                    html.Div([
+                        html.I(className="fas fa-user-group", 
+                            style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                        html.H3(id='newteams', 
+                            style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                    ], id='newteams_box', style={
+                        "backgroundColor": FOCUS_BEAR_YELLOW, 
+                        "color": FOCUS_BEAR_BLACK,
+                        "padding": "20px",
+                        "borderRadius": "8px",
+                        "textAlign": "center",
+                        "height": "140px",
+                        "width": "200px",
+                        "display": "flex",
+                        "flexDirection": "column",
+                        "alignItems": "center",
+                        "justifyContent": "center"
+                    }),
+
+                    html.Div([
+                        html.I(className="fas fa-face-frown", 
+                            style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                        html.H3(id='Uninstalled', 
+                            style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                    ], id='Uninstalled-box', style={
+                        "backgroundColor": FOCUS_BEAR_YELLOW, 
+                        "color": FOCUS_BEAR_BLACK,
+                        "padding": "20px",
+                        "borderRadius": "8px",
+                        "textAlign": "center",
+                        "height": "140px",
+                        "width": "200px",
+                        "display": "flex",
+                        "flexDirection": "column",
+                        "alignItems": "center",
+                        "justifyContent": "center"
+                    }),
+                ], style={
+                    "display": "flex",
+                    "flexWrap": "wrap",
+                    "marginBottom": "20px",
+                    "gap": "10%",
+                    "justifyContent": "center"
+                }),
+
+            # === Row 2: Habit Metrics ===
+            html.H3("User Habits (at least 1 completion)", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
+
+            html.Div([
                 html.Div([
-                    html.I(className="fas fa-user-check", 
-                        style={"color": FOCUS_BEAR_BLACK, "fontSize": "36px", "marginBottom": "10px"}),
-                    html.H3(id='New-Personal-Subs', 
-                        style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-                ], id='New-Personal-Subs-box', style=Box2),
+                    html.I(className="fas fa-cog", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='did-morning-habit', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='did-morning-habit_box', style={
+                    "backgroundColor": FOCUS_BEAR_YELLOW, 
+                    "color": FOCUS_BEAR_BLACK,
+                    "padding": "20px",
+                    "borderRadius": "8px",
+                    "textAlign": "center",
+                    "height": "140px",
+                    "width": "200px",
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "alignItems": "center",
+                    "justifyContent": "center"
+                }),
+
+                html.Div([
+                    html.I(className="fas fa-moon", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='did-evening-habit', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='did-evening-habit_box', style={
+                    "backgroundColor": FOCUS_BEAR_YELLOW, 
+                    "color": FOCUS_BEAR_BLACK,
+                    "padding": "20px",
+                    "borderRadius": "8px",
+                    "textAlign": "center",
+                    "height": "140px",
+                    "width": "200px",
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "alignItems": "center",
+                    "justifyContent": "center"
+                }),
 
                 html.Div([
-                    html.I(className="fas fa-user-group", 
-                        style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                    html.H3(id='newteams', 
-                        style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-                ], id='newteams_box', style={
+                    html.I(className="fas fa-coffee", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='did-break-habit', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='did-break-habit_box', style={
                     "backgroundColor": FOCUS_BEAR_YELLOW, 
                     "color": FOCUS_BEAR_BLACK,
                     "padding": "20px",
@@ -117,11 +230,11 @@ layout = html.Div([
                 }),
 
                 html.Div([
-                    html.I(className="fas fa-face-frown", 
-                        style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                    html.H3(id='Uninstalled', 
-                        style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-                ], id='Uninstalled-box', style={
+                    html.I(className="fas fa-brain", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='did-focus-session', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='did-focus-session_box', style={
                     "backgroundColor": FOCUS_BEAR_YELLOW, 
                     "color": FOCUS_BEAR_BLACK,
                     "padding": "20px",
@@ -142,378 +255,216 @@ layout = html.Div([
                 "justifyContent": "center"
             }),
 
-        # === Row 2: Habit Metrics ===
-        html.H3("User Habits (at least 1 completion)", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
-
-        html.Div([
-            html.Div([
-                html.I(className="fas fa-cog", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='did-morning-habit', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='did-morning-habit_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
-
-            html.Div([
-                html.I(className="fas fa-moon", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='did-evening-habit', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='did-evening-habit_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
-
-            html.Div([
-                html.I(className="fas fa-coffee", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='did-break-habit', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='did-break-habit_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
+            # === Row 3: Advanced Metrics ===
+            html.H3("Further User Metrics", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
 
             html.Div([
-                html.I(className="fas fa-brain", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='did-focus-session', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='did-focus-session_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
-        ], style={
-            "display": "flex",
-            "flexWrap": "wrap",
-            "marginBottom": "20px",
-            "gap": "10%",
-            "justifyContent": "center"
-        }),
+                html.Div([
+                    html.I(className="fas fa-hourglass-half", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='Stickiness-Rate', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='Stickiness_box', style={
+                    "backgroundColor": FOCUS_BEAR_YELLOW, 
+                    "color": FOCUS_BEAR_BLACK,
+                    "padding": "20px",
+                    "borderRadius": "8px",
+                    "textAlign": "center",
+                    "height": "140px",
+                    "width": "200px",
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "alignItems": "center",
+                    "justifyContent": "center"
+                }),
 
-        # === Row 3: Advanced Metrics ===
-        html.H3("Further User Metrics", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px", "textAlign": "center"}),
+                html.Div([
+                    html.I(className="fas fa-flag", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='QuitWithin7days', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='QuitWithin7days_box', style={
+                    "backgroundColor": FOCUS_BEAR_YELLOW, 
+                    "color": FOCUS_BEAR_BLACK,
+                    "padding": "20px",
+                    "borderRadius": "8px",
+                    "textAlign": "center",
+                    "height": "140px",
+                    "width": "200px",
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "alignItems": "center",
+                    "justifyContent": "center"
+                }),
 
-        html.Div([
-            html.Div([
-                html.I(className="fas fa-hourglass-half", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='Stickiness-Rate', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='Stickiness_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
+                html.Div([
+                    html.I(className="fas fa-bolt", 
+                          style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
+                    html.H3(id='Activation-Rate', 
+                           style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
+                ], id='Activation-Rate_box', style={
+                    "backgroundColor": FOCUS_BEAR_YELLOW, 
+                    "color": FOCUS_BEAR_BLACK,
+                    "padding": "20px",
+                    "borderRadius": "8px",
+                    "textAlign": "center",
+                    "height": "140px",
+                    "width": "200px",
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "alignItems": "center",
+                    "justifyContent": "center"
+                }),
+            ], style={
                 "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
+                "flexWrap": "wrap",
+                "marginBottom": "20px",
+                "gap": "10%",
                 "justifyContent": "center"
-            }),
+            })
+        ], style={"backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"}),
 
-            html.Div([
-                html.I(className="fas fa-flag", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='QuitWithin7days', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='QuitWithin7days_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
 
-            html.Div([
-                html.I(className="fas fa-bolt", 
-                      style={"color": FOCUS_BEAR_BLACK, "fontSize": "24px", "marginBottom": "10px"}),
-                html.H3(id='Activation-Rate', 
-                       style={"margin": "0", "fontSize": "18px", "fontWeight": "normal"})
-            ], id='Activation-Rate_box', style={
-                "backgroundColor": FOCUS_BEAR_YELLOW, 
-                "color": FOCUS_BEAR_BLACK,
-                "padding": "20px",
-                "borderRadius": "8px",
-                "textAlign": "center",
-                "height": "140px",
-                "width": "200px",
-                "display": "flex",
-                "flexDirection": "column",
-                "alignItems": "center",
-                "justifyContent": "center"
-            }),
-        ], style={
-            "display": "flex",
-            "flexWrap": "wrap",
-            "marginBottom": "20px",
-            "gap": "10%",
-            "justifyContent": "center"
-        })
-    ], style={"backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"}),
+            #######################################################
+            ############ Tab 2: Retention Breakdown ###############
+            #######################################################
+           dcc.Tab(label='Retention Breakdown', children=[
+                html.Div([
 
+                    # === Left sidebar with filters ===
+                    html.Div([
+                        html.H4("Filters", className="section-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
 
-        #######################################################
-        ############ Tab 2: Retention Breakdown ###############
-        #######################################################
-       dcc.Tab(label='Retention Breakdown', children=[
-            html.Div([
+                        # === Date Range Picker ===
+                        html.Div([
+                            html.Label("Date Range", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                            html.Div([
+                                dcc.DatePickerRange(
+                                   id={'type': 'auto-update-daterange', 'index': 'habits'},
+                                    start_date=ranges['habits'][0], # Default start
+                                    end_date=ranges['habits'][1],   # Default end
+                                    min_date_allowed=min_date,
+                                    max_date_allowed=max_date,
+                                    display_format='MM/DD/YYYY',
+                                    className='custom-date-picker',
+                                    style={
+                                        'backgroundColor': 'white',
+                                        'border': f'2px solid {FOCUS_BEAR_YELLOW}',
+                                        'borderRadius': '8px',
+                                        'padding': '10px',
+                                        'width': '100%',
+                                        'textAlign': 'center',
+                                        'fontWeight': 'bold',
+                                        'color': FOCUS_BEAR_BLACK
+                                    }
+                                ),
+                                # Holds the picked (start, end) pair; the tab's callbacks listen to this instead of the picker
+                                dcc.Store(id={'type': 'date-range-store', 'index': 'habits'}, data=date_range_data(*ranges['habits'])),
+                                # Heatmap counts of every filter combination for the picked range; the browser draws the heatmaps from it
+                                dcc.Store(id={'type': 'heatmap-slices-store', 'index': 'habits'}),
+                                html.Div( # This div will display the selected range from the callback
+                                    id='retention-cohort-end-date-output', # ID for the output
+                                    style={
+                                        'marginTop': '10px',
+                                        'fontWeight': 'bold',
+                                        'color': FOCUS_BEAR_BLACK,
+                                        'textAlign': 'center'
+                                    }
+                                )
+                            ], className='date-picker-wrapper')
+                        ], className="filter-group", style={"marginBottom": "15px"}),
 
-                # === Left sidebar with filters ===
-                html.Div([
-                    html.H4("Filters", className="section-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
 
-                    # === Date Range Picker ===
-                    html.Div([
-                        html.Label("Date Range", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                        # === Subscription Status Filter ===
                         html.Div([
-                            dcc.DatePickerRange(
-                               id={'type': 'auto-update-daterange', 'index': 'habits'},
-                                start_date=fortnight_ago, # Default start
-                                end_date=current_date,   # Default end
-                                min_date_allowed=min_date,
-                                max_date_allowed=max_date,
-                                display_format='MM/DD/YYYY',
-                                className='custom-date-picker',
-                                style={
-                                    'backgroundColor': 'white',
-                                    'border': f'2px solid {FOCUS_BEAR_YELLOW}',
-                                    'borderRadius': '8px',
-                                    'padding': '10px',
-                                    'width': '100%',
-                                    'textAlign': 'center',
-                                    'fontWeight': 'bold',
-                                    'color': FOCUS_BEAR_BLACK
-                                }
-                            ),
-                            html.Div( # This div will display the selected range from the callback
-                                id='retention-cohort-end-date-output', # ID for the output
-                                style={
-                                    'marginTop': '10px',
-                                    'fontWeight': 'bold',
-                                    'color': FOCUS_BEAR_BLACK,
-                                    'textAlign': 'center'
-                                }
+                            html.Label("Subscription Status", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                            dcc.RadioItems(
+                                id='habits-subscription-filter',
+                                options=[
+                                    {'label': 'All', 'value': 'all'},
+                                    {'label': 'Trial', 'value': 'trial'},
+                                    {'label': 'Personal', 'value': 'personal'},
+                                    {'label': 'Team Member', 'value': 'team_member'}
+                                ],
+                                value='all',
+                                labelStyle={'display': 'block', 'padding': '5px', 'color': FOCUS_BEAR_BLACK} # display:block for better layout
                             )
-                        ], className='date-picker-wrapper')
-                    ], className="filter-group", style={"marginBottom": "15px"}),
+                        ], className="filter-group", style={"marginBottom": "15px"}),
 
+                        # === Platform Filter ===
+                        html.Div([
+                            html.Label("Platform", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                            dcc.RadioItems(
+                                id='habits-platform-filter',
+                                options=[
+                                    {'label': 'All Platforms', 'value': 'all'},
+                                    {'label': 'iOS', 'value': 'ios'},
+                                    {'label': 'macOS', 'value': 'macos'},
+                                    {'label': 'Windows', 'value': 'windows'},
+                                    {'label': 'Android', 'value': 'android'},
+                                    {'label': 'Web', 'value': 'web'},
+                                    {'label': 'Unknown', 'value': 'unknown'}
+                                ],
+                                value='all',
+                                labelStyle={'display': 'block', 'padding': '5px', 'color': FOCUS_BEAR_BLACK} # display:block
+                            )
+                        ], className="filter-group")
+                    ], className="sidebar", style={"width": "25%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "20px", "alignSelf": "flex-start"}), # Adjusted width and alignSelf
 
-                    # === Subscription Status Filter ===
+                    # === Main content area with heatmaps ===
                     html.Div([
-                        html.Label("Subscription Status", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
-                        dcc.RadioItems(
-                            id='habits-subscription-filter',
-                            options=[
-                                {'label': 'All', 'value': 'all'},
-                                {'label': 'Trial', 'value': 'trial'},
-                                {'label': 'Personal', 'value': 'personal'},
-                                {'label': 'Team Member', 'value': 'team_member'}
-                            ],
-                            value='all',
-                            labelStyle={'display': 'block', 'padding': '5px', 'color': FOCUS_BEAR_BLACK} # display:block for better layout
-                        )
-                    ], className="filter-group", style={"marginBottom": "15px"}),
-
-                    # === Platform Filter ===
-                    html.Div([
-                        html.Label("Platform", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
-                        dcc.RadioItems(
-                            id='habits-platform-filter',
-                            options=[
-                                {'label': 'All Platforms', 'value': 'all'},
-                                {'label': 'iOS', 'value': 'ios'},
-                                {'label': 'macOS', 'value': 'macos'},
-                                {'label': 'Windows', 'value': 'windows'},
-                                {'label': 'Android', 'value': 'android'},
-                                {'label': 'Web', 'value': 'web'},
-                                {'label': 'Unknown', 'value': 'unknown'}
-                            ],
-                            value='all',
-                            labelStyle={'display': 'block', 'padding': '5px', 'color': FOCUS_BEAR_BLACK} # display:block
-                        )
-                    ], className="filter-group")
-                ], className="sidebar", style={"width": "25%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "20px", "alignSelf": "flex-start"}), # Adjusted width and alignSelf
-
-                # === Main content area with heatmaps ===
-                html.Div([
-                    # Title is now part of the figure layout (via annotations in callback)
-                    # html.H4("User Habit Tracking - Current Period", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px", "textAlign": "center"}),
-                    dcc.Graph(id='habits-heatmap', config={'displayModeBar': False}),
+                        # Title is now part of the figure layout (via annotations in callback)
+                        # html.H4("User Habit Tracking - Current Period", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px", "textAlign": "center"}),
+                        dcc.Graph(id='habits-heatmap', config={'displayModeBar': False}),
 
-                    html.Hr(style={"margin": "30px 0"}), # Add a horizontal line separator
+                        html.Hr(style={"margin": "30px 0"}), # Add a horizontal line separator
 
-                    # Title is now part of the figure layout (via annotations in callback)
-                    # html.H4("User Habit Tracking - Previous Period", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px", "textAlign": "center", "marginTop": "30px"}),
-                    dcc.Graph(id='habits-heatmap-previous', config={'displayModeBar': False}) # NEW GRAPH ID
-                ], style={"width": "73%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"}) # Adjusted width
-            ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px", "alignItems": "stretch"}) # alignItems stretch
-        ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
+                        # Title is now part of the figure layout (via annotations in callback)
+                        # html.H4("User Habit Tracking - Previous Period", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px", "textAlign": "center", "marginTop": "30px"}),
+                        dcc.Graph(id='habits-heatmap-previous', config={'displayModeBar': False}), # NEW GRAPH ID
 
+                        html.Hr(style={"margin": "30px 0"}),
 
-        ##########################################################################
-        ########################## Tab 3: User Demographics ######################
-        ##########################################################################
-        dcc.Tab(label='User Demographics', children=[
-            html.Div([
+                        # Signup week x day since signup, for every cohort (follows the subscription/platform filters only)
+                        dcc.Graph(id='habits-cohort-retention', config={'displayModeBar': False})
+                    ], style={"width": "73%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"}) # Adjusted width
+                ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px", "alignItems": "stretch"}) # alignItems stretch
+            ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
 
-                # === Sidebar filters - Left side ===
-                html.Div([
-                    html.H4("Filters", className="section-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
-                    
-                    # === Date range picker ===
-                    html.Div([
-                        html.Label("Date Range", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
-                        dcc.DatePickerRange(
-                            id={'type': 'auto-update-daterange', 'index': 'demographics'},
-                            start_date=month_ago,
-                            end_date=current_date,
-                            min_date_allowed=min_date,
-                            max_date_allowed=max_date,
-                            display_format='MM/DD/YYYY',
-                            className='custom-date-picker'
-                        )
-                    ], className="filter-group", style={"marginBottom": "15px"}),
 
-                    # === Subscription status filter ===
-                    html.Div([
-                        html.Label("Subscription Status", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
-                        dcc.RadioItems(
-                            id='subscription-status-filter',
-                            options=[
-                                {'label': 'All', 'value': 'all'},
-                                {'label': 'Trial', 'value': 'trial'},
-                                {'label': 'Personal', 'value': 'personal'},
-                                {'label': 'Team Member', 'value': 'team_member'}
-                            ],
-                            value='all',
-                            labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
-                        )
-                    ], className="filter-group", style={"marginBottom": "15px"}),
-
-                    # === Platform filter ===
-                    html.Div([
-                        html.Label("Platform", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
-                        dcc.RadioItems(
-                            id='platform-filter',
-                            options=[
-                                {'label': 'All Platforms', 'value': 'all'},
-                                {'label': 'iOS', 'value': 'ios'},
-                                {'label': 'macOS', 'value': 'macos'},
-                                {'label': 'Windows', 'value': 'windows'},
-                                {'label': 'Android', 'value': 'android'},
-                                {'label': 'Web', 'value': 'web'},
-                                {'label': 'Unknown', 'value': 'unknown'}
-                            ],
-                            value='all',
-                            labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
-                        )
-                    ], className="filter-group")
-                ], className="sidebar", style={"width": "20%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "15px"}),
-
-                # === Charts area - Right side === 
+            ##########################################################################
+            ########################## Tab 3: User Demographics ######################
+            ##########################################################################
+            dcc.Tab(label='User Demographics', children=[
                 html.Div([
-                    # Top row with two charts side by side
-                    html.Div([
-
-                        # === Left chart - Subscription Status ===
-                        html.Div([
-                            html.H4("Subscription Status Distribution", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
-                            dcc.Graph(id='subscription-pie-chart')
-                        ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "48%", "marginRight": "2%"}),
-
-                        # === Right chart - Hopes ===
-                        html.Div([
-                            html.H4("Top Hopes for Using Focus Bear", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
-                            dcc.Graph(id='hopes-bar-chart')
-                        ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "48%"})
-                    ], style={"display": "flex", "marginBottom": "15px"}),
 
-                    # === Bottom row with occupation chart ===
+                    # === Sidebar filters - Left side ===
                     html.Div([
-                        html.H4("Occupation Distribution", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
-                        dcc.Graph(id='occupation-bar-chart')
-                    ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "100%"})
-                ], style={"width": "78%"})
-            ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
-        ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
-
-
-
-        ##########################################################################
-        ########################## Tab 4: Usage Analytics ########################
-        ##########################################################################
-        dcc.Tab(label='Usage Analytics', children=[
-            html.Div([
-
-                # === Left sidebar with filters ===
-                html.Div([
-                    html.H4("Filters", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
-                    html.Div([
-
-                        # === Date range picker in sidebar ===
+                        html.H4("Filters", className="section-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
+                    
+                        # === Date range picker ===
                         html.Div([
                             html.Label("Date Range", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
                             dcc.DatePickerRange(
-                                id={'type': 'auto-update-daterange', 'index': 'usage'},
-                                start_date=fortnight_ago,
-                                end_date=current_date,
+                                id={'type': 'auto-update-daterange', 'index': 'demographics'},
+                                start_date=ranges['demographics'][0],
+                                end_date=ranges['demographics'][1],
+                                min_date_allowed=min_date,
+                                max_date_allowed=max_date,
                                 display_format='MM/DD/YYYY',
                                 className='custom-date-picker'
-                            )
+                            ),
+                            # Holds the picked (start, end) pair; the tab's callbacks listen to this instead of the picker
+                            dcc.Store(id={'type': 'date-range-store', 'index': 'demographics'}, data=date_range_data(*ranges['demographics'])),
+                            # Token of the tab's filtered view (see ViewStore), shared by the tab's chart callbacks
+                            dcc.Store(id={'type': 'filtered-view-store', 'index': 'demographics'})
                         ], className="filter-group", style={"marginBottom": "15px"}),
 
-                        # === Subscription status filter in sidebar ===
-                        html.Div([    
-                            html.Label("Subscription Status", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                        # === Subscription status filter ===
+                        html.Div([
+                            html.Label("Subscription Status", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
                             dcc.RadioItems(
-                                id='function-subscription-filter',
+                                id='subscription-status-filter',
                                 options=[
                                     {'label': 'All', 'value': 'all'},
                                     {'label': 'Trial', 'value': 'trial'},
@@ -523,13 +474,13 @@ layout = html.Div([
                                 value='all',
                                 labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
                             )
-                        ], style={"marginBottom": "20px"}),
+                        ], className="filter-group", style={"marginBottom": "15px"}),
 
-                        # === Platform filter in sidebar ===
+                        # === Platform filter ===
                         html.Div([
-                            html.Label("Platform", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                            html.Label("Platform", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
                             dcc.RadioItems(
-                                id='function-platform-filter',
+                                id='platform-filter',
                                 options=[
                                     {'label': 'All Platforms', 'value': 'all'},
                                     {'label': 'iOS', 'value': 'ios'},
@@ -542,99 +493,247 @@ layout = html.Div([
                                 value='all',
                                 labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
                             )
-                        ])
-                    ]),
-                ], style={"width": "20%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "15px"}),
-               
-                # === Main content area - Right side ===
+                        ], className="filter-group")
+                    ], className="sidebar", style={"width": "20%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "15px"}),
+
+                    # === Charts area - Right side === 
+                    html.Div([
+                        # Top row with two charts side by side
+                        html.Div([
+
+                            # === Left chart - Subscription Status ===
+                            html.Div([
+                                html.H4("Subscription Status Distribution", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
+                                dcc.Graph(id='subscription-pie-chart')
+                            ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "48%", "marginRight": "2%"}),
+
+                            # === Right chart - Hopes ===
+                            html.Div([
+                                html.H4("Top Hopes for Using Focus Bear", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
+                                dcc.Graph(id='hopes-bar-chart')
+                            ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "48%"})
+                        ], style={"display": "flex", "marginBottom": "15px"}),
+
+                        # === Bottom row with occupation chart ===
+                        html.Div([
+                            html.H4("Occupation Distribution", className="chart-title", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
+                            dcc.Graph(id='occupation-bar-chart')
+                        ], style={"backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "width": "100%"})
+                    ], style={"width": "78%"})
+                ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
+            ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
+
+
+
+            ##########################################################################
+            ########################## Tab 4: Usage Analytics ########################
+            ##########################################################################
+            dcc.Tab(label='Usage Analytics', children=[
                 html.Div([
-                    # Top row with two charts side by side
+
+                    # === Left sidebar with filters ===
                     html.Div([
+                        html.H4("Filters", style={"color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "10px"}),
+                        html.Div([
 
-                        # === Left chart - Modes used ===
+                            # === Date range picker in sidebar ===
+                            html.Div([
+                                html.Label("Date Range", className="filter-label", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                                dcc.DatePickerRange(
+                                    id={'type': 'auto-update-daterange', 'index': 'usage'},
+                                    start_date=ranges['usage'][0],
+                                    end_date=ranges['usage'][1],
+                                    display_format='MM/DD/YYYY',
+                                    className='custom-date-picker'
+                                ),
+                                # Holds the picked (start, end) pair; the tab's callbacks listen to this instead of the picker
+                                dcc.Store(id={'type': 'date-range-store', 'index': 'usage'}, data=date_range_data(*ranges['usage'])),
+                                # Token of the tab's filtered view (see ViewStore), shared by the tab's chart callbacks
+                                dcc.Store(id={'type': 'filtered-view-store', 'index': 'usage'})
+                            ], className="filter-group", style={"marginBottom": "15px"}),
+
+                            # === Subscription status filter in sidebar ===
+                            html.Div([    
+                                html.Label("Subscription Status", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                                dcc.RadioItems(
+                                    id='function-subscription-filter',
+                                    options=[
+                                        {'label': 'All', 'value': 'all'},
+                                        {'label': 'Trial', 'value': 'trial'},
+                                        {'label': 'Personal', 'value': 'personal'},
+                                        {'label': 'Team Member', 'value': 'team_member'}
+                                    ],
+                                    value='all',
+                                    labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
+                                )
+                            ], style={"marginBottom": "20px"}),
+
+                            # === Platform filter in sidebar ===
+                            html.Div([
+                                html.Label("Platform", style={"fontWeight": "bold", "color": FOCUS_BEAR_BLACK}),
+                                dcc.RadioItems(
+                                    id='function-platform-filter',
+                                    options=[
+                                        {'label': 'All Platforms', 'value': 'all'},
+                                        {'label': 'iOS', 'value': 'ios'},
+                                        {'label': 'macOS', 'value': 'macos'},
+                                        {'label': 'Windows', 'value': 'windows'},
+                                        {'label': 'Android', 'value': 'android'},
+                                        {'label': 'Web', 'value': 'web'},
+                                        {'label': 'Unknown', 'value': 'unknown'}
+                                    ],
+                                    value='all',
+                                    labelStyle={'padding': '5px', 'color': FOCUS_BEAR_BLACK}
+                                )
+                            ])
+                        ]),
+                    ], style={"width": "20%", "backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginRight": "15px"}),
+               
+                    # === Main content area - Right side ===
+                    html.Div([
+                        # Top row with two charts side by side
                         html.Div([
-                            html.H3("Simple vs Geek Mode Usage", style={"textAlign": "center", "color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
-                            dcc.Graph(id='graph-mode-comparison'),
-                        ], style={"width": "48%", "marginRight": "2%", "backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"}),
+
+                            # === Left chart - Modes used ===
+                            html.Div([
+                                html.H3("Simple vs Geek Mode Usage", style={"textAlign": "center", "color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
+                                dcc.Graph(id='graph-mode-comparison'),
+                            ], style={"width": "48%", "marginRight": "2%", "backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"}),
                        
-                        # === Right chart - Blocking features ===
+                            # === Right chart - Blocking features ===
+                            html.Div([
+                                html.H3("Feature & Blocking Tool Usage", style={"textAlign": "center", "color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
+                                dcc.Graph(id='graph-feature-usage')
+                            ], style={"width": "48%", "backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"})
+                        ], style={"display": "flex", "marginBottom": "15px"}),
+                        # Bottom row with habit usage chart
                         html.Div([
-                            html.H3("Feature & Blocking Tool Usage", style={"textAlign": "center", "color": FOCUS_BEAR_BLACK, "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}", "paddingBottom": "5px"}),
-                            dcc.Graph(id='graph-feature-usage')
-                        ], style={"width": "48%", "backgroundColor": "white", "padding": "15px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"})
-                    ], style={"display": "flex", "marginBottom": "15px"}),
-                    # Bottom row with habit usage chart
-                    html.Div([
-                        html.H3("Habit Usage Analysis", style={
-                            "textAlign": "center",
-                            "color": FOCUS_BEAR_BLACK,
-                            "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}",
-                            "paddingBottom": "5px"
-                        }),
-
-                        html.Div(
-                            dcc.Graph(id='graph-habit-usage'),
-                            style={"display": "flex", "justifyContent": "center"}
-                        )
-                    ], style={
-                        "width": "100%",
-                        "backgroundColor": "white",
-                        "padding": "15px",
-                        "borderRadius": "8px",
-                        "border": f"1px solid {FOCUS_BEAR_YELLOW}",
-                        "marginTop": "15px"
-                    })
-                ], style={"width": "78%"})
-            ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
-        ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
-    ##########################################################################
-        ########################## Tab 5: User Feedback ##########################
+                            html.H3("Habit Usage Analysis", style={
+                                "textAlign": "center",
+                                "color": FOCUS_BEAR_BLACK,
+                                "borderBottom": f"2px solid {FOCUS_BEAR_YELLOW}",
+                                "paddingBottom": "5px"
+                            }),
+
+                            html.Div(
+                                dcc.Graph(id='graph-habit-usage'),
+                                style={"display": "flex", "justifyContent": "center"}
+                            )
+                        ], style={
+                            "width": "100%",
+                            "backgroundColor": "white",
+                            "padding": "15px",
+                            "borderRadius": "8px",
+                            "border": f"1px solid {FOCUS_BEAR_YELLOW}",
+                            "marginTop": "15px"
+                        })
+                    ], style={"width": "78%"})
+                ], style={"display": "flex", "backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
+            ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
         ##########################################################################
-        dcc.Tab(label='User Feedback', children=[
-            html.Div([
-                # Chart 1: CSAT Survey
+            ########################## Tab 5: User Feedback ##########################
+            ##########################################################################
+            dcc.Tab(label='User Feedback', children=[
+                # Static charts: built once per dataset version (T5UserFeedback.feedback_figures), no chart callbacks
                 html.Div([
-                    dcc.Graph(id='csat-survey-chart')
-                ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
+                    # Chart 1: CSAT Survey
+                    html.Div([
+                        feedback_graph('csat-survey-chart')
+                    ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
 
-                # Chart 2: Efficacy Over Time
-                html.Div([
-                    dcc.Graph(id='efficacy-perception-chart')
-                ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
-                 # Chart 3: Efficacy - Mood
-                html.Div([
-                    dcc.Graph(id='efficacy-mood-chart') # New chart
-                ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
+                    # Chart 2: Efficacy Over Time
+                    html.Div([
+                        feedback_graph('efficacy-perception-chart')
+                    ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
+                     # Chart 3: Efficacy - Mood
+                    html.Div([
+                        feedback_graph('efficacy-mood-chart') # New chart
+                    ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
 
-                # Chart 4: Efficacy - Energy Level
-                html.Div([
-                    dcc.Graph(id='efficacy-energy-chart') # New chart
-                ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
+                    # Chart 4: Efficacy - Energy Level
+                    html.Div([
+                        feedback_graph('efficacy-energy-chart') # New chart
+                    ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}", "marginBottom": "20px"}),
 
-                # Chart 5: Efficacy - Hours of Sleep
-                html.Div([
-                    dcc.Graph(id='efficacy-sleep-chart') # New chart
-                ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"})
+                    # Chart 5: Efficacy - Hours of Sleep
+                    html.Div([
+                        feedback_graph('efficacy-sleep-chart') # New chart
+                    ], style={"backgroundColor": "white", "padding": "20px", "borderRadius": "8px", "border": f"1px solid {FOCUS_BEAR_YELLOW}"})
             
-            ], style={"backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
-        ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
+                ], style={"backgroundColor": FOCUS_BEAR_LIGHT, "padding": "20px"})
+            ], style={"backgroundColor": FOCUS_BEAR_LIGHT}),
+
+        ], 
+        style={
+            "marginTop": "10px",
+            "borderRadius": "8px",
+            "overflow": "hidden"
+        }),
+
+        # Poll for the data that wasn't loaded yet when the page was served (see register_callbacks)
+        dcc.Interval(id='date-bounds-interval', interval=1000, disabled=bool(max_date)),
+        dcc.Interval(id='feedback-figures-interval', interval=1000, disabled=bool(feedback_figures)),
+    ], style=app_css)
+
+    # Add the custom styles to the tabs
+    for tab in layout.children[1].children:
+        tab.style = tab_style
+        tab.selected_style = selected_tab_style
 
-    ], 
-    style={
-        "marginTop": "10px",
-        "borderRadius": "8px",
-        "overflow": "hidden"
-    }),
-], style=app_css)
+    return layout
 
 
+def serve_layout():
+    """
+    Layout for a page load. It never waits for the data: what isn't loaded yet is left out of the layout
+    and filled in by the callbacks below once it is.
+    """
+    dataset = DataHandling.get_dataset()
+    dates = (dataset.min_date, dataset.max_date) if dataset.is_loaded("max_date") else (None, None)
+    figures = T5UserFeedback.feedback_figures(dataset) if T5UserFeedback.feedback_figures_ready(dataset) else None
+    return build_layout(*dates, figures)
+
+
+# Data-free copy of the layout (used for callback validation and by export.py)
+layout = build_layout()
 
 
 def register_callbacks(app: dash.Dash):
-    # Apply the custom tab styles to the app
-    app.layout = layout
-   
-    # Add the custom styles to the tabs
-    for i in range(len(layout.children[1].children)):
-        layout.children[1].children[i].style = tab_style
-        layout.children[1].children[i].selected_style = selected_tab_style
\ No newline at end of file
+    # The layout is rebuilt on every page load so the date pickers follow the loaded data.
+    # Validation uses the data-free copy, so setting the layout doesn't wait for the data.
+    app.validation_layout = layout
+    app.layout = serve_layout
+
+    @app.callback(
+        Output({'type': 'auto-update-daterange', 'index': ALL}, 'min_date_allowed'),
+        Output({'type': 'auto-update-daterange', 'index': ALL}, 'max_date_allowed'),
+        Output({'type': 'auto-update-daterange', 'index': ALL}, 'start_date'),
+        Output({'type': 'auto-update-daterange', 'index': ALL}, 'end_date', allow_duplicate=True),
+        Output('date-bounds-interval', 'disabled'),
+        Input('date-bounds-interval', 'n_intervals'),
+        prevent_initial_call=True
+    )
+    def fill_date_bounds(n_intervals):
+        # Setting both dates makes the pickers' clientside callback publish the date ranges to the tabs
+        dataset = DataHandling.get_dataset()
+        indices = [output['id']['index'] for output in dash.ctx.outputs_list[0]]
+        if not dataset.is_loaded("max_date"):
+            DataHandling.start_background_load()
+            return [no_update] * len(indices), [no_update] * len(indices), [no_update] * len(indices), [no_update] * len(indices), False
+        ranges = [default_date_range(index, dataset.max_date) for index in indices]
+        return ([dataset.min_date] * len(indices), [dataset.max_date] * len(indices),
+                [start.isoformat() for start, _ in ranges], [end.isoformat() for _, end in ranges], True)
+
+    @app.callback(
+        [Output(graph_id, 'figure') for graph_id in T5UserFeedback.feedback_charts]
+        + [Output('feedback-figures-interval', 'disabled')],
+        Input('feedback-figures-interval', 'n_intervals'),
+        prevent_initial_call=True
+    )
+    def fill_feedback_figures(n_intervals):
+        dataset = DataHandling.get_dataset()
+        if not T5UserFeedback.feedback_figures_ready(dataset):
+            DataHandling.start_background_load()
+            return [no_update] * len(T5UserFeedback.feedback_charts) + [False]
+        figures = T5UserFeedback.feedback_figures(dataset)
+        return [figures[graph_id] for graph_id in T5UserFeedback.feedback_charts] + [True]
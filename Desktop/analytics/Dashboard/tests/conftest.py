@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The dashboard's modules are imported as src.python.Backend...; data paths are relative to this directory
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DASHBOARD_DIR)
@@ -0,0 +1,48 @@
+# Sheet parsing (ExcelIngest): the platform sheets are parsed in parallel, also from the loader process serve.py starts.
+
+import contextlib
+import io
+import multiprocessing
+import os
+
+import pandas as pd
+
+from conftest import DASHBOARD_DIR
+from src.python.Backend import ExcelIngest
+
+sample_report = os.path.join(DASHBOARD_DIR, "data", "onboarding_tracking_report1.xlsx")
+
+
+def parse_in_loader(excel_file, results):
+    """Body of the spawned test process: read the sheets like the loader does, recording the pools started."""
+    pools = []
+
+    class RecordingPool(ExcelIngest.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs.get("max_workers"))
+            super().__init__(*args, **kwargs)
+
+    ExcelIngest.ProcessPoolExecutor = RecordingPool
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        frames = ExcelIngest.read_platform_sheets(excel_file)
+    results.put((pools, [(frame["platform"].iloc[0], len(frame)) for frame in frames], output.getvalue()))
+
+
+def test_loader_process_parses_sheets_in_parallel():
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    # Started like the loader in serve.py
+    loader = context.Process(target=parse_in_loader, args=(sample_report, results))
+    loader.start()
+    try:
+        pools, sheets, output = results.get(timeout=120)
+    finally:
+        loader.join(timeout=60)
+
+    with pd.ExcelFile(sample_report) as xls:
+        expected = [(name, len(xls.parse(name))) for name in xls.sheet_names]
+    # One pool, one worker per sheet up to the number of cores, and no fallback to the sequential path
+    assert pools == [min(len(expected), os.cpu_count() or 1)], "the sheets were not parsed by a process pool"
+    assert "WARN" not in output, output
+    assert sheets == expected
@@ -0,0 +1,32 @@
+# Memoized results (ResultCache): every cached value counts towards the byte cap, whether or not it can be pickled.
+
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.python.Backend import ResultCache
+
+
+def test_estimate_size_follows_the_structure():
+    array = np.zeros(100_000)
+    frame = pd.DataFrame({"a": np.arange(1000)})
+    figure = go.Figure(go.Bar(x=np.arange(10_000), y=np.arange(10_000)))
+    assert ResultCache.estimate_size(array) >= array.nbytes
+    assert ResultCache.estimate_size({"frame": frame}) >= frame.memory_usage(deep=True).sum()
+    assert ResultCache.estimate_size(figure) >= figure.data[0].x.nbytes + figure.data[0].y.nbytes
+    # A figure returned twice is counted once
+    assert ResultCache.estimate_size((figure, figure)) < 2 * ResultCache.estimate_size(figure)
+    # Values that can't be pickled are sized too
+    assert ResultCache.estimate_size({"lock": threading.Lock(), "data": array}) > array.nbytes
+
+
+def test_unpicklable_results_respect_the_byte_cap():
+    cache = ResultCache.ResultCache("test", max_entries=100, max_bytes=1_000_000)
+    for key in range(10):
+        cache.put(1, key, (threading.Lock(), np.zeros(50_000))) # 400 kB each
+    stats = cache.stats()
+    assert stats["entries"] == 2 and 0 < stats["bytes"] <= 1_000_000
+    cache.put(1, "too big", (threading.Lock(), np.zeros(200_000)))
+    assert cache.get(1, "too big") == (False, None)
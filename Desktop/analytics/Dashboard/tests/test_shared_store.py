@@ -0,0 +1,59 @@
+# The multi-worker loader (SharedStore.run_loader): every change of the data files is published as a new store version.
+
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from conftest import DASHBOARD_DIR
+from src.python.Backend import DataHandling, SharedStore, SnapshotCache
+
+sample_report = os.path.join(DASHBOARD_DIR, "data", "onboarding_tracking_report1.xlsx")
+
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    """Load the sample report, and notice changes through a marker file that the test rewrites."""
+    marker = tmp_path / "report.marker"
+    marker.write_text("0")
+    monkeypatch.setattr(DataHandling, "excel_file", sample_report)
+    monkeypatch.setattr(DataHandling, "data_source_files", [str(marker)])
+    monkeypatch.setattr(SnapshotCache, "SNAPSHOT_DIR", str(tmp_path / ".snapshots"))
+    monkeypatch.setattr(DataHandling, "_current_dataset", DataHandling.Dataset(version=1, source_stamp=DataHandling.data_source_stamp()))
+    monkeypatch.setattr(DataHandling, "_retired_frames", [])
+    return marker
+
+
+def wait_for_version(directory, version, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pointer = SharedStore.read_pointer(directory)
+        if pointer is not None and pointer["version"] >= version:
+            return pointer["version"]
+        time.sleep(0.05)
+    pointer = SharedStore.read_pointer(directory)
+    return pointer and pointer["version"]
+
+
+def test_loader_publishes_every_change(tmp_path, data_files):
+    directory = str(tmp_path / ".shared")
+    stop = threading.Event()
+    loader = threading.Thread(target=SharedStore.run_loader, args=(directory, 0.05, stop), daemon=True)
+    loader.start()
+    try:
+        assert wait_for_version(directory, 1) == 1
+        for change in range(1, 4):
+            data_files.write_text("x" * (change + 1)) # a new size, so the stamp changes
+            assert wait_for_version(directory, 1 + change) == 1 + change, f"change {change} was not published"
+    finally:
+        stop.set()
+        loader.join(timeout=60)
+
+    store = SharedStore.open_current(directory)
+    assert store.version == 4
+    assert len(store.value("df")) == len(DataHandling.get_dataset().df)
+    # The derived structures are shared too, as read-only mappings
+    assert isinstance(store.value("kpi_cube")["cumulative"], np.memmap)
+    assert isinstance(store.value("usage_flags"), np.memmap)
@@ -0,0 +1,89 @@
+# Equivalence of the vectorized CalculateStickiness with the iterrows implementation it replaced,
+# on the sample onboarding report in data/.
+
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import DASHBOARD_DIR
+from src.python.Backend import DataHandling, ExcelIngest
+from src.python.Backend.T1OverviewBackEnd import CalculateStickiness
+
+sample_report = os.path.join(DASHBOARD_DIR, "data", "onboarding_tracking_report1.xlsx")
+
+
+def legacy_stickiness(df):
+    """CalculateStickiness before it was vectorized: one iterrows pass over the 'Did X on day Y' columns."""
+    if df is None or df.empty: return 0.0
+    rel_cols = [col for col in df.columns if "Did " in col and "on day" in col]
+    if not rel_cols: return 0.0
+    df_rel = df[rel_cols].apply(pd.to_numeric, errors='coerce').fillna(0) > 0
+    total_active_users = 0
+    total_retention_metric = 0.0
+
+    day_numbers = sorted([int(col.split(' ')[-1]) for col in rel_cols if col.split(' ')[-1].isdigit()])
+    num_days = day_numbers[-1] if day_numbers else 0
+    if num_days == 0:
+        return 0.0
+
+    for _, row in df_rel.iterrows():
+        days_active = row.sum()
+        if days_active > 0:
+            total_active_users += 1
+            user_retention = days_active / num_days
+            total_retention_metric += user_retention
+    if total_active_users == 0: return 0.0
+    return (total_retention_metric / total_active_users) * 100
+
+
+@pytest.fixture(scope="module")
+def frames():
+    """The sample report as read before (raw 'Did ...' columns) and after loading (packed habit days), row for row."""
+    raw = pd.concat(ExcelIngest.read_platform_sheets(sample_report), ignore_index=True)
+    raw = DataHandling.normalize_onboarding_frame(raw)
+    packed = DataHandling.pack_habit_days(raw.copy())
+    return raw, packed
+
+
+def date_ranges(raw):
+    dates = raw[DataHandling.login_date_col].dropna().sort_values()
+    busiest_day = raw[DataHandling.login_date_col].value_counts().idxmax()
+    return [
+        (dates.iloc[0], dates.iloc[-1]),                          # every user
+        (pd.Timestamp("2025-03-01"), pd.Timestamp("2025-03-15")), # the default fortnight
+        (pd.Timestamp("2025-04-01"), pd.Timestamp("2025-04-21")),
+        (busiest_day, busiest_day),                               # a single day
+        (pd.Timestamp("2030-01-01"), pd.Timestamp("2030-01-31")), # no users
+    ]
+
+
+def in_range(df, start, end):
+    dates = df[DataHandling.login_date_col]
+    return df[(dates >= start) & (dates <= end)]
+
+
+def test_overall_matches_legacy(frames):
+    raw, packed = frames
+    for start, end in date_ranges(raw):
+        expected = legacy_stickiness(in_range(raw, start, end))
+        assert CalculateStickiness(in_range(packed, start, end)) == pytest.approx(expected, abs=1e-9), (start, end)
+
+
+@pytest.mark.parametrize("by", ["platform", "Subscription Status"])
+def test_breakdown_matches_legacy(frames, by):
+    raw, packed = frames
+    for start, end in date_ranges(raw):
+        raw_rows, packed_rows = in_range(raw, start, end), in_range(packed, start, end)
+        breakdown = CalculateStickiness(packed_rows, by=by)
+
+        assert breakdown['all'] == pytest.approx(legacy_stickiness(raw_rows), abs=1e-9), (start, end)
+        expected = {group: legacy_stickiness(rows) for group, rows in raw_rows.groupby(by, observed=True)}
+        assert set(breakdown.drop('all').index) == set(expected), (start, end)
+        for group, value in expected.items():
+            assert breakdown[group] == pytest.approx(value, abs=1e-9), (start, end, group)
+
+
+def test_empty_frame():
+    assert CalculateStickiness(pd.DataFrame()) == 0.0
+    assert CalculateStickiness(None, by="platform").to_dict() == {'all': 0.0}